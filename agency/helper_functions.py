@@ -0,0 +1,119 @@
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from onlinemaid.cache import TieredCache
+from onlinemaid.constants import AG_OWNERS, AUTHORITY_GROUPS, EMPLOYERS, FDW
+
+AUTHORITY_SESSION_KEY = 'authority'
+
+authority_cache = TieredCache('authority')
+
+
+def get_authority_version_key(kind, pk):
+    return authority_cache.make_key(f'{kind}:{pk}')
+
+
+def get_authority_versions(user_id, agency_id):
+    # The versions live in the shared tier only, a bump has to be seen by the
+    # next request no matter which worker serves it. That only holds across
+    # hosts when the tier is shared between them, which is why
+    # AUTHORITY_SESSION_CACHE is off by default with the file based cache
+    keys = [get_authority_version_key('user', user_id)]
+    if agency_id:
+        keys.append(get_authority_version_key('agency', agency_id))
+    versions = authority_cache.shared.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # A random token rather than a counter, so that an evicted
+            # version can never come back equal to a stale session copy
+            authority_cache.shared.add(key, uuid.uuid4().hex, None)
+            versions[key] = authority_cache.shared.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_authority_version(kind, pk):
+    authority_cache.shared.set(
+        get_authority_version_key(kind, pk),
+        uuid.uuid4().hex,
+        None
+    )
+
+
+def resolve_authority(user):
+    authority = agency_id = agency_name = ''
+    rows = get_user_model().objects.filter(
+        pk=user.pk
+    ).values_list(
+        'groups__name',
+        'agency_owner__agency__pk',
+        'agency_owner__agency__name',
+        'agency_employee__agency__pk',
+        'agency_employee__agency__name'
+    )
+    rows = list(rows)
+    group_names = set(row[0] for row in rows)
+    for auth_name in AUTHORITY_GROUPS:
+        if auth_name in group_names:
+            authority = auth_name
+
+    if rows and authority == AG_OWNERS:
+        agency_id, agency_name = rows[0][1], rows[0][2]
+    elif rows and authority and authority not in [EMPLOYERS, FDW]:
+        agency_id, agency_name = rows[0][3], rows[0][4]
+
+    return {
+        'authority': authority,
+        'agency_id': agency_id or '',
+        'agency_name': agency_name or ''
+    }
+
+
+def get_authority(request):
+    """
+    Returns the authority, agency id and agency name of the request's user.
+
+    Resolved with a single query and memoized on the request. When
+    AUTHORITY_SESSION_CACHE is on, the result is also kept in the session
+    and reused until the user's groups, agency membership or agency change.
+    """
+    if hasattr(request, '_authority'):
+        return request._authority
+
+    if request.user.is_anonymous:
+        request._authority = {
+            'authority': '',
+            'agency_id': '',
+            'agency_name': ''
+        }
+        return request._authority
+
+    use_session = settings.AUTHORITY_SESSION_CACHE and hasattr(
+        request,
+        'session'
+    )
+    if use_session:
+        cached = request.session.get(AUTHORITY_SESSION_KEY)
+        if (
+            cached
+            and cached.get('user_id') == request.user.pk
+            and cached.get('versions') == get_authority_versions(
+                request.user.pk,
+                cached['authority_details']['agency_id']
+            )
+        ):
+            request._authority = cached['authority_details']
+            return request._authority
+
+    authority_details = resolve_authority(request.user)
+    if use_session:
+        request.session[AUTHORITY_SESSION_KEY] = {
+            'user_id': request.user.pk,
+            'versions': get_authority_versions(
+                request.user.pk,
+                authority_details['agency_id']
+            ),
+            'authority_details': authority_details
+        }
+    request._authority = authority_details
+    return request._authority
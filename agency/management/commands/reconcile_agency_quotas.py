@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from agency.quotas import COUNTER_FIELDS, reconcile_quotas
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes the biodata, featured biodata and employee counters of '
+        'agencies from their maids and employees, and corrects the ones that '
+        'drifted'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'agency_pks',
+            nargs='*',
+            type=int,
+            help='Only reconcile these agencies'
+        )
+
+    def handle(self, *args, **options):
+        drifted = reconcile_quotas(options['agency_pks'] or None)
+        for agency in drifted:
+            counters = ', '.join(
+                f'{field}={getattr(agency, field)}' for field in COUNTER_FIELDS
+            )
+            self.stdout.write(f'Agency {agency.pk}: {counters}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Corrected the counters of {len(drifted)} agencies'
+        ))
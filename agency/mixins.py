@@ -4,12 +4,11 @@ from django.core.exceptions import ImproperlyConfigured
 from django.http.request import HttpRequest as req
 from django.http.response import HttpResponseBase as RESBASE
 from django.urls import reverse_lazy
-from onlinemaid.constants import (AG_ADMINS, AG_MANAGERS, AG_OWNERS,
-                                  AUTHORITY_GROUPS, EMPLOYERS, FDW)
+from onlinemaid.constants import AG_ADMINS, AG_MANAGERS, AG_OWNERS
 from onlinemaid.mixins import (GroupRequiredMixin, LoginRequiredMixin,
                                SuperUserRequiredMixin)
 
-from agency.models import Agency
+from .helper_functions import get_authority
 
 
 class OMStaffRequiredMixin(SuperUserRequiredMixin):
@@ -82,19 +81,7 @@ class GetAuthorityMixin:
     agency_id = ''
 
     def get_authority(self):
-        authority = agency_id = ''
-        for auth_name in AUTHORITY_GROUPS:
-            if self.request.user.groups.filter(name=auth_name).exists():
-                authority = auth_name
-                if authority == AG_OWNERS:
-                    agency_id = self.request.user.agency_owner.agency.pk
-                elif authority != EMPLOYERS and authority != FDW:
-                    agency_id = self.request.user.agency_employee.agency.pk
-
-        return {
-            'authority': authority,
-            'agency_id': agency_id
-        }
+        return get_authority(self.request)
 
     def dispatch(self, request: req, *args: Any, **kwargs: Any) -> RESBASE:
         if not self.authority and self.authority != '':
@@ -107,16 +94,15 @@ class GetAuthorityMixin:
                 '{0} is missing the agency_id attribute'
                 .format(self.__class__.__name__)
             )
-        self.authority = self.get_authority()['authority']
-        self.agency_id = self.get_authority()['agency_id']
+        authority_details = self.get_authority()
+        self.authority = authority_details['authority']
+        self.agency_id = authority_details['agency_id']
         return super().dispatch(request, *args, **kwargs)
 
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
         context = super().get_context_data(**kwargs)
         if self.agency_id != '':
             context.update({
-                'agency_name': Agency.objects.get(
-                    pk=self.agency_id
-                ).name
+                'agency_name': self.get_authority()['agency_name']
             })
         return context
@@ -1,3 +1,5 @@
+import uuid
+
 import stripe
 from django.conf import settings
 from django.contrib.auth import get_user_model
@@ -104,27 +106,98 @@ class Agency(models.Model):
         max_length=10
     )
 
-    __original_branch_address_line_1 = None
-    __original_branch_address_line_2 = None
-    __original_branch_postal_code = None
+    # Replaced whenever one of the agency's maids changes, the partner API
+    # responses are cached under it
+    api_cache_generation = models.UUIDField(
+        default=uuid.uuid4,
+        editable=False
+    )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        main_branch = self.get_main_branch()
-        if main_branch:
-            self.__original_branch_address_line_1 = main_branch.address_1
-            self.__original_branch_address_line_2 = main_branch.address_2
-            self.__original_branch_postal_code = main_branch.postal_code
+    # Fields the save pipeline in agency.signals acts on when they change
+    TRACKED_FIELDS = ['active', 'name']
 
     def __str__(self) -> str:
         return self.name
 
-    def get_main_branch(self):
-        main_branches_qs = self.branches.filter(main_branch=True)
-        if main_branches_qs.count():
-            return main_branches_qs[0]
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            field: getattr(instance, field)
+            for field in cls.TRACKED_FIELDS
+            if field in field_names
+        }
+        return instance
+
+    def get_dirty_fields(self, update_fields=None):
+        """
+        Tracked fields that a save with update_fields would change, mapped to
+        their stored values. Every tracked field of a new agency is dirty,
+        with a stored value of None.
+        """
+        if self._state.adding:
+            loaded_values = {}
+        elif hasattr(self, '_loaded_values'):
+            loaded_values = self._loaded_values
         else:
-            return None
+            # Not built by the ORM, compared with the stored row instead
+            loaded_values = Agency.objects.filter(
+                pk=self.pk
+            ).values(*self.TRACKED_FIELDS).first() or {}
+
+        deferred_fields = self.get_deferred_fields()
+        dirty_fields = {}
+        for field in self.TRACKED_FIELDS:
+            if field in deferred_fields or (
+                update_fields is not None and field not in update_fields
+            ):
+                continue
+            if field not in loaded_values or (
+                loaded_values[field] != getattr(self, field)
+            ):
+                dirty_fields[field] = loaded_values.get(field)
+        return dirty_fields
+
+    def save(self, *args, **kwargs):
+        # Read by the post_save pipeline, then the saved values become the
+        # loaded ones
+        self._dirty_fields = self.get_dirty_fields(kwargs.get('update_fields'))
+        super().save(*args, **kwargs)
+        loaded_values = dict(getattr(self, '_loaded_values', {}))
+        for field in self._dirty_fields:
+            loaded_values[field] = getattr(self, field)
+        self._loaded_values = loaded_values
+        self._dirty_fields = {}
+
+    @staticmethod
+    def prefetch_main_branch():
+        """
+        Prefetch that get_main_branch is served from, e.g.
+        Agency.objects.prefetch_related(Agency.prefetch_main_branch()) loads
+        the main branch of every agency listed in one query.
+        """
+        return models.Prefetch(
+            'branches',
+            queryset=AgencyBranch.objects.filter(
+                main_branch=True
+            ).order_by('pk'),
+            to_attr='main_branches'
+        )
+
+    def get_main_branch(self):
+        if not hasattr(self, '_main_branch'):
+            if hasattr(self, 'main_branches'):
+                main_branches = self.main_branches
+            else:
+                main_branches = list(
+                    self.branches.filter(main_branch=True).order_by('pk')[:1]
+                )
+            self._main_branch = main_branches[0] if main_branches else None
+        return self._main_branch
+
+    def clear_main_branch_cache(self):
+        self.__dict__.pop('_main_branch', None)
+        self.__dict__.pop('main_branches', None)
 
     def get_main_branch_number(self):
         main_branch = self.get_main_branch()
@@ -163,34 +236,45 @@ class Agency(models.Model):
         self.save()
 
     def create_or_update_stripe_customer(self):
+        # Called out of band from payment.helper_functions'
+        # process_stripe_outbox, never while the agency is being saved
         from payment.models import Customer
 
         stripe.api_key = settings.STRIPE_SECRET_KEY
+        main_branch = self.get_main_branch()
+        address = {
+            'city': 'Singapore',
+            'country': 'Singapore',
+            'line1': main_branch.address_1,
+            'line2': main_branch.address_2,
+            'postal_code': main_branch.postal_code,
+            'state': 'Singapore',
+        }
+        email = (
+            self.get_agency_owner_email()
+            if hasattr(self, 'agency_owner') else None
+        )
         if not self.has_customer_relation():
             stripe_customer = stripe.Customer.create(
-                address={
-                    'city': 'Singapore',
-                    'country': 'Singapore',
-                    'line1': self.get_main_branch().address_1,
-                    'line2': self.get_main_branch().address_2,
-                    'postal_code': self.get_main_branch().postal_code,
-                    'state': 'Singapore',
-                },
+                address=address,
                 description=f'Customer account for {self.name}',
-                email=self.get_agency_owner_email(),
-                name=self.name
+                email=email,
+                name=self.name,
+                # A retry after a failure to store the customer does not
+                # create a second one
+                idempotency_key=f'agency-{self.pk}-customer'
             )
             new_customer = Customer.objects.create(
                 id=stripe_customer['id'],
                 agency=self
             )
-            new_customer.save()
             return new_customer
         else:
-            stripe_customer_pk = self.customer_account
             stripe.Customer.modify(
-                stripe_customer_pk,
-                email=self.get_agency_owner_email()
+                self.customer_account.pk,
+                address=address,
+                email=email,
+                name=self.name
             )
 
     def has_customer_relation(self):
@@ -209,6 +293,7 @@ class Agency(models.Model):
                 branch.save()
             new_main_branch.main_branch = True
             new_main_branch.save()
+        self.clear_main_branch_cache()
 
     class Meta:
         verbose_name = 'Agency'
@@ -483,6 +568,14 @@ class AgencyBranch(models.Model):
         sg_region = get_sg_region(self.postal_code)
         self.area = sg_region if sg_region else AreaChoices.choices[0][0]
         super().save(*args, **kwargs)
+        # The agency may be holding the previous main branch
+        if AgencyBranch.agency.is_cached(self):
+            self.agency.clear_main_branch_cache()
+
+    def delete(self, *args, **kwargs):
+        if AgencyBranch.agency.is_cached(self):
+            self.agency.clear_main_branch_cache()
+        return super().delete(*args, **kwargs)
 
     def get_employees(self):
         return self.employees.filter(branch=self)
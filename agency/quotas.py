@@ -0,0 +1,117 @@
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import Agency, AgencyEmployee
+
+BIODATA = 'biodata'
+FEATURED_BIODATA = 'featured_biodata'
+EMPLOYEES = 'employees'
+
+# Counter and limit fields of every quota on Agency
+QUOTA_FIELDS = {
+    BIODATA: ('amount_of_biodata', 'amount_of_biodata_allowed'),
+    FEATURED_BIODATA: (
+        'amount_of_featured_biodata',
+        'amount_of_featured_biodata_allowed'
+    ),
+    EMPLOYEES: ('amount_of_employees', 'amount_of_employees_allowed'),
+}
+
+COUNTER_FIELDS = [
+    counter_field for counter_field, limit_field in QUOTA_FIELDS.values()
+]
+
+
+class QuotaExceeded(Exception):
+    pass
+
+
+def adjust_quota(agency_id, quota, delta):
+    """
+    Moves a quota's counter by delta in a single UPDATE, without reading it.
+    A counter is never taken below zero, a drifted one is put right by
+    reconcile_quotas.
+    """
+    counter_field = QUOTA_FIELDS[quota][0]
+    agencies = Agency.objects.filter(pk=agency_id)
+    if delta < 0:
+        agencies = agencies.filter(**{f'{counter_field}__gte': -delta})
+    return agencies.update(**{counter_field: F(counter_field) + delta})
+
+
+def reserve_quota(agency_id, quota, amount=1):
+    """
+    Raises a quota's counter by amount if that keeps it within the agency's
+    limit. The check and the increment are a single conditional UPDATE, so
+    concurrent reservations can never overrun the limit. Returns whether the
+    amount was reserved.
+    """
+    counter_field, limit_field = QUOTA_FIELDS[quota]
+    return bool(
+        Agency.objects.filter(
+            pk=agency_id,
+            **{f'{counter_field}__lte': F(limit_field) - amount}
+        ).update(
+            **{counter_field: F(counter_field) + amount}
+        )
+    )
+
+
+def release_quota(agency_id, quota, amount=1):
+    return adjust_quota(agency_id, quota, -amount)
+
+
+def count_subquery(queryset):
+    # Number of rows of queryset per agency, 0 for an agency with none
+    return Coalesce(
+        Subquery(
+            queryset.filter(
+                agency=OuterRef('pk')
+            ).order_by().values('agency').annotate(
+                count=Count('pk')
+            ).values('count')
+        ),
+        Value(0)
+    )
+
+
+def reconcile_quotas(agency_ids=None):
+    """
+    Recomputes the true counters of every agency, or of the agencies in
+    agency_ids, in one query and writes back the ones that drifted. Returns
+    the agencies that were corrected.
+    """
+    from maid.constants import MaidStatusChoices
+    from maid.models import Maid
+
+    agencies = Agency.objects.annotate(
+        true_biodata=count_subquery(Maid.objects.all()),
+        true_featured_biodata=count_subquery(
+            Maid.objects.filter(status=MaidStatusChoices.FEATURED)
+        ),
+        true_employees=count_subquery(AgencyEmployee.objects.all())
+    ).only(
+        'pk',
+        *COUNTER_FIELDS
+    )
+    if agency_ids is not None:
+        agencies = agencies.filter(pk__in=agency_ids)
+
+    drifted = []
+    # The agencies are locked until their counters are written, so that no
+    # delta made meanwhile is overwritten
+    with transaction.atomic():
+        for agency in agencies.select_for_update(of=('self',)):
+            changed = False
+            for quota, (counter_field, limit_field) in QUOTA_FIELDS.items():
+                true_count = getattr(agency, f'true_{quota}')
+                if getattr(agency, counter_field) != true_count:
+                    setattr(agency, counter_field, true_count)
+                    changed = True
+            if changed:
+                drifted.append(agency)
+
+        # bulk_update skips the Agency save pipeline, counters do not need it
+        Agency.objects.bulk_update(drifted, COUNTER_FIELDS, batch_size=500)
+    return drifted
@@ -1,103 +1,105 @@
-import stripe
-from advertisement.models import Advertisement
-from django.conf import settings
-from django.db.models.signals import post_save, pre_save
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
-from maid.models import Maid
-from payment.models import Customer
+from maid.constants import MaidStatusChoices
+from maid.models import Maid, MaidSearchIndex
+from payment.helper_functions import enqueue_stripe_customer_sync
 
-from .models import Agency, AgencyEmployee, PotentialAgency
+from .helper_functions import bump_authority_version
+from .models import Agency, AgencyEmployee, AgencyOwner, PotentialAgency
+from .quotas import EMPLOYEES, adjust_quota
 
 
-@receiver(post_save, sender=Agency)
-def agency_created(sender, instance, created, **kwargs):
-    if created:
-        try:
-            pa = PotentialAgency.objects.get(
-                license_number=instance.license_number
-            )
-        except PotentialAgency.DoesNotExist as e:
-            print(e)
-        else:
-            pa.delete()
+def set_agency_frozen(agency, frozen):
+    # Frozen maids drop out of the public search, and come back to it as they
+    # were when they are unfrozen
+    Maid.objects.filter(
+        agency=agency
+    ).exclude(
+        frozen=frozen
+    ).update(
+        frozen=frozen
+    )
+    if frozen:
+        MaidSearchIndex.objects.filter(maid__agency=agency).delete()
+    else:
+        for maid in Maid.objects.filter(
+            agency=agency,
+            status__in=[
+                MaidStatusChoices.PUBLISHED,
+                MaidStatusChoices.FEATURED
+            ]
+        ):
+            maid.update_search_index()
 
 
 @receiver(post_save, sender=Agency)
-def stripe_customer_created_or_update(sender, instance, created, **kwargs):
-    agency = instance
+def agency_saved(sender, instance, created, **kwargs):
+    """
+    Save pipeline of an agency. Only acts on the tracked fields that the save
+    changed (Agency.get_dirty_fields), so counter updates and other routine
+    saves cost nothing here. Stripe is called out of band through the
+    StripeOutbox, queued in the same transaction as the save.
+    """
+    dirty_fields = getattr(instance, '_dirty_fields', {})
+
     if created:
-        stripe.api_key = settings.STRIPE_SECRET_KEY
-        try:
-            stripe_customer = stripe.Customer.create(
-                address={
-                    'city': 'Singapore',
-                    'country': 'Singapore',
-                    'line1': agency.get_main_branch().address_1,
-                    'line2': agency.get_main_branch().address_2,
-                    'postal_code': agency.get_main_branch().postal_code,
-                    'state': 'Singapore',
-                },
-                description=f'Customer account for {agency.name}',
-                email=None,
-                name=agency.name,
-                invoice_settings={
-                    'custom_fields': None,
-                    'default_payment_method': None,
-                    'footer': ''
-                }
-            )
-        except Exception as e:
-            print(e)
-        else:
-            new_customer = Customer(
-                agency=agency
-            )
-            new_customer.id = stripe_customer.id
-            new_customer.save()
-    else:
-        pass
+        PotentialAgency.objects.filter(
+            license_number=instance.license_number
+        ).delete()
+
+    if 'active' in dirty_fields:
+        if not instance.active:
+            set_agency_frozen(instance, True)
+        elif dirty_fields['active'] is False:
+            set_agency_frozen(instance, False)
+
+    if not created and 'name' in dirty_fields:
+        # Cached authorities carry the agency name
+        bump_authority_version('agency', instance.pk)
+
+    if created or 'name' in dirty_fields:
+        enqueue_stripe_customer_sync(instance)
 
 
 @receiver(post_save, sender=AgencyEmployee)
 def agency_employee_counter(sender, instance, created, **kwargs):
-    agency = instance.agency
-    agency.amount_of_employees = AgencyEmployee.objects.filter(
-        agency=agency
-    ).count()
-    agency.save()
+    # Employees created through the dashboard reserve their slot before
+    # they are saved
+    if created and not getattr(instance, '_quota_reserved', False):
+        adjust_quota(instance.agency_id, EMPLOYEES, 1)
 
 
-@receiver(post_save, sender=Agency)
-def deactivate_agency(sender, instance, created, **kwargs):
-    agency = instance
-    if not agency.active:
-        Maid.objects.filter(
-            agency=agency
-        ).update(
-            frozen=True
-        )
-        Advertisement.objects.filter(
-            agency=agency
-        ).update(
-            frozen=True
-        )
-
-
-@receiver(pre_save, sender=Agency)
-def reactivate_agency(sender, instance, **kwargs):
-    if instance.id:
-        current = instance
-        prev = agency = Agency.objects.get(
-            pk=instance.pk
-        )
-        if not prev.active and current.active:
-            Maid.objects.filter(
-                agency=agency
-            ).update(
-                frozen=False
-            )
-            Advertisement.objects.filter(
-                agency=agency
-            ).update(
-                frozen=False
-            )
+@receiver(post_delete, sender=AgencyEmployee)
+def agency_employee_deleted_counter(sender, instance, **kwargs):
+    adjust_quota(instance.agency_id, EMPLOYEES, -1)
+
+
+@receiver(post_save, sender=AgencyOwner)
+def agency_owner_created(sender, instance, created, **kwargs):
+    # The Stripe customer carries the owner's email
+    if created:
+        enqueue_stripe_customer_sync(instance.agency)
+
+
+@receiver(m2m_changed, sender=get_user_model().groups.through)
+def user_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ['post_add', 'post_remove', 'post_clear']:
+            bump_authority_version('user', instance.pk)
+    elif action in ['post_add', 'post_remove']:
+        # Changed through Group.user_set, pk_set holds the affected users
+        for user_pk in pk_set:
+            bump_authority_version('user', user_pk)
+    elif action == 'pre_clear':
+        # pk_set is not given on clear, collect the users before they go
+        for user_pk in instance.user_set.values_list('pk', flat=True):
+            bump_authority_version('user', user_pk)
+
+
+@receiver(post_save, sender=AgencyOwner)
+@receiver(post_delete, sender=AgencyOwner)
+@receiver(post_save, sender=AgencyEmployee)
+@receiver(post_delete, sender=AgencyEmployee)
+def agency_membership_changed(sender, instance, **kwargs):
+    bump_authority_version('user', instance.user_id)
@@ -1 +1,118 @@
-# Create your tests here.
+from django.test import TestCase
+from maid.constants import MaidStatusChoices
+from maid.models import Maid
+from onlinemaid.helper_functions import (create_test_user, r_contact_number,
+                                         r_string)
+
+from .models import Agency, AgencyBranch, AgencyEmployee
+from .quotas import (EMPLOYEES, FEATURED_BIODATA, QuotaExceeded,
+                     reconcile_quotas, release_quota, reserve_quota)
+
+# Start of Tests
+
+
+def create_test_maid(agency, status=MaidStatusChoices.UNPUBLISHED):
+    return Maid.objects.create(
+        agency=agency,
+        reference_number=r_string(8),
+        height=150,
+        weight=50,
+        repatriation_airport=r_string(10),
+        status=status
+    )
+
+
+class AgencyQuotaTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.agency = Agency.objects.create(
+            name=r_string(10),
+            license_number=r_string(8),
+            profile=r_string(20),
+            services=r_string(20),
+            amount_of_featured_biodata_allowed=2,
+            amount_of_employees_allowed=2
+        )
+
+    def get_featured_count(self):
+        self.agency.refresh_from_db(fields=['amount_of_featured_biodata'])
+        return self.agency.amount_of_featured_biodata
+
+    def testReserveStopsAtTheLimit(self):
+        self.assertTrue(reserve_quota(self.agency.pk, FEATURED_BIODATA))
+        self.assertTrue(reserve_quota(self.agency.pk, FEATURED_BIODATA))
+        self.assertFalse(reserve_quota(self.agency.pk, FEATURED_BIODATA))
+        self.assertEqual(self.get_featured_count(), 2)
+
+        release_quota(self.agency.pk, FEATURED_BIODATA)
+        # Nothing is reserved when only part of the amount fits
+        self.assertFalse(reserve_quota(self.agency.pk, FEATURED_BIODATA, 2))
+        self.assertEqual(self.get_featured_count(), 1)
+
+    def testReleaseNeverGoesBelowZero(self):
+        release_quota(self.agency.pk, FEATURED_BIODATA)
+        self.assertEqual(self.get_featured_count(), 0)
+
+        reserve_quota(self.agency.pk, FEATURED_BIODATA)
+        release_quota(self.agency.pk, FEATURED_BIODATA, 2)
+        self.assertEqual(self.get_featured_count(), 1)
+        release_quota(self.agency.pk, FEATURED_BIODATA)
+        self.assertEqual(self.get_featured_count(), 0)
+
+    def testFeaturingMaidAtTheLimitRaises(self):
+        for i in range(2):
+            create_test_maid(self.agency, MaidStatusChoices.FEATURED)
+        maid = create_test_maid(self.agency)
+        maid.status = MaidStatusChoices.FEATURED
+        with self.assertRaises(QuotaExceeded):
+            maid.save()
+        self.assertEqual(
+            Maid.objects.get(pk=maid.pk).status,
+            MaidStatusChoices.UNPUBLISHED
+        )
+        self.assertEqual(self.get_featured_count(), 2)
+
+    def testReservedEmployeeIsCountedOnce(self):
+        branch = AgencyBranch.objects.create(
+            agency=self.agency,
+            name=r_string(10),
+            address_1=r_string(10),
+            address_2=r_string(10),
+            postal_code='123456',
+            office_number=r_contact_number(),
+            mobile_number=r_contact_number(),
+            email=f'{r_string(6)}@{r_string(6)}.com'
+        )
+        for reserved in [False, True]:
+            employee = AgencyEmployee(
+                user=create_test_user()['obj'],
+                agency=self.agency,
+                branch=branch,
+                name=r_string(10),
+                contact_number=r_contact_number(),
+                email=f'{r_string(6)}@{r_string(6)}.com'
+            )
+            if reserved:
+                self.assertTrue(reserve_quota(self.agency.pk, EMPLOYEES))
+                employee._quota_reserved = True
+            employee.save()
+        self.agency.refresh_from_db(fields=['amount_of_employees'])
+        self.assertEqual(self.agency.amount_of_employees, 2)
+
+    def testReconcileCorrectsDriftedCounters(self):
+        create_test_maid(self.agency)
+        create_test_maid(self.agency, MaidStatusChoices.FEATURED)
+        Agency.objects.filter(pk=self.agency.pk).update(
+            amount_of_biodata=7,
+            amount_of_featured_biodata=0,
+            amount_of_employees=3
+        )
+
+        drifted = reconcile_quotas([self.agency.pk])
+        self.assertEqual([agency.pk for agency in drifted], [self.agency.pk])
+        self.agency.refresh_from_db()
+        self.assertEqual(self.agency.amount_of_biodata, 2)
+        self.assertEqual(self.agency.amount_of_featured_biodata, 1)
+        self.assertEqual(self.agency.amount_of_employees, 0)
+
+        self.assertEqual(reconcile_quotas([self.agency.pk]), [])
@@ -22,7 +22,10 @@ class AgencyList(GetAuthorityMixin, ListFilteredMixin, ListView):
     http_method_names = ['get']
     model = Agency
     template_name = 'list/agency-list.html'
-    queryset = Agency.objects.filter(active=True)
+    # The agency cards show each agency's main branch
+    queryset = Agency.objects.filter(active=True).prefetch_related(
+        Agency.prefetch_main_branch()
+    )
     filter_set = AgencyFilter
     paginate_by = settings.AGENCY_PAGINATE_BY
     ordering = ['name']
@@ -0,0 +1,53 @@
+import hashlib
+import json
+import uuid
+
+from agency.models import Agency
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from onlinemaid.cache import TieredCache
+
+# Response keys carry the agency generation, so a stale response can never be
+# looked up again and both tiers can hold it for the full timeout
+api_cache = TieredCache(
+    'api',
+    local_timeout=settings.API_CACHE_TIMEOUT,
+    shared_timeout=settings.API_CACHE_TIMEOUT
+)
+
+
+def get_agency_cache_generation(api_auth_id):
+    # Kept on the Agency row rather than in the cache, so that it is never
+    # culled and a bump is seen by every host at once
+    return Agency.objects.filter(
+        api_auth_id=api_auth_id
+    ).values_list(
+        'api_cache_generation',
+        flat=True
+    ).first()
+
+
+def bump_agency_cache_generation(agency_id):
+    # Cached responses are keyed on the generation, so replacing it orphans
+    # every cached response of the agency at once. A random token rather
+    # than a counter, so an old generation can never come back.
+    Agency.objects.filter(pk=agency_id).update(
+        api_cache_generation=uuid.uuid4()
+    )
+
+
+def get_api_response_cache_key(api_auth_id, path, query_params):
+    canonical_query = sorted(
+        (k, v) for k in query_params for v in query_params.getlist(k)
+    )
+    digest = hashlib.md5(
+        json.dumps([path, canonical_query]).encode('utf-8')
+    ).hexdigest()
+    generation = get_agency_cache_generation(api_auth_id)
+    return f'response:{api_auth_id}:{generation}:{digest}'
+
+
+def get_response_etag(data):
+    return '"{}"'.format(hashlib.md5(
+        json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder).encode('utf-8')
+    ).hexdigest())
@@ -0,0 +1,116 @@
+from django.utils.http import parse_etags
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+from .helper_functions import (api_cache, get_api_response_cache_key,
+                               get_response_etag)
+
+
+class EagerLoadingSerializerMixin:
+    """
+    Lets a serializer declare the relations it reads so that views can load
+    them up front instead of issuing one query per object.
+
+    Nested serializer fields are picked up automatically: a single nested
+    relation is joined with select_related and a many=True relation is
+    prefetched. Relations read through plain fields or `source` paths have
+    to be listed in `select_related_fields` / `prefetch_related_fields`.
+    """
+    select_related_fields = []
+    prefetch_related_fields = []
+
+    @classmethod
+    def get_eager_loading_lookups(cls, prefix=''):
+        select_related = [prefix + i for i in cls.select_related_fields]
+        prefetch_related = [prefix + i for i in cls.prefetch_related_fields]
+
+        for field_name, field in cls._declared_fields.items():
+            if not isinstance(field, BaseSerializer):
+                continue
+
+            many = isinstance(field, ListSerializer)
+            nested = field.child if many else field
+            lookup = prefix + (field.source or field_name)
+            if many:
+                prefetch_related.append(lookup)
+            else:
+                select_related.append(lookup)
+
+            if isinstance(nested, EagerLoadingSerializerMixin):
+                nested_select, nested_prefetch = (
+                    nested.get_eager_loading_lookups(lookup + '__')
+                )
+                # Joins below a prefetched relation have to be prefetched as
+                # well, select_related cannot follow a many relation
+                if many:
+                    prefetch_related += nested_select
+                else:
+                    select_related += nested_select
+                prefetch_related += nested_prefetch
+
+        return select_related, prefetch_related
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        select_related, prefetch_related = cls.get_eager_loading_lookups()
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+
+class EagerLoadingViewMixin:
+    """
+    Applies the serializer's declared eager loading to the view queryset.
+
+    Hooks into filter_queryset as both list() and get_object() pass the view
+    queryset through it, so views with their own get_queryset still benefit.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        if issubclass(serializer_class, EagerLoadingSerializerMixin):
+            queryset = serializer_class.setup_eager_loading(queryset)
+        return queryset
+
+
+class CachedResponseMixin:
+    """
+    Caches the serialized response of GET requests per agency.
+
+    The cache key carries the agency's cache generation, which the Maid
+    signals replace whenever one of the agency's maids changes, so a cached
+    response is never served after the underlying data has changed.
+    """
+
+    def get(self, request, *args, **kwargs):
+        api_auth_id = request.META.get('HTTP_AGENCY_AUTH_ID', None)
+        if not api_auth_id:
+            return super().get(request, *args, **kwargs)
+
+        cache_key = get_api_response_cache_key(
+            api_auth_id,
+            request.build_absolute_uri(request.path),
+            request.query_params
+        )
+        cached = api_cache.get(cache_key)
+        if cached is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            cached = {
+                'data': response.data,
+                'etag': get_response_etag(response.data)
+            }
+            api_cache.set(cache_key, cached)
+        else:
+            response = Response(cached['data'])
+
+        if cached['etag'] in parse_etags(
+            request.META.get('HTTP_IF_NONE_MATCH', '')
+        ):
+            response = Response(status=304)
+        response['ETag'] = cached['etag']
+        return response
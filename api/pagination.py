@@ -0,0 +1,137 @@
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.response import Response
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination keyed on the unique (created_on, id) pair.
+
+    Every position in the ordering is unique, so each page is a single
+    range scan over the (created_on, id) indexes starting after the last row
+    of the previous page and the cursor never needs an offset, however deep
+    the client pages.
+
+    Clients written against the unpaginated endpoints can pass `legacy=1`
+    to get a plain list instead, which holds at most legacy_max_results of
+    the latest rows.
+    """
+    ordering = ('-created_on', '-id')
+    page_size = settings.API_PAGINATE_BY
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+    legacy_query_param = 'legacy'
+    legacy_max_results = settings.API_LEGACY_MAX_RESULTS
+    legacy = False
+
+    def is_legacy(self, request):
+        return request.query_params.get(self.legacy_query_param) in [
+            '1',
+            'true'
+        ]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.legacy = self.is_legacy(request)
+        if self.legacy:
+            return list(
+                queryset.order_by('-created_on', '-id')[
+                    :self.legacy_max_results
+                ]
+            )
+
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            reverse, position = False, None
+        else:
+            reverse, position = self.cursor.reverse, self.cursor.position
+
+        if reverse:
+            queryset = queryset.order_by('created_on', 'id')
+        else:
+            queryset = queryset.order_by('-created_on', '-id')
+
+        if position is not None:
+            created_on, pk = self.parse_position(position)
+            if reverse:
+                queryset = queryset.filter(
+                    Q(created_on__gt=created_on) |
+                    Q(created_on=created_on, id__gt=pk)
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(created_on__lt=created_on) |
+                    Q(created_on=created_on, id__lt=pk)
+                )
+
+        # Fetch one extra row to find out if there is a page after this one
+        results = list(queryset[:self.page_size + 1])
+        has_following_page = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_following_page
+        else:
+            self.has_next = has_following_page
+            self.has_previous = position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def parse_position(self, position):
+        try:
+            created_on, pk = position.rsplit('_', 1)
+            created_on = parse_datetime(created_on)
+            pk = int(pk)
+        except (AttributeError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_on is None:
+            raise NotFound(self.invalid_cursor_message)
+        return created_on, pk
+
+    def _get_position_from_instance(self, instance, ordering=None):
+        if isinstance(instance, dict):
+            created_on, pk = instance['created_on'], instance['id']
+        else:
+            created_on, pk = instance.created_on, instance.pk
+        return f'{created_on.isoformat()}_{pk}'
+
+    def get_paginated_response(self, data):
+        if self.legacy:
+            return Response(data)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[-1])
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=False, position=position)
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[0])
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=True, position=position)
+        )
+
+
+class SimilarMaidCursorPagination(KeysetCursorPagination):
+    page_size = 4
+    legacy_max_results = 4
@@ -15,6 +15,8 @@ from onlinemaid.constants import EMPLOYERS
 from rest_framework.fields import IntegerField, ListField, UUIDField
 from rest_framework.serializers import CharField, ModelSerializer
 
+from .mixins import EagerLoadingSerializerMixin
+
 
 class MaidLanguageSerializer(ModelSerializer):
     language = CharField(source='get_language_display')
@@ -123,7 +125,7 @@ class MaidLoanTransactionSerializer(ModelSerializer):
         exclude = ['id', 'maid']
 
 
-class MaidSerializer(ModelSerializer):
+class MaidSerializer(EagerLoadingSerializerMixin, ModelSerializer):
     maid_type = CharField(source='get_maid_type_display')
     marital_status = CharField(source='get_marital_status_display')
     country_of_origin = CharField(source='get_country_of_origin_display')
@@ -163,7 +165,7 @@ class MaidSerializer(ModelSerializer):
         ]
 
 
-class SlimMaidSerializer(ModelSerializer):
+class SlimMaidSerializer(EagerLoadingSerializerMixin, ModelSerializer):
     maid_type = CharField(source='get_maid_type_display')
     marital_status = CharField(source='get_marital_status_display')
     country_of_origin = CharField(source='get_country_of_origin_display')
@@ -195,11 +197,13 @@ class MaidLanguageModelSerializer(ModelSerializer):
         fields = ['language']
 
 
-class GeneralEnquiryModelSerializer(ModelSerializer):
+class GeneralEnquiryModelSerializer(EagerLoadingSerializerMixin, ModelSerializer):
     maid_responsibility = MaidResponsibilityModelSerializer(many=True)
     languages_spoken = MaidLanguageModelSerializer(many=True)
     potential_employer = UUIDField(required=False)
 
+    select_related_fields = ['potential_employer__user']
+
     class Meta:
         model = GeneralEnquiry
         fields = '__all__'
@@ -246,11 +250,13 @@ class GeneralEnquiryModelSerializer(ModelSerializer):
         return instance
 
 
-class ShortlistedEnquiryModelSerializer(ModelSerializer):
+class ShortlistedEnquiryModelSerializer(EagerLoadingSerializerMixin, ModelSerializer):
     maids = PKMaidSerializer(many=True, read_only=True)
     write_maids = ListField(write_only=True)
     potential_employer = UUIDField()
 
+    select_related_fields = ['potential_employer__user']
+
     class Meta:
         model = ShortlistedEnquiry
         fields = '__all__'
@@ -296,7 +302,7 @@ class UserModelSerializer(ModelSerializer):
         fields = ['email', 'password']
 
 
-class PotentialEmployerModelSerializer(ModelSerializer):
+class PotentialEmployerModelSerializer(EagerLoadingSerializerMixin, ModelSerializer):
     user = UserModelSerializer()
 
     class Meta:
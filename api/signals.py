@@ -0,0 +1,56 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from maid.models import (Maid, MaidCooking, MaidDietaryRestriction,
+                         MaidDisabledCare, MaidElderlyCare,
+                         MaidEmploymentHistory, MaidFoodHandlingPreference,
+                         MaidGeneralHousework, MaidInfantChildCare,
+                         MaidLanguageProficiency, MaidLoanTransaction)
+
+from .helper_functions import bump_agency_cache_generation
+
+# Models nested in the maid API responses, changes to them have to invalidate
+# the cached responses just like changes to the maid itself
+maid_detail_models = [
+    MaidCooking,
+    MaidDietaryRestriction,
+    MaidDisabledCare,
+    MaidElderlyCare,
+    MaidEmploymentHistory,
+    MaidFoodHandlingPreference,
+    MaidGeneralHousework,
+    MaidInfantChildCare,
+    MaidLanguageProficiency,
+    MaidLoanTransaction
+]
+
+
+def invalidate_maid_api_cache(maid):
+    if maid.agency_id:
+        bump_agency_cache_generation(maid.agency_id)
+
+
+@receiver(post_save, sender=Maid)
+@receiver(post_delete, sender=Maid)
+def maid_api_cache_invalidated(sender, instance, **kwargs):
+    invalidate_maid_api_cache(instance)
+
+
+@receiver(m2m_changed, sender=Maid.languages.through)
+@receiver(m2m_changed, sender=Maid.responsibilities.through)
+def maid_m2m_api_cache_invalidated(sender, instance, action, reverse,
+                                   **kwargs):
+    if not reverse and action in ['post_add', 'post_remove', 'post_clear']:
+        invalidate_maid_api_cache(instance)
+
+
+def maid_detail_api_cache_invalidated(sender, instance, **kwargs):
+    try:
+        maid = instance.maid
+    except Maid.DoesNotExist:
+        return
+    invalidate_maid_api_cache(maid)
+
+
+for model in maid_detail_models:
+    post_save.connect(maid_detail_api_cache_invalidated, sender=model)
+    post_delete.connect(maid_detail_api_cache_invalidated, sender=model)
@@ -1,3 +1,68 @@
-from django.test import TestCase
+from agency.models import Agency
+from django.test import SimpleTestCase, TestCase
+from maid.models import Maid
+from onlinemaid.helper_functions import r_string
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
 
-# Create your tests here.
+from .pagination import KeysetCursorPagination
+from .serializers import MaidSerializer, ShortlistedEnquiryModelSerializer
+
+# Start of Tests
+
+
+class EagerLoadingSerializerTest(SimpleTestCase):
+    def testNestedSerializersAreJoinedOrPrefetched(self):
+        select_related, prefetch_related = (
+            MaidSerializer.get_eager_loading_lookups()
+        )
+        self.assertIn('cooking', select_related)
+        self.assertIn('language_proficiency', select_related)
+        self.assertIn('languages', prefetch_related)
+        self.assertIn('employment_history', prefetch_related)
+
+    def testDeclaredRelationsAreIncluded(self):
+        select_related, prefetch_related = (
+            ShortlistedEnquiryModelSerializer.get_eager_loading_lookups()
+        )
+        self.assertEqual(select_related, ['potential_employer__user'])
+        self.assertEqual(prefetch_related, ['maids'])
+
+
+class KeysetCursorPaginationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        agency = Agency.objects.create(
+            name=r_string(10),
+            license_number=r_string(8),
+            profile=r_string(20),
+            services=r_string(20)
+        )
+        for i in range(3):
+            Maid.objects.create(
+                agency=agency,
+                reference_number=r_string(8),
+                height=150,
+                weight=50,
+                repatriation_airport=r_string(10)
+            )
+
+    def paginate(self, **params):
+        request = Request(APIRequestFactory().get('/', params))
+        paginator = KeysetCursorPagination()
+        paginator.page_size = 2
+        paginator.legacy_max_results = 2
+        page = paginator.paginate_queryset(Maid.objects.all(), request)
+        return paginator.get_paginated_response(
+            [maid.pk for maid in page]
+        ).data
+
+    def testResponsesArePaginatedByDefault(self):
+        data = self.paginate()
+        self.assertEqual(len(data['results']), 2)
+        self.assertIsNotNone(data['next'])
+
+    def testLegacyListIsCapped(self):
+        data = self.paginate(legacy=1)
+        self.assertIsInstance(data, list)
+        self.assertEqual(len(data), 2)
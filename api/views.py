@@ -1,35 +1,52 @@
-import random
 from datetime import timedelta
 
 from accounts.models import PotentialEmployer
+from django.db.models import F
 from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
 from enquiry.models import GeneralEnquiry, ShortlistedEnquiry
 from maid.constants import (MaidLanguageChoices, MaidNationalityChoices,
                             MaidResponsibilityChoices, TypeOfMaidChoices)
-from maid.models import Maid, MaidLanguage, MaidResponsibility
+from maid.helper_functions import get_language_mask, get_responsibility_mask
+from maid.models import Maid
 from onlinemaid.constants import MaritalStatusChoices
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import (GenericAPIView, ListAPIView,
                                      ListCreateAPIView, RetrieveAPIView,
                                      get_object_or_404)
 from rest_framework.response import Response
 from rest_framework_api_key.permissions import HasAPIKey
 
+from .mixins import CachedResponseMixin, EagerLoadingViewMixin
+from .pagination import KeysetCursorPagination, SimilarMaidCursorPagination
 from .serializers import (GeneralEnquiryModelSerializer, MaidSerializer,
                           PotentialEmployerModelSerializer,
                           ShortlistedEnquiryModelSerializer,
                           SlimMaidSerializer)
 
 
-class MaidRetrieveAPIView(RetrieveAPIView):
+class MaidRetrieveAPIView(CachedResponseMixin, EagerLoadingViewMixin,
+                          RetrieveAPIView):
     permission_classes = [HasAPIKey]
     queryset = Maid.objects.all()
     serializer_class = MaidSerializer
 
+    def get_queryset(self):
+        # Scoped to the requesting agency so that a cached detail response is
+        # invalidated together with the rest of that agency's catalogue
+        api_auth_id = self.request.META.get('HTTP_AGENCY_AUTH_ID', None)
+        if api_auth_id:
+            return self.queryset.filter(agency__api_auth_id=api_auth_id)
+        else:
+            return self.queryset.all()
+
 
-class SimilarMaidListAPIView(ListAPIView):
+class SimilarMaidListAPIView(CachedResponseMixin, EagerLoadingViewMixin,
+                             ListAPIView):
     permission_classes = [HasAPIKey]
     queryset = Maid.objects.all()
     serializer_class = SlimMaidSerializer
+    pagination_class = SimilarMaidCursorPagination
     maid_id = None
 
     def dispatch(self, request, *args, **kwargs):
@@ -48,175 +65,191 @@ class SimilarMaidListAPIView(ListAPIView):
                 print(e)
                 return qs
             else:
-                languages = target_maid.languages.all()
                 country_of_origin = target_maid.country_of_origin
-                qs = qs.filter(
+                qs = qs.alias(
+                    language_match=F('language_mask').bitand(
+                        target_maid.language_mask
+                    )
+                ).filter(
                     country_of_origin=country_of_origin,
-                    languages__in=languages
+                    language_match__gt=0
                 ).exclude(
                     pk=self.maid_id
-                ).distinct()
-                if qs.count() <= 4:
-                    return qs
-                else:
-                    return random.choices(qs, k=4)
+                )
+                return qs
         else:
-            return None
+            return self.queryset.none()
 
 
-class MaidListAPIView(ListAPIView):
+class MaidListAPIView(CachedResponseMixin, EagerLoadingViewMixin,
+                      ListAPIView):
     permission_classes = [HasAPIKey]
     queryset = Maid.objects.all()
     serializer_class = SlimMaidSerializer
+    pagination_class = KeysetCursorPagination
+
+    def get_filter_param(self, name):
+        # 'NP' (not provided) and a missing parameter both mean no filter
+        value = self.request.query_params.get(name)
+        if value and value != 'NP':
+            return value
+        return None
+
+    def get_choice(self, choice_map, name, value):
+        try:
+            return choice_map[value]
+        except KeyError:
+            raise ValidationError({name: _('Invalid value')})
+
+    def get_age_param(self, name):
+        value = self.get_filter_param(name)
+        if value is None:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise ValidationError({name: _('Invalid value')})
 
     def get_queryset(self):
         api_auth_id = self.request.META.get('HTTP_AGENCY_AUTH_ID', None)
         if api_auth_id:
             qs = self.queryset.filter(agency__api_auth_id=api_auth_id)
-            if self.request.query_params:
-                query_params = self.request.query_params
-                # NP
-                maid_type = query_params.get("type")
-                if maid_type != 'NP':
-                    maid_type_map = {
-                        'N': TypeOfMaidChoices.NEW,
-                        'T': TypeOfMaidChoices.TRANSFER,
-                        'S': TypeOfMaidChoices.SINGAPORE_EXPERIENCE,
-                        'O': TypeOfMaidChoices.OVERSEAS_EXPERIENCE,
-                    }
-                    qs = qs.filter(
-                        maid_type=maid_type_map[maid_type]
-                    )
+            query_params = self.request.query_params
+
+            maid_type = self.get_filter_param('type')
+            if maid_type:
+                maid_type_map = {
+                    'N': TypeOfMaidChoices.NEW,
+                    'T': TypeOfMaidChoices.TRANSFER,
+                    'S': TypeOfMaidChoices.SINGAPORE_EXPERIENCE,
+                    'O': TypeOfMaidChoices.OVERSEAS_EXPERIENCE,
+                }
+                qs = qs.filter(
+                    maid_type=self.get_choice(maid_type_map, 'type', maid_type)
+                )
 
-                maid_nationality = query_params.get("nationality")
-                if maid_nationality != 'NP':
-                    maid_nationality_map = {
-                        'Filipino': MaidNationalityChoices.PHILIPPINES,
-                        'Indonesian': MaidNationalityChoices.INDONESIA,
-                        'Myanmarese': MaidNationalityChoices.MYANMAR,
-                        'Indian': MaidNationalityChoices.INDIA,
-                        'Cambodian': MaidNationalityChoices.CAMBODIA,
-                        'SriLankan': MaidNationalityChoices.SRI_LANKA
-                    }
-                    qs = qs.filter(
-                        country_of_origin=maid_nationality_map[
-                            maid_nationality]
+            maid_nationality = self.get_filter_param('nationality')
+            if maid_nationality:
+                maid_nationality_map = {
+                    'Filipino': MaidNationalityChoices.PHILIPPINES,
+                    'Indonesian': MaidNationalityChoices.INDONESIA,
+                    'Myanmarese': MaidNationalityChoices.MYANMAR,
+                    'Indian': MaidNationalityChoices.INDIA,
+                    'Cambodian': MaidNationalityChoices.CAMBODIA,
+                    'SriLankan': MaidNationalityChoices.SRI_LANKA
+                }
+                qs = qs.filter(
+                    country_of_origin=self.get_choice(
+                        maid_nationality_map,
+                        'nationality',
+                        maid_nationality
                     )
+                )
 
-                maid_marital_status = query_params.get("marital_status")
-                if maid_marital_status != 'NP':
-                    maid_marital_status_map = {
-                        'single': MaritalStatusChoices.SINGLE,
-                        'married': MaritalStatusChoices.MARRIED,
-                        'divorced': MaritalStatusChoices.DIVORCED,
-                        'widowed': MaritalStatusChoices.WIDOWED,
-                        'separated': MaritalStatusChoices.SEPARATED,
-                        'single-parent': MaritalStatusChoices.SINGLE_PARENT
-                    }
-                    qs = qs.filter(
-                        marital_status=maid_marital_status_map[
-                            maid_marital_status]
+            maid_marital_status = self.get_filter_param('marital_status')
+            if maid_marital_status:
+                maid_marital_status_map = {
+                    'single': MaritalStatusChoices.SINGLE,
+                    'married': MaritalStatusChoices.MARRIED,
+                    'divorced': MaritalStatusChoices.DIVORCED,
+                    'widowed': MaritalStatusChoices.WIDOWED,
+                    'separated': MaritalStatusChoices.SEPARATED,
+                    'single-parent': MaritalStatusChoices.SINGLE_PARENT
+                }
+                qs = qs.filter(
+                    marital_status=self.get_choice(
+                        maid_marital_status_map,
+                        'marital_status',
+                        maid_marital_status
                     )
-
-                maid_min_age = query_params.get("min_age")
-                maid_max_age = query_params.get("max_age")
-
-                time_now = timezone.now()
-                start_date = time_now - timedelta(
-                    365 * int(int(maid_max_age) + 1) +
-                    int(int(maid_max_age) // 4)
                 )
-                end_date = time_now - timedelta(
-                    365 * int(int(maid_min_age)) + int(int(maid_min_age) // 4)
+
+            time_now = timezone.now()
+            maid_max_age = self.get_age_param('max_age')
+            if maid_max_age is not None:
+                qs = qs.filter(
+                    date_of_birth__gte=time_now - timedelta(
+                        365 * (maid_max_age + 1) + maid_max_age // 4
+                    )
                 )
+            maid_min_age = self.get_age_param('min_age')
+            if maid_min_age is not None:
                 qs = qs.filter(
-                    date_of_birth__range=(
-                        start_date,
-                        end_date
+                    date_of_birth__lte=time_now - timedelta(
+                        365 * maid_min_age + maid_min_age // 4
                     )
                 )
 
-                language_list = []
-                maid_sl_english = query_params.get("sl_english")
-                if maid_sl_english:
-                    language_list.append(MaidLanguage.objects.get(
-                        language=MaidLanguageChoices.ENGLISH))
-                maid_sl_mandarin = query_params.get("sl_mandarin")
-                if maid_sl_mandarin:
-                    language_list.append(MaidLanguage.objects.get(
-                        language=MaidLanguageChoices.MANDARIN))
-                maid_sl_chinese_dialect = query_params.get(
-                    "sl_chinese_dialect")
-                if maid_sl_chinese_dialect:
-                    language_list.append(MaidLanguage.objects.get(
-                        language=MaidLanguageChoices.CHINESE_DIALECT))
-                maid_sl_malay = query_params.get("sl_malay")
-                if maid_sl_malay:
-                    language_list.append(MaidLanguage.objects.get(
-                        language=MaidLanguageChoices.MALAY))
-                maid_sl_tamil_hindi = query_params.get("sl_tamil_hindi")
-                if maid_sl_tamil_hindi:
-                    language_list.append(MaidLanguage.objects.get(
-                        language=MaidLanguageChoices.HINDI_TAMIL))
-
-                if language_list:
-                    qs = qs.filter(
-                        languages__in=language_list
+            language_param_map = {
+                'sl_english': MaidLanguageChoices.ENGLISH,
+                'sl_mandarin': MaidLanguageChoices.MANDARIN,
+                'sl_chinese_dialect': MaidLanguageChoices.CHINESE_DIALECT,
+                'sl_malay': MaidLanguageChoices.MALAY,
+                'sl_tamil_hindi': MaidLanguageChoices.HINDI_TAMIL
+            }
+            language_mask = get_language_mask(
+                language
+                for param, language in language_param_map.items()
+                if query_params.get(param)
+            )
+            if language_mask:
+                qs = qs.alias(
+                    language_match=F('language_mask').bitand(
+                        language_mask
                     )
-                responsibility_list = []
-                maid_resp_GEH = query_params.get("resp_GEH")
-                if maid_resp_GEH:
-                    responsibility_list.append(MaidResponsibility.objects.get(
-                        name=MaidResponsibilityChoices.MAID_RESP_GENERAL_HOUSEWORK))
-
-                maid_resp_COK = query_params.get("resp_COK")
-                if maid_resp_COK:
-                    responsibility_list.append(MaidResponsibility.objects.get(
-                        name=MaidResponsibilityChoices.MAID_RESP_COOKING))
-
-                maid_resp_CFI = query_params.get("resp_CFI")
-                if maid_resp_CFI:
-                    responsibility_list.append(MaidResponsibility.objects.get(
-                        name=MaidResponsibilityChoices.MAID_RESP_CARE_FOR_INFANTS_CHILDREN))
-
-                maid_resp_CFE = query_params.get("resp_CFE")
-                if maid_resp_CFE:
-                    responsibility_list.append(MaidResponsibility.objects.get(
-                        name=MaidResponsibilityChoices.MAID_RESP_CARE_FOR_ELDERLY))
-
-                maid_resp_CFD = query_params.get("resp_CFD")
-                if maid_resp_CFD:
-                    responsibility_list.append(MaidResponsibility.objects.get(
-                        name=MaidResponsibilityChoices.MAID_RESP_CARE_FOR_DISABLED))
-
-                if responsibility_list:
-                    qs = qs.filter(
-                        responsibilities__in=responsibility_list
+                ).filter(
+                    language_match__gt=0
+                )
+
+            responsibility_param_map = {
+                'resp_GEH': MaidResponsibilityChoices.MAID_RESP_GENERAL_HOUSEWORK,
+                'resp_COK': MaidResponsibilityChoices.MAID_RESP_COOKING,
+                'resp_CFI': MaidResponsibilityChoices.MAID_RESP_CARE_FOR_INFANTS_CHILDREN,
+                'resp_CFE': MaidResponsibilityChoices.MAID_RESP_CARE_FOR_ELDERLY,
+                'resp_CFD': MaidResponsibilityChoices.MAID_RESP_CARE_FOR_DISABLED
+            }
+            responsibility_mask = get_responsibility_mask(
+                responsibility
+                for param, responsibility in responsibility_param_map.items()
+                if query_params.get(param)
+            )
+            if responsibility_mask:
+                qs = qs.alias(
+                    responsibility_match=F('responsibility_mask').bitand(
+                        responsibility_mask
                     )
+                ).filter(
+                    responsibility_match__gt=0
+                )
             return qs
         else:
-            return None
+            return self.queryset.none()
 
 
-class GeneralEnquiryListCreateAPIView(ListCreateAPIView):
+class GeneralEnquiryListCreateAPIView(EagerLoadingViewMixin,
+                                      ListCreateAPIView):
     permission_classes = [HasAPIKey]
     queryset = GeneralEnquiry.objects.all()
     serializer_class = GeneralEnquiryModelSerializer
+    pagination_class = KeysetCursorPagination
 
 
-class ShortlistedEnquiryListCreateAPIView(ListCreateAPIView):
+class ShortlistedEnquiryListCreateAPIView(EagerLoadingViewMixin,
+                                          ListCreateAPIView):
     permission_classes = [HasAPIKey]
     queryset = ShortlistedEnquiry.objects.all()
     serializer_class = ShortlistedEnquiryModelSerializer
+    pagination_class = KeysetCursorPagination
 
 
-class PotentialEmployerListCreateAPIView(ListCreateAPIView):
+class PotentialEmployerListCreateAPIView(EagerLoadingViewMixin,
+                                         ListCreateAPIView):
     permission_classes = [HasAPIKey]
     queryset = PotentialEmployer.objects.all()
     serializer_class = PotentialEmployerModelSerializer
 
 
-class PotentialEmployerLoginAPIView(GenericAPIView):
+class PotentialEmployerLoginAPIView(EagerLoadingViewMixin, GenericAPIView):
     permission_classes = [HasAPIKey]
     queryset = PotentialEmployer.objects.all()
     serializer_class = PotentialEmployerModelSerializer
@@ -0,0 +1,242 @@
+import logging
+from decimal import Decimal
+
+from agency.models import AgencyEmployee
+from django.db import IntegrityError, transaction
+from django.db.models import Sum
+from django.db.models.functions import ExtractYear
+from django.utils import timezone
+from employer_documentation.models import EmployerDoc
+
+from .models import CaseMonthlyRollup
+
+logger = logging.getLogger(__name__)
+
+# First year of the dashboard's year charts, their categories start here
+CHART_FIRST_YEAR = 2020
+
+
+def get_month(date):
+    return date.replace(day=1)
+
+
+def get_next_month(month):
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+    return month.replace(month=month.month + 1)
+
+
+def get_chart_years():
+    return list(range(CHART_FIRST_YEAR, timezone.now().year + 1))
+
+
+def get_case_sales(employer_doc):
+    # A case without a fee schedule yet has no sales
+    fee_schedule = getattr(employer_doc, 'rn_servicefeeschedule_ed', None)
+    if fee_schedule is None:
+        return Decimal(0)
+    return fee_schedule.get_total_fee()
+
+
+def get_case_rollup_keys(**filters):
+    # (agency_employee_id, month) of the cases matching filters
+    return set(
+        (agency_employee_id, get_month(agreement_date))
+        for agency_employee_id, agreement_date in EmployerDoc.objects.filter(
+            **filters
+        ).values_list('employer__agency_employee_id', 'agreement_date')
+    )
+
+
+def refresh_case_rollup(agency_employee_id, month):
+    """
+    Recomputes the rollup of an agency staff for a month from their cases.
+    Only the cases of that month are read, so it costs the same no matter
+    how many cases the agency has.
+    """
+    cases = 0
+    sales = Decimal(0)
+    for employer_doc in EmployerDoc.objects.select_related(
+        'rn_servicefeeschedule_ed'
+    ).filter(
+        employer__agency_employee_id=agency_employee_id,
+        agreement_date__gte=month,
+        agreement_date__lt=get_next_month(month)
+    ):
+        cases += 1
+        sales += get_case_sales(employer_doc)
+
+    agency_employee = AgencyEmployee.objects.filter(
+        pk=agency_employee_id
+    ).values('agency_id', 'branch_id').first()
+    if not cases or agency_employee is None:
+        CaseMonthlyRollup.objects.filter(
+            agency_employee_id=agency_employee_id,
+            month=month
+        ).delete()
+        return
+
+    defaults = {
+        'agency_id': agency_employee['agency_id'],
+        'branch_id': agency_employee['branch_id'],
+        'cases': cases,
+        'sales': sales,
+    }
+    try:
+        with transaction.atomic():
+            CaseMonthlyRollup.objects.update_or_create(
+                agency_employee_id=agency_employee_id,
+                month=month,
+                defaults=defaults
+            )
+    except IntegrityError:
+        # Created by a concurrent refresh of the same month
+        CaseMonthlyRollup.objects.filter(
+            agency_employee_id=agency_employee_id,
+            month=month
+        ).update(**defaults)
+
+
+def refresh_case_rollups(keys):
+    # keys are (agency_employee_id, month) pairs
+    for agency_employee_id, month in set(keys):
+        if agency_employee_id is None or month is None:
+            continue
+        try:
+            refresh_case_rollup(agency_employee_id, month)
+        except Exception:
+            # The rollup is fixed by the next refresh or rebuild_analytics,
+            # a case is never failed over its chart figures
+            logger.exception(
+                'Refreshing the case rollup of agency employee %s for %s '
+                'failed',
+                agency_employee_id,
+                month
+            )
+
+
+def schedule_rollup_refresh(keys):
+    """
+    Refreshes the rollups of keys once the current transaction commits, so
+    that the committed cases are read. Nothing is refreshed on a rollback.
+    """
+    keys = set(keys)
+    if keys:
+        transaction.on_commit(lambda: refresh_case_rollups(keys))
+
+
+def rebuild_case_rollups(agency_ids=None):
+    """
+    Recomputes every rollup from scratch, of the agencies in agency_ids or
+    of all agencies. Returns the number of rollups written.
+    """
+    employer_docs = EmployerDoc.objects.select_related(
+        'employer__agency_employee',
+        'rn_servicefeeschedule_ed'
+    )
+    if agency_ids is not None:
+        employer_docs = employer_docs.filter(
+            employer__agency_employee__agency__in=agency_ids
+        )
+
+    rollups = {}
+    for employer_doc in employer_docs.iterator():
+        agency_employee = employer_doc.employer.agency_employee
+        key = (agency_employee.pk, get_month(employer_doc.agreement_date))
+        if key not in rollups:
+            rollups[key] = CaseMonthlyRollup(
+                agency_id=agency_employee.agency_id,
+                branch_id=agency_employee.branch_id,
+                agency_employee_id=agency_employee.pk,
+                month=key[1],
+                cases=0,
+                sales=Decimal(0)
+            )
+        rollups[key].cases += 1
+        rollups[key].sales += get_case_sales(employer_doc)
+
+    with transaction.atomic():
+        stale = CaseMonthlyRollup.objects.all()
+        if agency_ids is not None:
+            stale = stale.filter(agency__in=agency_ids)
+        stale.delete()
+        CaseMonthlyRollup.objects.bulk_create(
+            rollups.values(),
+            batch_size=500
+        )
+    return len(rollups)
+
+
+def get_chart_value(value):
+    # Sales are summed as Decimal, which the charts cannot plot
+    return float(value) if isinstance(value, Decimal) else value or 0
+
+
+def get_monthly_series(rollups, year, value):
+    # Totals of value for every month of year, January first
+    series = [0] * 12
+    for month, total in rollups.filter(
+        month__year=year
+    ).order_by().values('month').annotate(
+        total=Sum(value)
+    ).values_list('month', 'total'):
+        series[month.month - 1] += get_chart_value(total)
+    return series
+
+
+def get_yearly_series(rollups, value):
+    # Totals of value for every chart year
+    years = get_chart_years()
+    series = [0] * len(years)
+    for year, total in rollups.filter(
+        month__year__gte=CHART_FIRST_YEAR
+    ).annotate(
+        year=ExtractYear('month')
+    ).order_by().values('year').annotate(
+        total=Sum(value)
+    ).values_list('year', 'total'):
+        if year in years:
+            series[years.index(year)] += get_chart_value(total)
+    return series
+
+
+def get_series(rollups, value, year, group_by='month'):
+    if group_by == 'year':
+        return get_yearly_series(rollups, value)
+    return get_monthly_series(rollups, year, value)
+
+
+def get_branch_series(rollups, branches, value, year, group_by='month'):
+    # One series per branch, from a single grouped query
+    if group_by == 'year':
+        periods = get_chart_years()
+        rows = rollups.filter(
+            month__year__gte=CHART_FIRST_YEAR
+        ).annotate(
+            year=ExtractYear('month')
+        ).order_by().values('branch_id', 'year').annotate(
+            total=Sum(value)
+        ).values_list('branch_id', 'year', 'total')
+    else:
+        periods = list(range(1, 13))
+        rows = (
+            (branch_id, month.month, total)
+            for branch_id, month, total in rollups.filter(
+                month__year=year
+            ).order_by().values('branch_id', 'month').annotate(
+                total=Sum(value)
+            ).values_list('branch_id', 'month', 'total')
+        )
+
+    series = {branch.pk: [0] * len(periods) for branch in branches}
+    for branch_id, period, total in rows:
+        if branch_id in series and period in periods:
+            series[branch_id][periods.index(period)] += get_chart_value(
+                total
+            )
+    return [
+        {
+            'name': branch.name,
+            'data': series[branch.pk]
+        } for branch in branches
+    ]
@@ -10,6 +10,7 @@ from employer_documentation.models import CaseStatus, Employer, EmployerDoc
 from maid.constants import MaidStatusChoices
 from maid.models import Maid
 from onlinemaid.constants import AG_MANAGERS, AG_SALES
+from onlinemaid.helper_functions import get_blind_index
 
 
 class DashboardMaidFilter(DjangoFiltersFilterSet):
@@ -54,6 +55,17 @@ def get_agency_employee_list(requestObj):
     return qs
 
 
+def get_identity_number_q(value, prefix):
+    # Exact NRIC/FIN/passport match through the blind indexes, the numbers
+    # themselves are only stored encrypted
+    blind_index = get_blind_index(value)
+    return (
+        Q(**{f'{prefix}_nric_blind_index': blind_index})
+        | Q(**{f'{prefix}_fin_blind_index': blind_index})
+        | Q(**{f'{prefix}_passport_blind_index': blind_index})
+    )
+
+
 class DashboardEmployerFilter(DjangoFiltersFilterSet):
     MONTH_CHOICES = (
         (1, 'January'),
@@ -72,9 +84,9 @@ class DashboardEmployerFilter(DjangoFiltersFilterSet):
 
     employer_name = DjangoFiltersCharFilter(
         field_name='employer_name',
-        lookup_expr='icontains',
+        method='employer_search_filter',
         label=_('Search By'),
-        widget=TextInput(attrs={'placeholder': 'Name or Mobile'})
+        widget=TextInput(attrs={'placeholder': 'Name, Mobile or NRIC/FIN'})
     )
 
     # agency_employee = DjangoFilterModelChoiceFilter(
@@ -101,6 +113,13 @@ class DashboardEmployerFilter(DjangoFiltersFilterSet):
             'agency_employee'
         ]
 
+    def employer_search_filter(self, queryset, name, value):
+        return queryset.filter(
+            Q(employer_name__icontains=value)
+            | Q(employer_mobile_number__icontains=value)
+            | get_identity_number_q(value, 'employer')
+        )
+
     def employer_birthday_month_filter(self, queryset, name, value):
         return queryset.filter(
             employer_date_of_birth__month=value
@@ -142,6 +161,9 @@ class DashboardCaseFilter(DjangoFiltersFilterSet):
         return queryset.filter(
             Q(employer__employer_name__icontains=value)
             | Q(fdw__name__icontains=value)
+            | get_identity_number_q(value, 'employer__employer')
+            | Q(fdw__passport_number_blind_index=get_blind_index(value))
+            | Q(fdw__fin_number_blind_index=get_blind_index(value))
         )
 
     def agency_employee_filter(self, queryset, name, value):
@@ -170,6 +192,9 @@ class DashboardSalesFilter(DjangoFiltersFilterSet):
         return queryset.filter(
             Q(employer__employer_name__icontains=value)
             | Q(fdw__name__icontains=value)
+            | get_identity_number_q(value, 'employer__employer')
+            | Q(fdw__passport_number_blind_index=get_blind_index(value))
+            | Q(fdw__fin_number_blind_index=get_blind_index(value))
         )
 
 
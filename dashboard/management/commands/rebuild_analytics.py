@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.analytics import rebuild_case_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes the monthly case and sales rollups behind the dashboard '
+        'charts from the cases'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'agency_pks',
+            nargs='*',
+            type=int,
+            help='Only rebuild these agencies'
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_case_rollups(options['agency_pks'] or None)
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} rollups'))
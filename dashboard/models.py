@@ -0,0 +1,52 @@
+from agency.models import Agency, AgencyBranch, AgencyEmployee
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+
+
+class CaseMonthlyRollup(models.Model):
+    """
+    Cases and sales of an agency staff in a month, by contract date. Kept up
+    to date by dashboard.signals as cases and their fee schedules are saved,
+    so that the dashboard charts sum a handful of these rows rather than
+    scanning the cases. Branch and agency figures are sums of their staff's
+    rows.
+    """
+    agency = models.ForeignKey(
+        Agency,
+        on_delete=models.CASCADE,
+        related_name='case_monthly_rollups'
+    )
+    branch = models.ForeignKey(
+        AgencyBranch,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='case_monthly_rollups'
+    )
+    agency_employee = models.ForeignKey(
+        AgencyEmployee,
+        on_delete=models.CASCADE,
+        related_name='case_monthly_rollups'
+    )
+    month = models.DateField(
+        verbose_name=_('Month'),
+        help_text=_('First day of the month')
+    )
+    cases = models.PositiveIntegerField(
+        verbose_name=_('Cases'),
+        default=0
+    )
+    sales = models.DecimalField(
+        verbose_name=_('Sales'),
+        max_digits=12,
+        decimal_places=2,
+        default=0
+    )
+
+    class Meta:
+        unique_together = [['agency_employee', 'month']]
+        indexes = [
+            models.Index(fields=['agency', 'month'])
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.agency_employee_id} {self.month:%m/%Y}'
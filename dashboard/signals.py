@@ -0,0 +1,79 @@
+from agency.models import AgencyEmployee
+from django.db.models.signals import post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from employer_documentation.models import (DocServiceFeeSchedule, Employer,
+                                           EmployerDoc)
+
+from .analytics import get_case_rollup_keys, schedule_rollup_refresh
+from .models import CaseMonthlyRollup
+
+
+@receiver(pre_save, sender=EmployerDoc)
+def case_rollup_keys_before_save(sender, instance, **kwargs):
+    # The case's month and staff before the save, which it may move away from
+    if instance._state.adding:
+        instance._rollup_keys = set()
+    else:
+        instance._rollup_keys = get_case_rollup_keys(pk=instance.pk)
+
+
+@receiver(post_save, sender=EmployerDoc)
+def case_saved(sender, instance, **kwargs):
+    schedule_rollup_refresh(
+        getattr(instance, '_rollup_keys', set())
+        | get_case_rollup_keys(pk=instance.pk)
+    )
+
+
+@receiver(pre_delete, sender=EmployerDoc)
+def case_deleted(sender, instance, **kwargs):
+    # Read before the row goes, refreshed once the delete is committed
+    schedule_rollup_refresh(get_case_rollup_keys(pk=instance.pk))
+
+
+@receiver(post_save, sender=DocServiceFeeSchedule)
+@receiver(pre_delete, sender=DocServiceFeeSchedule)
+def fee_schedule_changed(sender, instance, **kwargs):
+    schedule_rollup_refresh(get_case_rollup_keys(pk=instance.employer_doc_id))
+
+
+@receiver(pre_save, sender=Employer)
+def employer_agency_employee_before_save(sender, instance, **kwargs):
+    if instance._state.adding:
+        return
+    instance._original_agency_employee_id = Employer.objects.filter(
+        pk=instance.pk
+    ).values_list('agency_employee_id', flat=True).first()
+
+
+@receiver(post_save, sender=Employer)
+def employer_saved(sender, instance, **kwargs):
+    original_agency_employee_id = getattr(
+        instance,
+        '_original_agency_employee_id',
+        None
+    )
+    if (
+        original_agency_employee_id is None
+        or original_agency_employee_id == instance.agency_employee_id
+    ):
+        return
+    # The employer's cases move to another staff, both sides change
+    keys = get_case_rollup_keys(employer=instance)
+    schedule_rollup_refresh(
+        keys
+        | set((original_agency_employee_id, month) for _, month in keys)
+    )
+
+
+@receiver(post_save, sender=AgencyEmployee)
+def agency_employee_branch_changed(sender, instance, created, **kwargs):
+    # A staff's figures count towards their current branch
+    if not created:
+        CaseMonthlyRollup.objects.filter(
+            agency_employee=instance
+        ).exclude(
+            branch_id=instance.branch_id
+        ).update(
+            branch_id=instance.branch_id
+        )
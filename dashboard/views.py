@@ -10,8 +10,9 @@ from agency.mixins import (AgencyLoginRequiredMixin, AgencyOwnerRequiredMixin,
                            GetAuthorityMixin)
 from agency.models import (Agency, AgencyBranch, AgencyEmployee,
                            AgencyOpeningHours, AgencyPlan)
+from agency.quotas import EMPLOYEES, QuotaExceeded, reserve_quota
 from django.conf import settings
-from django.contrib import messages
+from django.db import transaction
 from django.db.models.query import QuerySet as QS
 from django.forms.models import model_to_dict
 from django.http import JsonResponse
@@ -21,6 +22,7 @@ from django.http.response import HttpResponseBase as RESBASE
 from django.http.response import HttpResponseRedirect
 from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
+from django.utils import timezone
 from django.views.generic import ListView, View
 from django.views.generic.base import TemplateView
 from django.views.generic.detail import DetailView
@@ -44,9 +46,11 @@ from onlinemaid.constants import AG_ADMINS, AG_MANAGERS, AG_OWNERS, AG_SALES
 from onlinemaid.mixins import ListFilteredMixin, SuccessMessageMixin
 from onlinemaid.types import T
 
+from .analytics import get_branch_series, get_chart_years, get_series
 from .filters import (DashboardCaseFilter, DashboardEmployerFilter,
                       DashboardMaidFilter, DashboardSalesFilter,
                       DashboardStatusFilter)
+from .models import CaseMonthlyRollup
 
 
 class BaseDashboardView(AgencyLoginRequiredMixin, GetAuthorityMixin):
@@ -354,7 +358,20 @@ class BaseCreateView(BaseDashboardView, SuccessMessageMixin, CreateView):
     agency_id = ''
 
 
-class MaidInformationCreate(BaseCreateView):
+class MaidQuotaFormMixin:
+    # Maid.save raises QuotaExceeded when the agency has no featured slot
+    # left, e.g. taken by a concurrent request after the form was cleaned
+    def form_valid(self, form) -> res:
+        try:
+            # Rolls back what MaidForm.save did before saving the maid
+            with transaction.atomic():
+                return super().form_valid(form)
+        except QuotaExceeded as e:
+            form.add_error('status', str(e))
+            return self.form_invalid(form)
+
+
+class MaidInformationCreate(MaidQuotaFormMixin, BaseCreateView):
     context_object_name = 'maid_information'
     form_class = MaidForm
     model = Maid
@@ -407,15 +424,17 @@ class AgencyEmployeeCreate(BaseCreateView):
             pk=self.agency_id
         )
         form.instance.agency = agency
-        if agency.amount_of_employees < agency.amount_of_employees_allowed:
+        # The reservation is rolled back if saving the employee fails
+        with transaction.atomic():
+            if not reserve_quota(agency.pk, EMPLOYEES):
+                form.add_error(
+                    None,
+                    'You have reached the limit of employee accounts'
+                )
+                return self.form_invalid(form)
+            # Already counted, see agency.signals.agency_employee_counter
+            form.instance._quota_reserved = True
             return super().form_valid(form)
-        else:
-            messages.warning(
-                self.request,
-                'You have reached the limit of employee accounts',
-                extra_tags='error'
-            )
-            return super().form_invalid(form)
 
 
 class BaseDetailView(BaseDashboardView, DetailView):
@@ -935,7 +954,7 @@ class AgencyOpeningHoursUpdate(BaseUpdateView):
         )
 
 
-class MaidInformationUpdate(BaseUpdateView):
+class MaidInformationUpdate(MaidQuotaFormMixin, BaseUpdateView):
     context_object_name = 'maid_information'
     form_class = MaidForm
     model = Maid
@@ -970,68 +989,10 @@ class MaidInformationUpdate(BaseUpdateView):
         )
 
 
-class DataProviderView(View):
+class DataProviderView(BaseDashboardView, View):
     http_method_names = ['post']
-    fake_data = [4568,1017,3950,3898,4364,4872,3052,4346,3884,3895,4316,1998,
-                 4595,4887,4199,4518,2053,2862,3032,3752,1404,2432,3479,1108,
-                 4673,2794,2890,4220,3562,3150,4128,1209,4668,2115,3094,4405,
-                 3655,4254,3945,4958,3691,3850,3803,2049,2030,1851,4236,2602,
-                 3161,2543,2292,3335,3732,2326,2074,1004,1258,2248,4442,4074,
-                 4088,1440,2308,3257,3929,4497,3170,1454,2997,3198,4179,1393,
-                 1340,1136,2356,2625,4167,3263,4235,3678,3805,4934,4806,4884,
-                 1880,3598,4785,4945,1247,1463,4703,3296,1458,2785,3157,2845,
-                 4158,2084,3649,3295,3246,3123,4413,4646,1278,2531,2218,3978,
-                 2770,3458,3095,1289,4799,4390,2788,3549,3155,2940,2163,3355,
-                 4158,3598]
-    fake_sales_data = [
-      1928.13,1654.01,1872.78,1912.47,1920.25,1223.21,1282.1,
-      1271.75,1696.94,1924.69,1261.49,1319.17,1807.36,1365.63,
-      1727.43,1055.6,1348.16,1568.3,1792.91,1294.07,1690.68,
-      1142.61,1853.0,1645.32,1341.31,1154.14,1798.84,1729.81,
-      1942.27,1202.71,1035.82,1017.09,1235.47,1190.02,1536.62,
-      1692.85,1335.03,1647.84,1867.06,1634.16,1718.82,1120.49,
-      1533.14,1355.13,1294.28,1397.56,1107.7,1736.71,1742.2,
-      1827.31,1141.72,1091.86,1359.71,1584.98,1700.06,1177.02,
-      1946.78,1732.02,1953.49,1260.4,1778.15,1561.59,1798.72,
-      1726.44,1290.43,1073.86,1132.2,1828.6,1045.69,1120.69,
-      1001.71,1377.45,1842.9,1371.19,1045.64,1810.85,1843.43,
-      1911.8,1604.64,1165.26,1148.73,1755.65,1409.31,1854.43,
-      1811.62,1212.29,1211.54,1640.7,1189.74,1107.42,1426.02,
-      1664.72,1917.44,1342.77,1019.53,1747.43,1369.28,1328.59,
-      1375.66,1186.99,1950.93,1446.33,1948.52,1120.59,1554.5,
-      1356.33,1725.75,1408.0,1674.73,1026.94,1518.31,1840.69,
-      1619.91,1855.73,1426.11,1964.36,1760.13,1126.69,1766.17,
-      1705.75
-    ]
-    fake_cases_data = [16,12,8,6,11,5,6,9,3,1,3,13,8,5,6,12,2,17,2,10,4,12,5,
-                       11,10,6,13,19,8,16,2,1,9,9,12,7,13,9,5,14,5,19,5,2,6,5,
-                       9,5,17,4,16,17,12,6,18,19,6,12,2,13,2,7,9,5,2,10,6,11,
-                       12,2,10,4,14,14,11,5,2,9,7,16,11,12,7,1,5,12,4,8,6,10,
-                       11,12,5,13,4,18,13,13,5,9,9,18,7,9,15,7,20,11,9,12,4,13,
-                       13,11,20,16,15,20,2,10]
-    fake_branch_sales_data = [7203.69,8419.7,8230.95,9840.45,5877.32,7614.21,
-                              7919.48,5403.54,6325.09,8116.59,6517.71,9828.19,
-                              8632.35,5702.67,7274.22,8146.06,8446.57,9163.38,
-                              5757.1,6281.02,6301.7,7759.16,7224.4,5220.92,
-                              6322.76,6643.53,7529.99,6551.53,5120.07,8878.12,
-                              9294.73,5194.74,8749.17,6188.3,8964.15,9950.87,
-                              5056.55,7089.83,6415.79,7859.23,8783.14,9470.29,
-                              8756.18,5328.67,7297.28,7814.36,5942.56,8052.46,
-                              9640.71,9771.37,6753.69,7946.88,9562.48,9145.13,
-                              5941.54,9267.76,9320.44,7578.25,9922.31,9648.36,
-                              9222.82,5534.83,8289.89,8785.74,6196.33,7951.15,
-                              5494.57,8937.8,9834.39,5595.87,8702.58,7737.33]
-    fake_branch_sales_data_year = [
-      11134.64,86113.64,81633.42,88957.0,77072.09, 72969.25
-    ]
-    fake_branch_cases_data = [
-      78,72,78,79,93,52,51,100,67,65,70,88,78,76,71,50,
-      80,56,70,52,59,77,68,91,82,95,53,81,92,82,99,93,
-      76,84,67,52,79,66,76,88,75,95,99,84,51,92,81,71,
-      61,96,95,91,85,51,72,93,73,74,76,59,66,92,55,77,
-      60,85,65,64,62,85,70,75
-    ]
-    fake_branch_cases_data_year = [127,49,13,81,110,113]
+    authority = ''
+    agency_id = ''
     fake_fdw_timline_data = [
         {
             "name":"Penny Truwert",
@@ -1145,350 +1106,108 @@ class DataProviderView(View):
         }
     ]
 
+    def get_rollups(self) -> QS:
+        # Charts only show the figures the user can see the cases of
+        rollups = CaseMonthlyRollup.objects.filter(agency_id=self.agency_id)
+        if self.authority == AG_MANAGERS:
+            rollups = rollups.filter(
+                branch=self.request.user.agency_employee.branch
+            )
+        elif self.authority == AG_SALES:
+            rollups = rollups.filter(
+                agency_employee=self.request.user.agency_employee
+            )
+        elif self.authority not in [AG_OWNERS, AG_ADMINS]:
+            rollups = rollups.none()
+        return rollups
+
+    def get_agency_employees(self) -> QS:
+        agency_employees = AgencyEmployee.objects.filter(
+            agency_id=self.agency_id
+        )
+        if self.authority == AG_MANAGERS:
+            agency_employees = agency_employees.filter(
+                branch=self.request.user.agency_employee.branch
+            )
+        elif self.authority == AG_SALES:
+            agency_employees = agency_employees.filter(
+                pk=self.request.user.agency_employee.pk
+            )
+        return agency_employees
+
+    def get_branches(self) -> QS:
+        branches = AgencyBranch.objects.filter(
+            agency_id=self.agency_id
+        ).order_by('pk')
+        if self.authority in [AG_MANAGERS, AG_SALES]:
+            branches = branches.filter(
+                pk=self.request.user.agency_employee.branch_id
+            )
+        return branches
+
     def post(self, request: req, *args: Any, **kwargs: Any) -> RESBASE:
         request_data = json.loads(request.body.decode('utf-8'))
-        chart = request_data.get('chart')
-        # authority = request_data.get('authority')
-        if chart['name'] == 'salesChart':
-            if chart['year'] == '2020':
-                chart_data = [{
-                    'name': 'Sales',
-                    'data': self.fake_data[0:12]
-                }]
-            elif chart['year'] == '2021':
-                chart_data = [{
-                    'name': 'Sales',
-                    'data': self.fake_data[12:24]
-                }]
-            elif chart['year'] == '2022':
-                chart_data = [{
-                    'name': 'Sales',
-                    'data': self.fake_data[24:36]
-                }]
-            elif chart['year'] == '2023':
-                chart_data = [{
-                    'name': 'Sales',
-                    'data': self.fake_data[36:48]
-                }]
-            elif chart['year'] == '2024':
-                chart_data = [{
-                    'name': 'Sales',
-                    'data': self.fake_data[48:60]
-                }]
-            elif chart['year'] == '2025':
-                chart_data = [{
-                    'name': 'Sales',
-                    'data': self.fake_data[60:72]
-                }]
-            elif chart['year'] == '2026':
-                chart_data = [{
-                    'name': 'Sales',
-                    'data': self.fake_data[72:84]
-                }]
-            elif chart['year'] == '2027':
-                chart_data = [{
-                    'name': 'Sales',
-                    'data': self.fake_data[84:96]
-                }]
-            elif chart['year'] == '2028':
-                chart_data = [{
-                    'name': 'Sales',
-                    'data': self.fake_data[96:108]
-                }]
-            elif chart['year'] == '2029':
-                chart_data = [{
-                    'name': 'Sales',
-                    'data': self.fake_data[108:120]
-                }]
-            else:
-                chart_data = [{
-                    'name': 'Sales',
-                    'data': self.fake_data[120:]
-                }]
-
-        if chart['name'] == 'salesStaffPerformanceSales':
-            if chart['year'] == '2020':
-                if chart['staff'] == 'john':
-                    chart_data = [
-                        {
-                            'name': 'john',
-                            'data': self.fake_sales_data[0:36:3]
-                        }
-                    ]
-                elif chart['staff'] == 'jane':
-                    chart_data = [
-                        {
-                            'name': 'jane',
-                            'data': self.fake_sales_data[1:37:3]
-                        }
-                    ]
-                elif chart['staff'] == 'dave':
-                    chart_data = [
-                        {
-                            'name': 'dave',
-                            'data': self.fake_sales_data[2:38:3]
-                        }
-                    ]
-
-            elif chart['year'] == '2021':
-                if chart['staff'] == 'john':
-                    chart_data = [
-                        {
-                            'name': 'john',
-                            'data': self.fake_sales_data[36:72:3]
-                        }
-                    ]
-                elif chart['staff'] == 'jane':
-                    chart_data = [
-                        {
-                            'name': 'jane',
-                            'data': self.fake_sales_data[37:73:3]
-                        }
-                    ]
-                elif chart['staff'] == 'dave':
-                    chart_data = [
-                        {
-                            'name': 'dave',
-                            'data': self.fake_sales_data[38:74:3]
-                        }
-                    ]
-
-            elif chart['year'] == '2022':
-                if chart['staff'] == 'john':
-                    chart_data = [
-                        {
-                            'name': 'john',
-                            'data': self.fake_sales_data[72:108:3]
-                        }
-                    ]
-                elif chart['staff'] == 'jane':
-                    chart_data = [
-                        {
-                            'name': 'jane',
-                            'data': self.fake_sales_data[73:109:3]
-                        }
-                    ]
-                elif chart['staff'] == 'dave':
-                    chart_data = [
-                        {
-                            'name': 'dave',
-                            'data': self.fake_sales_data[74:110:3]
-                        }
-                    ]
+        chart = request_data.get('chart') or {}
+        group_by = str(chart.get('group_by') or 'month').lower()
+        try:
+            year = int(chart.get('year'))
+        except (TypeError, ValueError):
+            year = timezone.now().year
+        chart_data = []
 
-            else:
-                if chart['staff'] == 'john':
-                    chart_data = [
-                        {
-                            'name': 'john',
-                            'data': self.fake_sales_data[108::3]
-                        }
-                    ]
-                elif chart['staff'] == 'jane':
-                    chart_data = [
-                        {
-                            'name': 'jane',
-                            'data': self.fake_sales_data[109::3]
-                        }
-                    ]
-                elif chart['staff'] == 'dave':
-                    chart_data = [
-                        {
-                            'name': 'dave',
-                            'data': self.fake_sales_data[110::3]
-                        }
-                    ]
-
-        if chart['name'] == 'salesStaffPerformanceCases':
-            if chart['year'] == '2020':
-                if chart['staff'] == 'john':
-                    chart_data = [
-                        {
-                            'name': 'john',
-                            'data': self.fake_cases_data[0:36:3]
-                        }
-                    ]
-                elif chart['staff'] == 'jane':
-                    chart_data = [
-                        {
-                            'name': 'jane',
-                            'data': self.fake_cases_data[1:37:3]
-                        }
-                    ]
-                elif chart['staff'] == 'dave':
-                    chart_data = [
-                        {
-                            'name': 'dave',
-                            'data': self.fake_cases_data[2:38:3]
-                        }
-                    ]
-
-            elif chart['year'] == '2021':
-                if chart['staff'] == 'john':
-                    chart_data = [
-                        {
-                            'name': 'john',
-                            'data': self.fake_cases_data[36:72:3]
-                        }
-                    ]
-                elif chart['staff'] == 'jane':
-                    chart_data = [
-                        {
-                            'name': 'jane',
-                            'data': self.fake_cases_data[37:73:3]
-                        }
-                    ]
-                elif chart['staff'] == 'dave':
-                    chart_data = [
-                        {
-                            'name': 'dave',
-                            'data': self.fake_cases_data[38:74:3]
-                        }
-                    ]
-
-            elif chart['year'] == '2022':
-                if chart['staff'] == 'john':
-                    chart_data = [
-                        {
-                            'name': 'john',
-                            'data': self.fake_cases_data[72:108:3]
-                        }
-                    ]
-                elif chart['staff'] == 'jane':
-                    chart_data = [
-                        {
-                            'name': 'jane',
-                            'data': self.fake_cases_data[73:109:3]
-                        }
-                    ]
-                elif chart['staff'] == 'dave':
-                    chart_data = [
-                        {
-                            'name': 'dave',
-                            'data': self.fake_cases_data[74:110:3]
-                        }
-                    ]
+        if chart.get('name') == 'salesChart':
+            chart_data = [
+                {
+                    'name': 'Sales',
+                    'data': get_series(
+                        self.get_rollups(),
+                        'sales',
+                        year,
+                        group_by
+                    )
+                }
+            ]
 
-            else:
-                if chart['staff'] == 'john':
-                    chart_data = [
-                        {
-                            'name': 'john',
-                            'data': self.fake_cases_data[108::3]
-                        }
-                    ]
-                elif chart['staff'] == 'jane':
-                    chart_data = [
-                        {
-                            'name': 'jane',
-                            'data': self.fake_cases_data[109::3]
-                        }
-                    ]
-                elif chart['staff'] == 'dave':
-                    chart_data = [
-                        {
-                            'name': 'dave',
-                            'data': self.fake_cases_data[110::3]
-                        }
-                    ]
-
-        if chart['name'] == 'branchPerformanceSales':
-            if chart['group_by'] == 'Month':
-                if chart['year'] == '2010':
-                    chart_data = [
-                        {
-                            'name': 'branch 1',
-                            'data': self.fake_branch_sales_data[0:36:3]
-                        },
-                        {
-                            'name': 'branch 2',
-                            'data': self.fake_branch_sales_data[1:37:3]
-                        },
-                        {
-                            'name': 'branch 3',
-                            'data': self.fake_branch_sales_data[2:38:3]
-                        }
-                    ]
-                elif chart['year'] == '2011':
-                    chart_data = [
-                        {
-                            'name': 'branch 1',
-                            'data': self.fake_branch_sales_data[36:72:3]
-                        },
-                        {
-                            'name': 'branch 2',
-                            'data': self.fake_branch_sales_data[37:73:3]
-                        },
-                        {
-                            'name': 'branch 3',
-                            'data': self.fake_branch_sales_data[38:74:3]
-                        }
-                    ]
-            else:
+        if chart.get('name') in [
+            'salesStaffPerformanceSales',
+            'salesStaffPerformanceCases'
+        ]:
+            value = 'sales' if chart['name'].endswith('Sales') else 'cases'
+            staff = str(chart.get('staff', ''))
+            agency_employee = None
+            if staff.isdigit():
+                agency_employee = self.get_agency_employees().filter(
+                    pk=staff
+                ).first()
+            if agency_employee:
                 chart_data = [
                     {
-                        'name': 'branch 1',
-                        'data': self.fake_branch_sales_data_year[0::3]
-                    },
-                    {
-                        'name': 'branch 2',
-                        'data': self.fake_branch_sales_data_year[1::3]
-                    },
-                    {
-                        'name': 'branch 3',
-                        'data': self.fake_branch_sales_data_year[2::3]
+                        'name': agency_employee.name,
+                        'data': get_series(
+                            self.get_rollups().filter(
+                                agency_employee=agency_employee
+                            ),
+                            value,
+                            year,
+                            group_by
+                        )
                     }
                 ]
 
-        if chart['name'] == 'branchPerformanceCases':
-            if chart['group_by'] == 'Month':
-                if chart['year'] == '2010':
-                    chart_data = [
-                        {
-                            'name': 'branch 1',
-                            'data': self.fake_branch_cases_data[0:36:3]
-                        },
-                        {
-                            'name': 'branch 2',
-                            'data': self.fake_branch_cases_data[1:37:3]
-                        },
-                        {
-                            'name': 'branch 3',
-                            'data': self.fake_branch_cases_data[2:38:3]
-                        }
-                    ]
-                elif chart['year'] == '2011':
-                    chart_data = [
-                        {
-                            'name': 'branch 1',
-                            'data': self.fake_branch_cases_data[36:72:3]
-                        },
-                        {
-                            'name': 'branch 2',
-                            'data': self.fake_branch_cases_data[37:73:3]
-                        },
-                        {
-                            'name': 'branch 3',
-                            'data': self.fake_branch_cases_data[38:74:3]
-                        }
-                    ]
-            else:
-                chart_data = [
-                    {
-                        'name': 'branch 1',
-                        'data': self.fake_branch_cases_data_year[0::3]
-                    },
-                    {
-                        'name': 'branch 2',
-                        'data': self.fake_branch_cases_data_year[1::3]
-                    },
-                    {
-                        'name': 'branch 3',
-                        'data': self.fake_branch_cases_data_year[2::3]
-                    }
-                ]
+        if chart.get('name') in [
+            'branchPerformanceSales',
+            'branchPerformanceCases'
+        ]:
+            value = 'sales' if chart['name'].endswith('Sales') else 'cases'
+            chart_data = get_branch_series(
+                self.get_rollups(),
+                self.get_branches(),
+                value,
+                year,
+                group_by
+            )
 
-        if chart['name'] == 'agencyTimelinePerformance':
+        if chart.get('name') == 'agencyTimelinePerformance':
             chart_data = [
                 {
                     'name': 'Deposit',
@@ -1504,8 +1223,8 @@ class DataProviderView(View):
                 }
             ]
 
-        if chart['name'] == 'fdwTimeline':
-            if chart['group_by'] == 'Week':
+        if chart.get('name') == 'fdwTimeline':
+            if group_by == 'week':
                 chart_data = [
                     {
                         'name': i['name'],
@@ -1528,7 +1247,7 @@ class DataProviderView(View):
                         ]
                     } for i in self.fake_fdw_timline_data
                 ]
-            elif chart['group_by'] == 'Month':
+            elif group_by == 'month':
                 chart_data = [
                     {
                         'name': i['name'],
@@ -1551,8 +1270,8 @@ class DataProviderView(View):
                 ]
 
         data = {
-            'name': 'Sales',
-            'data': {}
+            'name': chart.get('name'),
+            'data': chart_data
         }
         return JsonResponse(data, status=200)
 
@@ -1568,7 +1287,12 @@ class HomePage(BaseDashboardView, TemplateView):
             pk=self.agency_id
         )
         kwargs.update({
-            'agency': agency
+            'agency': agency,
+            'chart_years': get_chart_years(),
+            'sales_staff': AgencyEmployee.objects.filter(
+                agency=agency,
+                deleted=False
+            ).order_by('name')
         })
         return kwargs
 
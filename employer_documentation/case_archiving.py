@@ -0,0 +1,123 @@
+from agency.models import AgencyBranch
+from django.db import transaction
+
+from .constants import CaseStatusChoices
+from .models import ArchivedAgencyDetails, ArchivedMaid, EmployerDoc
+
+ARCHIVE_BATCH_SIZE = 500
+
+
+def get_main_branches(agency_ids):
+    # Same as Agency.get_main_branch, for many agencies in one query
+    main_branches = {}
+    for branch in AgencyBranch.objects.filter(
+        agency__in=agency_ids,
+        main_branch=True
+    ).order_by('agency_id', 'pk'):
+        main_branches.setdefault(branch.agency_id, branch)
+    return main_branches
+
+
+def get_archived_agency_details(employer_doc, main_branch):
+    agency_employee = employer_doc.employer.agency_employee
+    agency = agency_employee.agency
+    return ArchivedAgencyDetails(
+        agency_name=agency.name,
+        agency_license_no=agency.license_number,
+        agency_address_line_1=main_branch.address_1 if main_branch else '',
+        agency_address_line_2=main_branch.address_2 if main_branch else '',
+        agency_postal_code=main_branch.postal_code if main_branch else '',
+        agency_employee_name=agency_employee.name,
+        agency_employee_ea_personnel_number=(
+            agency_employee.ea_personnel_number
+        ),
+        agency_employee_branch=agency_employee.branch.name
+    )
+
+
+def get_archived_maid(employer_doc):
+    fdw = employer_doc.fdw
+    return ArchivedMaid(
+        name=fdw.name,
+        nationality=fdw.get_country_of_origin_display(),
+        passport_number=fdw.get_packed_field('passport_number'),
+        fin_number=fdw.get_packed_field('fin_number')
+    )
+
+
+def archive_case_batch(pks):
+    with transaction.atomic():
+        # Locked so that a case archived concurrently is not snapshotted
+        # twice
+        employer_docs = list(
+            EmployerDoc.objects.select_for_update(
+                of=('self',)
+            ).select_related(
+                'employer__agency_employee__agency',
+                'employer__agency_employee__branch',
+                'fdw'
+            ).filter(
+                pk__in=pks
+            ).exclude(
+                status=CaseStatusChoices.ARCHIVED
+            )
+        )
+        if not employer_docs:
+            return 0
+
+        main_branches = get_main_branches(set(
+            employer_doc.employer.agency_employee.agency_id
+            for employer_doc in employer_docs
+        ))
+        archived_agency_details = ArchivedAgencyDetails.objects.bulk_create([
+            get_archived_agency_details(
+                employer_doc,
+                main_branches.get(
+                    employer_doc.employer.agency_employee.agency_id
+                )
+            )
+            for employer_doc in employer_docs
+        ])
+        archived_maids = ArchivedMaid.objects.bulk_create([
+            get_archived_maid(employer_doc)
+            for employer_doc in employer_docs
+        ])
+
+        for employer_doc, agency_details, archived_maid in zip(
+            employer_docs,
+            archived_agency_details,
+            archived_maids
+        ):
+            employer_doc.archived_agency_details = agency_details
+            employer_doc.archived_maid = archived_maid
+            employer_doc.status = CaseStatusChoices.ARCHIVED
+
+        # One UPDATE for the whole batch
+        EmployerDoc.objects.bulk_update(
+            employer_docs,
+            ['archived_agency_details', 'archived_maid', 'status']
+        )
+        return len(employer_docs)
+
+
+def archive_cases(queryset, batch_size=ARCHIVE_BATCH_SIZE, progress=None):
+    """
+    Archives every case of queryset that is not archived yet, snapshotting
+    its agency and maid details.
+
+    Runs in batches of batch_size cases, each batch in its own transaction
+    with a fixed number of queries. progress, if given, is called after each
+    batch with the number of cases archived so far and the total. Returns
+    the number of cases archived.
+    """
+    pks = list(
+        queryset.exclude(
+            status=CaseStatusChoices.ARCHIVED
+        ).order_by('pk').values_list('pk', flat=True)
+    )
+    archived = 0
+    for start in range(0, len(pks), batch_size):
+        archived += archive_case_batch(pks[start:start + batch_size])
+        if progress:
+            progress(archived, len(pks))
+    return archived
@@ -0,0 +1,190 @@
+import io
+import logging
+import zipfile
+from urllib.parse import urljoin
+
+from django.urls import reverse
+
+from .case_snapshots import get_case_snapshot, iter_snapshot_documents
+from .pdf_cache import get_pdf_cache_key, open_cached_pdf, store_pdf
+from .pdf_rendering import (get_render_result, iter_case_document_html,
+                            submit_render)
+
+logger = logging.getLogger(__name__)
+
+# Agency PDF route of every HTML based document. The PDFs are rendered with
+# the route's URL as base URL, like the single document views do, so that
+# both share the same cached renders.
+AGENCY_PDF_URL_NAMES = {
+    'pdf/01-service-fee-schedule.html': 'pdf_agency_service_fee_schedule',
+    'pdf/03-service-agreement.html': 'pdf_agency_service_agreement',
+    'pdf/04-employment-contract.html': 'pdf_agency_employment_contract',
+    'pdf/05-repayment-schedule.html': 'pdf_agency_repayment_schedule',
+    'pdf/06-rest-day-agreement.html': 'pdf_agency_rest_day_agreement',
+    'pdf/08-handover-checklist.html': 'pdf_agency_handover_checklist',
+    'pdf/09-transfer-consent.html': 'pdf_agency_transfer_consent',
+    'pdf/10-work-pass-authorisation.html': (
+        'pdf_agency_work_pass_authorisation'
+    ),
+    'pdf/13-income-tax-declaration.html': 'pdf_agency_income_tax_declaration',
+    'pdf/14-safety-agreement.html': 'pdf_agency_safety_agreement',
+    'pdf/deposit-invoice.html': 'pdf_agency_deposit_invoice',
+}
+
+# DocUpload file fields, with the filename they are served under
+UPLOADED_DOCUMENTS = [
+    ('job_order_pdf', 'job_order.pdf'),
+    ('ipa_pdf', 'ipa.pdf'),
+    ('medical_report_pdf', 'medical_report.pdf'),
+]
+
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+class ZipStream:
+    """
+    Write only file the ZIP archive is written to. What has been written so
+    far is taken out with drain(), so only the current chunk is in memory.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def get_document_base_url(site_url, employer_doc, template_name):
+    return urljoin(
+        site_url,
+        reverse(
+            AGENCY_PDF_URL_NAMES[template_name],
+            kwargs={'level_1_pk': employer_doc.pk}
+        )
+    )
+
+
+def iter_case_pdfs(employer_doc, site_url):
+    """
+    Yields the filename and an open file of every generated and uploaded PDF
+    of a case.
+
+    Cached renders are reused. The missing ones are all queued on the
+    rendering pool up front so that they render in parallel, and are stored
+    in the cache as they are collected.
+    """
+    documents = []
+    try:
+        for template_name, filename, html_string in iter_case_document_html(
+            employer_doc
+        ):
+            base_url = get_document_base_url(
+                site_url,
+                employer_doc,
+                template_name
+            )
+            key = get_pdf_cache_key(html_string, base_url)
+            pdf_file = open_cached_pdf(key)
+            if pdf_file is None:
+                documents.append(
+                    (filename, key, submit_render(html_string, base_url))
+                )
+            else:
+                documents.append((filename, key, pdf_file))
+
+        while documents:
+            filename, key, pdf_file = documents.pop(0)
+            if not hasattr(pdf_file, 'read'):
+                pdf_bytes = get_render_result(pdf_file)
+                store_pdf(key, pdf_bytes)
+                pdf_file = io.BytesIO(pdf_bytes)
+            yield filename, pdf_file
+    finally:
+        # Files and renders left over when the export is cut short
+        for filename, key, pdf_file in documents:
+            if hasattr(pdf_file, 'close'):
+                pdf_file.close()
+            else:
+                pdf_file.cancel()
+
+    doc_upload = getattr(employer_doc, 'rn_docupload_ed', None)
+    for field_name, filename in UPLOADED_DOCUMENTS:
+        field_file = getattr(doc_upload, field_name, None)
+        if not field_file:
+            continue
+        # Not skipped when it cannot be opened, the export fails instead of
+        # silently leaving the document out
+        yield filename, field_file.open('rb')
+
+
+def get_case_folder(employer_doc):
+    return str(employer_doc.case_ref_no or employer_doc.pk).replace('/', '-')
+
+
+def stream_case_documents(employer_docs, site_url):
+    """
+    ZIP archive of every generated and uploaded PDF of employer_docs, one
+    folder per case, yielded in chunks as it is written.
+
+    site_url is the scheme and host the documents are rendered for, e.g.
+    request.build_absolute_uri('/').
+
+    If a document fails or times out part way, the error is raised out of
+    the stream before the ZIP's central directory is written. The download
+    then ends with an error, not with an archive that looks complete but is
+    missing documents.
+    """
+    stream = ZipStream()
+    archive = zipfile.ZipFile(
+        stream,
+        'w',
+        compression=zipfile.ZIP_DEFLATED
+    )
+    folder = None
+    try:
+        for employer_doc in employer_docs:
+            folder = get_case_folder(employer_doc)
+            # Archived cases are exported as they were archived
+            if employer_doc.is_archived_doc and get_case_snapshot(
+                employer_doc
+            ):
+                documents = iter_snapshot_documents(employer_doc)
+            else:
+                documents = iter_case_pdfs(employer_doc, site_url)
+            for filename, pdf_file in documents:
+                with pdf_file, archive.open(
+                    f'{folder}/{filename}',
+                    'w'
+                ) as entry:
+                    for chunk in iter(
+                        lambda: pdf_file.read(EXPORT_CHUNK_SIZE),
+                        b''
+                    ):
+                        entry.write(chunk)
+                        data = stream.drain()
+                        if data:
+                            yield data
+                data = stream.drain()
+                if data:
+                    yield data
+    except Exception:
+        logger.exception('Case documents export failed at case %s', folder)
+        raise
+
+    archive.close()
+    # Central directory, written when the archive is closed
+    yield stream.drain()
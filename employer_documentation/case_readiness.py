@@ -0,0 +1,151 @@
+from django.db.models import Exists, OuterRef
+
+from maid.constants import TypeOfMaidChoices
+
+from .models import EmployerDoc, EmployerHousehold, MaidInventory
+
+# Every row the readiness checks read, fetched with the case in one query.
+# Missing reverse one to one rows come back as NULL columns and are cached as
+# absent, so the hasattr checks below never query.
+READINESS_SELECT_RELATED = [
+    'employer',
+    'employer__rn_sponsor_employer',
+    'employer__rn_ja_employer',
+    'employer__rn_income_employer',
+    'fdw',
+    'rn_servicefeeschedule_ed',
+    'rn_serviceagreement_ed',
+    'rn_safetyagreement_ed',
+    'rn_docupload_ed',
+    'rn_signatures_ed',
+    'rn_casestatus_ed',
+]
+
+
+def with_readiness_related(queryset):
+    return queryset.select_related(
+        *READINESS_SELECT_RELATED
+    ).annotate(
+        has_household=Exists(
+            EmployerHousehold.objects.filter(employer=OuterRef('employer'))
+        ),
+        has_maid_inventory=Exists(
+            MaidInventory.objects.filter(employer_doc=OuterRef('pk'))
+        )
+    )
+
+
+class CaseReadiness:
+    """
+    Missing details of a case for every signing stage, computed in one pass.
+
+    Stage 1 is before the agency staff signs, stage 1.5 before the employer
+    signs and stage 2 before the handover. Each stage adds its own checks to
+    the previous stage's list.
+    """
+
+    def __init__(self, employer_doc):
+        self.missing_pre_signing_1 = self.get_missing_pre_signing_1(
+            employer_doc
+        )
+        self.missing_pre_signing_1_5 = (
+            self.missing_pre_signing_1
+            + self.get_missing_pre_signing_1_5(employer_doc)
+        )
+        self.missing_pre_signing_2 = (
+            self.missing_pre_signing_1_5
+            + self.get_missing_pre_signing_2(employer_doc)
+        )
+
+    @staticmethod
+    def get_missing_pre_signing_1(employer_doc):
+        error_msg_list = employer_doc.employer.get_details_missing_employer(
+            has_household=getattr(employer_doc, 'has_household', None)
+        )
+
+        if not hasattr(employer_doc, 'rn_servicefeeschedule_ed'):
+            error_msg_list.append('rn_servicefeeschedule_ed')
+
+        if not hasattr(employer_doc, 'rn_serviceagreement_ed'):
+            error_msg_list.append('rn_serviceagreement_ed')
+
+        if hasattr(employer_doc, 'rn_docupload_ed'):
+            if not employer_doc.rn_docupload_ed.job_order_pdf:
+                error_msg_list.append('rn_docupload_ed.job_order_pdf')
+        else:
+            error_msg_list.append('rn_docupload_ed')
+
+        if not hasattr(employer_doc, 'rn_signatures_ed'):
+            error_msg_list.append('rn_signatures_ed')
+
+        if (
+            employer_doc.fdw.maid_type == TypeOfMaidChoices.NEW
+            and not hasattr(employer_doc, 'rn_safetyagreement_ed')
+        ):
+            error_msg_list.append('rn_safetyagreement_ed')
+
+        return error_msg_list
+
+    @staticmethod
+    def get_missing_pre_signing_1_5(employer_doc):
+        error_msg_list = []
+
+        # A missing signatures row is already reported by stage 1
+        if (
+            hasattr(employer_doc, 'rn_signatures_ed')
+            and not employer_doc.rn_signatures_ed.is_signed(
+                'agency_staff_signature'
+            )
+        ):
+            error_msg_list.append('agency_staff_signature')
+
+        return error_msg_list
+
+    @staticmethod
+    def get_missing_pre_signing_2(employer_doc):
+        error_msg_list = []
+
+        if hasattr(employer_doc, 'rn_docupload_ed'):
+            if not employer_doc.rn_docupload_ed.ipa_pdf:
+                error_msg_list.append('rn_docupload_ed.ipa_pdf')
+            if not employer_doc.rn_docupload_ed.medical_report_pdf:
+                error_msg_list.append('rn_docupload_ed.medical_report_pdf')
+
+        if hasattr(employer_doc, 'rn_casestatus_ed'):
+            if not employer_doc.rn_casestatus_ed.fdw_work_commencement_date:
+                error_msg_list.append(
+                    'rn_casestatus_ed.fdw_work_commencement_date'
+                )
+        else:
+            error_msg_list.append('rn_casestatus_ed')
+
+        has_maid_inventory = getattr(employer_doc, 'has_maid_inventory', None)
+        if has_maid_inventory is None:
+            has_maid_inventory = employer_doc.rn_maid_inventory.exists()
+        if not has_maid_inventory:
+            error_msg_list.append('rn_maid_inventory')
+
+        if not employer_doc.fdw.get_passport_number():
+            error_msg_list.append('fdw.passport_number')
+
+        if not employer_doc.fdw.get_fdw_fin_full():
+            error_msg_list.append('fdw.fin_number')
+
+        return error_msg_list
+
+    @property
+    def is_ready_for_ea_to_sign(self):
+        return not self.missing_pre_signing_1
+
+    @property
+    def is_ready_for_emp_to_sign(self):
+        return not self.missing_pre_signing_1_5
+
+    @property
+    def is_ready_for_handover(self):
+        return not self.missing_pre_signing_2
+
+
+def get_case_readiness(pk):
+    employer_doc = with_readiness_related(EmployerDoc.objects).get(pk=pk)
+    return employer_doc.get_readiness()
@@ -0,0 +1,145 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from onlinemaid.storage_backends import EmployerDocumentationStorage
+
+from .models import OverwriteStorage, generate_archive_path
+from .pdf_rendering import CASE_DOCUMENT_TEMPLATES
+
+SNAPSHOT_DIR = 'snapshot'
+SNAPSHOT_MANIFEST = 'manifest.json'
+
+
+def get_snapshot_storage():
+    # Same storage as the uploaded case documents
+    if settings.USE_S3:
+        return EmployerDocumentationStorage()
+    else:
+        return OverwriteStorage()
+
+
+def get_snapshot_path(employer_doc, filename):
+    return generate_archive_path(
+        None,
+        f'{employer_doc.pk}:{SNAPSHOT_DIR}/{filename}'
+    )
+
+
+def get_document_filename(template_name):
+    for name, filename, use_repayment_table in CASE_DOCUMENT_TEMPLATES:
+        if name == template_name:
+            return filename
+    return None
+
+
+def create_case_snapshot(employer_doc, site_url, replace=False):
+    """
+    Renders every generated PDF of an archived case and copies its uploaded
+    PDFs into archive/<pk>/snapshot/, with a manifest of their SHA-256
+    hashes. The manifest is written last, a snapshot without one is
+    incomplete and is never served.
+
+    A case that already has a snapshot keeps it unless replace is set.
+    Returns the manifest.
+    """
+    from .case_export import iter_case_pdfs
+
+    storage = get_snapshot_storage()
+    if not replace:
+        manifest = get_case_snapshot(employer_doc, storage)
+        if manifest:
+            return manifest
+
+    # Read before rendering, the document context replaces the instance's
+    # version with its display text
+    version = employer_doc.version
+    documents = {}
+    for filename, pdf_file in iter_case_pdfs(employer_doc, site_url):
+        with pdf_file:
+            pdf_bytes = pdf_file.read()
+        path = storage.save(
+            get_snapshot_path(employer_doc, filename),
+            ContentFile(pdf_bytes)
+        )
+        documents[filename] = {
+            'path': path,
+            'sha256': hashlib.sha256(pdf_bytes).hexdigest(),
+            'size': len(pdf_bytes),
+        }
+
+    manifest = {
+        'case': str(employer_doc.pk),
+        'case_ref_no': employer_doc.case_ref_no,
+        'version': version,
+        'created_at': timezone.now().isoformat(),
+        'documents': documents,
+    }
+    storage.save(
+        get_snapshot_path(employer_doc, SNAPSHOT_MANIFEST),
+        ContentFile(json.dumps(manifest, indent=2).encode('utf-8'))
+    )
+    return manifest
+
+
+def get_case_snapshot(employer_doc, storage=None):
+    # Manifest of the case's snapshot, None when it has none
+    storage = storage or get_snapshot_storage()
+    try:
+        with storage.open(
+            get_snapshot_path(employer_doc, SNAPSHOT_MANIFEST),
+            'rb'
+        ) as f:
+            return json.loads(f.read())
+    except (FileNotFoundError, OSError, ValueError):
+        return None
+
+
+def open_snapshot_document(employer_doc, filename):
+    """
+    Opens a PDF of a case's snapshot, or returns None when the case has no
+    snapshot or the snapshot does not have that document.
+    """
+    storage = get_snapshot_storage()
+    manifest = get_case_snapshot(employer_doc, storage)
+    if not manifest or filename not in manifest['documents']:
+        return None
+    try:
+        return storage.open(manifest['documents'][filename]['path'], 'rb')
+    except (FileNotFoundError, OSError):
+        return None
+
+
+def iter_snapshot_documents(employer_doc):
+    # Filename and open file of every PDF of a case's snapshot
+    storage = get_snapshot_storage()
+    manifest = get_case_snapshot(employer_doc, storage)
+    for filename, document in manifest['documents'].items():
+        yield filename, storage.open(document['path'], 'rb')
+
+
+def verify_case_snapshot(employer_doc):
+    """
+    Checks the stored PDFs of a case's snapshot against its manifest, returns
+    the filenames that are missing or do not match their hash.
+    """
+    storage = get_snapshot_storage()
+    manifest = get_case_snapshot(employer_doc, storage)
+    if not manifest:
+        return None
+
+    mismatched = []
+    for filename, document in manifest['documents'].items():
+        digest = hashlib.sha256()
+        try:
+            with storage.open(document['path'], 'rb') as f:
+                for chunk in iter(lambda: f.read(64 * 1024), b''):
+                    digest.update(chunk)
+        except (FileNotFoundError, OSError):
+            mismatched.append(filename)
+            continue
+        if digest.hexdigest() != document['sha256']:
+            mismatched.append(filename)
+    return mismatched
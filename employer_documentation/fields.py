@@ -1,8 +1,10 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.utils import timezone
 from onlinemaid.fields import NullableCharField
 
 from .constants import ResidentialStatusFullChoices
+from .helper_functions import data_url_to_signature, signature_to_data_url
 
 
 class CustomMoneyDecimalField(models.DecimalField):
@@ -36,3 +38,52 @@ class NullableResidentialStatusCharField(NullableCharField):
             'default': ResidentialStatusFullChoices.SC
         })
         super().__init__(*args, **kwargs)
+
+
+class SignatureDescriptor:
+    """
+    Signature of a CaseSignature, read and written as the base64 data URL
+    used by the signature pad and the templates, stored as binary image in
+    CaseSignatureImage.
+
+    Whether it is signed is answered from its <name>_signed_at column without
+    a query, see CaseSignature.is_signed(). The images of a case are only
+    loaded, all in one query, when a signed one is read. Assigned values are
+    written by CaseSignature.save().
+
+    Until move_case_signatures has run, a signature may still be on its
+    legacy_<name> column and is read from there.
+    """
+
+    def __init__(self, verbose_name):
+        self.verbose_name = verbose_name
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.signed_at_name = f'{name}_signed_at'
+        self.legacy_name = f'legacy_{name}'
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        pending = instance.__dict__.get('_pending_signatures', {})
+        if self.name in pending:
+            return pending[self.name] and signature_to_data_url(
+                *pending[self.name]
+            )
+        if getattr(instance, self.signed_at_name):
+            return instance.get_signature_data_urls().get(self.name)
+        return getattr(instance, self.legacy_name) or None
+
+    def __set__(self, instance, value):
+        # Decoded straight away, so that an invalid value fails here rather
+        # than on save
+        instance.__dict__.setdefault('_pending_signatures', {})[self.name] = (
+            data_url_to_signature(value) if value else None
+        )
+        setattr(
+            instance,
+            self.signed_at_name,
+            timezone.now() if value else None
+        )
+        setattr(instance, self.legacy_name, None)
@@ -6,14 +6,13 @@ from crispy_forms.helper import FormHelper
 from crispy_forms.layout import (HTML, Button, Column, Field, Hidden, Layout,
                                  Row, Submit)
 from django import forms
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.forms.widgets import ClearableFileInput
 from django.utils.translation import ugettext_lazy as _
 from maid.models import Maid
 from onlinemaid import constants as om_constants
-from onlinemaid.helper_functions import (encrypt_string, is_married,
+from onlinemaid.helper_functions import (get_blind_index, is_married,
                                          is_not_null, is_null)
 from onlinemaid.validators import (validate_age, validate_ea_personnel_number,
                                    validate_fin, validate_nric,
@@ -21,7 +20,7 @@ from onlinemaid.validators import (validate_age, validate_ea_personnel_number,
 
 from .constants import (EmployerTypeOfApplicantChoices,
                         ResidentialStatusFullChoices)
-from .helper_functions import (is_foreigner, is_local,
+from .helper_functions import (data_url_to_signature, is_foreigner, is_local,
                                nationality_residential_status_match)
 from .models import (CaseSignature, CaseStatus, DocSafetyAgreement,
                      DocServAgmtEmpCtr, DocServiceFeeSchedule, DocUpload,
@@ -33,16 +32,22 @@ class EmployerForm(forms.ModelForm):
     class Meta:
         model = Employer
         exclude = [
+            'employer_nric_num',
             'employer_nric_nonce',
             'employer_nric_tag',
+            'employer_fin_num',
             'employer_fin_nonce',
             'employer_fin_tag',
+            'employer_passport_num',
             'employer_passport_nonce',
             'employer_passport_tag',
+            'spouse_nric_num',
             'spouse_nric_nonce',
             'spouse_nric_tag',
+            'spouse_fin_num',
             'spouse_fin_nonce',
             'spouse_fin_tag',
+            'spouse_passport_num',
             'spouse_passport_nonce',
             'spouse_passport_tag',
             'potential_employer'
@@ -58,12 +63,12 @@ class EmployerForm(forms.ModelForm):
         # Decryption
         instance = self.instance
         self.initial.update({
-            'employer_nric_num': instance.get_employer_nric_full(),
-            'employer_fin_num': instance.get_employer_fin_full(),
-            'employer_passport_num': instance.get_employer_passport_full(),
-            'spouse_nric_num': instance.get_employer_spouse_nric_full(),
-            'spouse_fin_num': instance.get_employer_spouse_fin_full(),
-            'spouse_passport_num': instance.get_employer_spouse_passport_full()
+            'employer_nric': instance.get_employer_nric_full(),
+            'employer_fin': instance.get_employer_fin_full(),
+            'employer_passport': instance.get_employer_passport_full(),
+            'spouse_nric': instance.get_employer_spouse_nric_full(),
+            'spouse_fin': instance.get_employer_spouse_fin_full(),
+            'spouse_passport': instance.get_employer_spouse_passport_full()
         })
 
         # CrispyForm Helper
@@ -166,18 +171,18 @@ class EmployerForm(forms.ModelForm):
                     css_class='form-group col-lg-12 pr-md-3'
                 ),
                 Column(
-                    'employer_nric_num',
+                    'employer_nric',
                     css_class='form-group col-lg-12 pl-md-3',
                     id='employer_id_nric',
                 )
             ),
             Row(
                 Column(
-                    'employer_fin_num',
+                    'employer_fin',
                     css_class='form-group col-lg-12 pr-md-3'
                 ),
                 Column(
-                    'employer_passport_num',
+                    'employer_passport',
                     css_class='form-group col-lg-12 pl-md-3'
                 ),
                 id='employer_id_other'
@@ -237,18 +242,18 @@ class EmployerForm(forms.ModelForm):
                             css_class='form-group col-lg-12 pr-md-3'
                         ),
                         Column(
-                            'spouse_nric_num',
+                            'spouse_nric',
                             css_class='form-group col-lg-12 pl-md-3',
                             id='spouse_id_nric',
                         )
                     ),
                     Row(
                         Column(
-                            'spouse_fin_num',
+                            'spouse_fin',
                             css_class='form-group col-lg-12 pr-md-3'
                         ),
                         Column(
-                            'spouse_passport_num',
+                            'spouse_passport',
                             css_class='form-group col-lg-12 pl-md-3'
                         ),
                         id='spouse_id_other',
@@ -373,57 +378,69 @@ class EmployerForm(forms.ModelForm):
         finally:
             return cleaned_field
 
-    def clean_employer_nric_num(self):
-        cleaned_field = self.cleaned_data.get('employer_nric_num')
+    def clean_employer_nric(self):
+        cleaned_field = self.cleaned_data.get('employer_nric')
+        self.instance.clear_legacy_fields('employer_nric')
         employer_residential_status = self.cleaned_data.get(
             'employer_residential_status'
         )
         if is_not_null(cleaned_field):
             if is_local(employer_residential_status):
                 validate_nric("Employer", cleaned_field)
-                ciphertext, nonce, tag = encrypt_string(
-                    cleaned_field,
-                    settings.ENCRYPTION_KEY
+                self.check_queryset(
+                    Employer.objects.filter(
+                        employer_nric_blind_index=get_blind_index(
+                            cleaned_field
+                        )
+                    ),
+                    _('An employer with this NRIC already exists in your '
+                      'agency')
                 )
-                self.instance.employer_nric_nonce = nonce
-                self.instance.employer_nric_tag = tag
-                return ciphertext
+                return cleaned_field
             else:
                 return None
         else:
             return None
 
-    def clean_employer_fin_num(self):
-        cleaned_field = self.cleaned_data.get('employer_fin_num')
+    def clean_employer_fin(self):
+        cleaned_field = self.cleaned_data.get('employer_fin')
+        self.instance.clear_legacy_fields('employer_fin')
         employer_residential_status = self.cleaned_data.get(
             'employer_residential_status'
         )
         if is_foreigner(employer_residential_status):
             validate_fin('Employer', cleaned_field)
-            ciphertext, nonce, tag = encrypt_string(
-                cleaned_field,
-                settings.ENCRYPTION_KEY
+            self.check_queryset(
+                Employer.objects.filter(
+                    employer_fin_blind_index=get_blind_index(
+                        cleaned_field
+                    )
+                ),
+                _('An employer with this FIN already exists in your '
+                  'agency')
             )
-            self.instance.employer_fin_nonce = nonce
-            self.instance.employer_fin_tag = tag
-            return ciphertext
+            return cleaned_field
         else:
             return None
 
-    def clean_employer_passport_num(self):
-        cleaned_field = self.cleaned_data.get('employer_passport_num')
+    def clean_employer_passport(self):
+        cleaned_field = self.cleaned_data.get('employer_passport')
+        self.instance.clear_legacy_fields('employer_passport')
         employer_residential_status = self.cleaned_data.get(
             'employer_residential_status'
         )
         if is_foreigner(employer_residential_status):
             validate_passport('Employer', cleaned_field)
-            ciphertext, nonce, tag = encrypt_string(
-                cleaned_field,
-                settings.ENCRYPTION_KEY
+            self.check_queryset(
+                Employer.objects.filter(
+                    employer_passport_blind_index=get_blind_index(
+                        cleaned_field
+                    )
+                ),
+                _('An employer with this passport number already exists in '
+                  'your agency')
             )
-            self.instance.employer_passport_nonce = nonce
-            self.instance.employer_passport_tag = tag
-            return ciphertext
+            return cleaned_field
         else:
             return None
 
@@ -537,8 +554,9 @@ class EmployerForm(forms.ModelForm):
         else:
             return None
 
-    def clean_spouse_nric_num(self):
-        cleaned_field = self.cleaned_data.get('spouse_nric_num')
+    def clean_spouse_nric(self):
+        cleaned_field = self.cleaned_data.get('spouse_nric')
+        self.instance.clear_legacy_fields('spouse_nric')
         marital_status = self.cleaned_data.get('employer_marital_status')
         if is_married(marital_status):
             spouse_residential_status = self.cleaned_data.get(
@@ -547,13 +565,7 @@ class EmployerForm(forms.ModelForm):
             if is_not_null(cleaned_field):
                 if is_local(spouse_residential_status):
                     validate_nric("Employer's spouse's", cleaned_field)
-                    ciphertext, nonce, tag = encrypt_string(
-                        cleaned_field,
-                        settings.ENCRYPTION_KEY
-                    )
-                    self.instance.spouse_nric_nonce = nonce
-                    self.instance.spouse_nric_tag = tag
-                    return ciphertext
+                    return cleaned_field
                 else:
                     return None
             else:
@@ -561,8 +573,9 @@ class EmployerForm(forms.ModelForm):
         else:
             return None
 
-    def clean_spouse_fin_num(self):
-        cleaned_field = self.cleaned_data.get('spouse_fin_num')
+    def clean_spouse_fin(self):
+        cleaned_field = self.cleaned_data.get('spouse_fin')
+        self.instance.clear_legacy_fields('spouse_fin')
         marital_status = self.cleaned_data.get('employer_marital_status')
         if is_married(marital_status):
             spouse_residential_status = self.cleaned_data.get(
@@ -570,20 +583,15 @@ class EmployerForm(forms.ModelForm):
             )
             if is_foreigner(spouse_residential_status):
                 validate_fin("Employer's spouse's", cleaned_field)
-                ciphertext, nonce, tag = encrypt_string(
-                    cleaned_field,
-                    settings.ENCRYPTION_KEY
-                )
-                self.instance.spouse_fin_nonce = nonce
-                self.instance.spouse_fin_tag = tag
-                return ciphertext
+                return cleaned_field
             else:
                 return None
         else:
             return None
 
-    def clean_spouse_passport_num(self):
-        cleaned_field = self.cleaned_data.get('spouse_passport_num')
+    def clean_spouse_passport(self):
+        cleaned_field = self.cleaned_data.get('spouse_passport')
+        self.instance.clear_legacy_fields('spouse_passport')
         marital_status = self.cleaned_data.get('employer_marital_status')
         if is_not_null(cleaned_field):
             if is_married(marital_status):
@@ -592,13 +600,7 @@ class EmployerForm(forms.ModelForm):
                 )
                 if is_foreigner(spouse_residential_status):
                     validate_passport("Employer's spouse", cleaned_field)
-                    ciphertext, nonce, tag = encrypt_string(
-                        cleaned_field,
-                        settings.ENCRYPTION_KEY
-                    )
-                    self.instance.spouse_passport_nonce = nonce
-                    self.instance.spouse_passport_tag = tag
-                    return ciphertext
+                    return cleaned_field
                 else:
                     return None
             else:
@@ -680,9 +682,9 @@ class EmployerForm(forms.ModelForm):
                 'employer_date_of_birth',
                 'employer_nationality',
                 'employer_residential_status',
-                'employer_nric_num',
-                'employer_fin_num',
-                'employer_passport_num',
+                'employer_nric',
+                'employer_fin',
+                'employer_passport',
                 'employer_passport_date',
                 'employer_marital_status',
                 'employer_marriage_sg_registered',
@@ -691,9 +693,9 @@ class EmployerForm(forms.ModelForm):
                 'spouse_date_of_birth',
                 'spouse_nationality',
                 'spouse_residential_status',
-                'spouse_nric_num',
-                'spouse_fin_num',
-                'spouse_passport_num',
+                'spouse_nric',
+                'spouse_fin',
+                'spouse_passport',
                 'spouse_passport_date',
             ]
             if not set(employer_strict_fields).isdisjoint(self.changed_data):
@@ -724,20 +726,28 @@ class EmployerSponsorForm(forms.ModelForm):
         model = EmployerSponsor
         exclude = [
             'employer',
+            'sponsor_1_nric_num',
             'sponsor_1_nric_nonce',
             'sponsor_1_nric_tag',
+            'sponsor_1_spouse_nric_num',
             'sponsor_1_spouse_nric_nonce',
             'sponsor_1_spouse_nric_tag',
+            'sponsor_1_spouse_fin_num',
             'sponsor_1_spouse_fin_nonce',
             'sponsor_1_spouse_fin_tag',
+            'sponsor_1_spouse_passport_num',
             'sponsor_1_spouse_passport_nonce',
             'sponsor_1_spouse_passport_tag',
+            'sponsor_2_nric_num',
             'sponsor_2_nric_nonce',
             'sponsor_2_nric_tag',
+            'sponsor_2_spouse_nric_num',
             'sponsor_2_spouse_nric_nonce',
             'sponsor_2_spouse_nric_tag',
+            'sponsor_2_spouse_fin_num',
             'sponsor_2_spouse_fin_nonce',
             'sponsor_2_spouse_fin_tag',
+            'sponsor_2_spouse_passport_num',
             'sponsor_2_spouse_passport_nonce',
             'sponsor_2_spouse_passport_tag',
         ]
@@ -759,14 +769,14 @@ class EmployerSponsorForm(forms.ModelForm):
         s_2_spouse_fin_num = instance.get_sponsor_2_spouse_fin_full()
         s_2_spouse_passport_num = instance.get_sponsor_2_spouse_passport_full()
         self.initial.update({
-            'sponsor_1_nric_num': s_1_nric_num,
-            'sponsor_1_spouse_nric_num': s_1_spouse_nric_num,
-            'sponsor_1_spouse_fin_num': s_1_spouse_fin_num,
-            'sponsor_1_spouse_passport_num': s_1_spouse_passport_num,
-            'sponsor_2_nric_num': s_2_nric_num,
-            'sponsor_2_spouse_nric_num': s_2_spouse_nric_num,
-            'sponsor_2_spouse_fin_num': s_2_spouse_fin_num,
-            'sponsor_2_spouse_passport_num': s_2_spouse_passport_num
+            'sponsor_1_nric': s_1_nric_num,
+            'sponsor_1_spouse_nric': s_1_spouse_nric_num,
+            'sponsor_1_spouse_fin': s_1_spouse_fin_num,
+            'sponsor_1_spouse_passport': s_1_spouse_passport_num,
+            'sponsor_2_nric': s_2_nric_num,
+            'sponsor_2_spouse_nric': s_2_spouse_nric_num,
+            'sponsor_2_spouse_fin': s_2_spouse_fin_num,
+            'sponsor_2_spouse_passport': s_2_spouse_passport_num
         })
         self.helper = FormHelper()
         self.helper.layout = Layout(
@@ -795,7 +805,7 @@ class EmployerSponsorForm(forms.ModelForm):
                                     css_class='form-group col-md-12 pr-md-3',
                                 ),
                                 Column(
-                                    'sponsor_1_nric_num',
+                                    'sponsor_1_nric',
                                     css_class='form-group col-md-12 pl-md-3',
                                 )
                             ),
@@ -897,19 +907,19 @@ class EmployerSponsorForm(forms.ModelForm):
                                     ),
                                     Row(
                                         Column(
-                                            'sponsor_1_spouse_nric_num',
+                                            'sponsor_1_spouse_nric',
                                             css_class='form-group col-md-12 spouse-1 pr-md-3',
                                             id='sponsor1spouse_id_nric',
                                         ),
                                         Column(
-                                            'sponsor_1_spouse_fin_num',
+                                            'sponsor_1_spouse_fin',
                                             css_class='form-group col-md-12 spouse-1 pl-md-3',
                                             id='sponsor1spouse_id_fin',
                                         )
                                     ),
                                     Row(
                                         Column(
-                                            'sponsor_1_spouse_passport_num',
+                                            'sponsor_1_spouse_passport',
                                             css_class='form-group col-md-12 spouse-1 pr-md-3',
                                         ),
                                         Column(
@@ -970,7 +980,7 @@ class EmployerSponsorForm(forms.ModelForm):
                                     css_class='form-group col-md-12 sponsor-2 pr-md-3',
                                 ),
                                 Column(
-                                    'sponsor_2_nric_num',
+                                    'sponsor_2_nric',
                                     css_class='form-group col-md-12 sponsor-2 pl-md-3',
                                 )
                             ),
@@ -1071,19 +1081,19 @@ class EmployerSponsorForm(forms.ModelForm):
                                     ),
                                     Row(
                                         Column(
-                                            'sponsor_2_spouse_nric_num',
+                                            'sponsor_2_spouse_nric',
                                             css_class='form-group col-md-12 spouse-2 pr-md-3',
                                             id='sponsor2spouse_id_nric',
                                         ),
                                         Column(
-                                            'sponsor_2_spouse_fin_num',
+                                            'sponsor_2_spouse_fin',
                                             css_class='form-group col-md-12 spouse-2 pl-md-3',
                                             id='sponsor2spouse_id_fin',
                                         )
                                     ),
                                     Row(
                                         Column(
-                                            'sponsor_2_spouse_passport_num',
+                                            'sponsor_2_spouse_passport',
                                             css_class='form-group col-md-12 spouse-2 pr-md-3',
                                         ),
                                         Column(
@@ -1128,16 +1138,11 @@ class EmployerSponsorForm(forms.ModelForm):
             )
         )
 
-    def clean_sponsor_1_nric_num(self):
-        cleaned_field = self.cleaned_data.get('sponsor_1_nric_num')
+    def clean_sponsor_1_nric(self):
+        cleaned_field = self.cleaned_data.get('sponsor_1_nric')
+        self.instance.clear_legacy_fields('sponsor_1_nric')
         validate_nric("Sponsor 1", cleaned_field)
-        ciphertext, nonce, tag = encrypt_string(
-            cleaned_field,
-            settings.ENCRYPTION_KEY
-        )
-        self.instance.sponsor_1_nric_nonce = nonce
-        self.instance.sponsor_1_nric_tag = tag
-        return ciphertext
+        return cleaned_field
 
     def clean_sponsor_1_marriage_sg_registered(self):
         cleaned_field = self.cleaned_data.get(
@@ -1230,8 +1235,9 @@ class EmployerSponsorForm(forms.ModelForm):
         else:
             return None
 
-    def clean_sponsor_1_spouse_nric_num(self):
-        cleaned_field = self.cleaned_data.get('sponsor_1_spouse_nric_num')
+    def clean_sponsor_1_spouse_nric(self):
+        cleaned_field = self.cleaned_data.get('sponsor_1_spouse_nric')
+        self.instance.clear_legacy_fields('sponsor_1_spouse_nric')
         marital_status = self.cleaned_data.get('sponsor_1_marital_status')
         if is_married(marital_status):
             spouse_residential_status = self.cleaned_data.get(
@@ -1240,13 +1246,7 @@ class EmployerSponsorForm(forms.ModelForm):
             if is_not_null(cleaned_field):
                 if is_local(spouse_residential_status):
                     validate_nric("Sponsor 1's spouse", cleaned_field)
-                    ciphertext, nonce, tag = encrypt_string(
-                        cleaned_field,
-                        settings.ENCRYPTION_KEY
-                    )
-                    self.instance.sponsor_1_spouse_nric_nonce = nonce
-                    self.instance.sponsor_1_spouse_nric_tag = tag
-                    return ciphertext
+                    return cleaned_field
                 else:
                     return None
             else:
@@ -1254,8 +1254,9 @@ class EmployerSponsorForm(forms.ModelForm):
         else:
             return None
 
-    def clean_sponsor_1_spouse_fin_num(self):
-        cleaned_field = self.cleaned_data.get('sponsor_1_spouse_fin_num')
+    def clean_sponsor_1_spouse_fin(self):
+        cleaned_field = self.cleaned_data.get('sponsor_1_spouse_fin')
+        self.instance.clear_legacy_fields('sponsor_1_spouse_fin')
         marital_status = self.cleaned_data.get('sponsor_1_marital_status')
         if is_married(marital_status):
             spouse_residential_status = self.cleaned_data.get(
@@ -1263,20 +1264,15 @@ class EmployerSponsorForm(forms.ModelForm):
             )
             if is_foreigner(spouse_residential_status):
                 validate_fin("Sponsor 1's spouse's", cleaned_field)
-                ciphertext, nonce, tag = encrypt_string(
-                    cleaned_field,
-                    settings.ENCRYPTION_KEY
-                )
-                self.instance.sponsor_1_spouse_fin_nonce = nonce
-                self.instance.sponsor_1_spouse_fin_tag = tag
-                return ciphertext
+                return cleaned_field
             else:
                 return None
         else:
             return None
 
-    def clean_sponsor_1_spouse_passport_num(self):
-        cleaned_field = self.cleaned_data.get('sponsor_1_spouse_passport_num')
+    def clean_sponsor_1_spouse_passport(self):
+        cleaned_field = self.cleaned_data.get('sponsor_1_spouse_passport')
+        self.instance.clear_legacy_fields('sponsor_1_spouse_passport')
         marital_status = self.cleaned_data.get('sponsor_1_marital_status')
         if is_not_null(cleaned_field):
             if is_married(marital_status):
@@ -1285,13 +1281,7 @@ class EmployerSponsorForm(forms.ModelForm):
                 )
                 if is_foreigner(spouse_residential_status):
                     validate_passport("Sponsor 1's spouse", cleaned_field)
-                    ciphertext, nonce, tag = encrypt_string(
-                        cleaned_field,
-                        settings.ENCRYPTION_KEY
-                    )
-                    self.instance.sponsor_1_spouse_passport_nonce = nonce
-                    self.instance.sponsor_1_spouse_passport_tag = tag
-                    return ciphertext
+                    return cleaned_field
                 else:
                     return None
             else:
@@ -1373,18 +1363,13 @@ class EmployerSponsorForm(forms.ModelForm):
         else:
             return None
 
-    def clean_sponsor_2_nric_num(self):
-        cleaned_field = self.cleaned_data.get('sponsor_2_nric_num')
+    def clean_sponsor_2_nric(self):
+        cleaned_field = self.cleaned_data.get('sponsor_2_nric')
+        self.instance.clear_legacy_fields('sponsor_2_nric')
         sponsor_2_required = self.cleaned_data.get('sponsor_2_required')
         if sponsor_2_required:
             validate_nric("Sponsor 2", cleaned_field)
-            ciphertext, nonce, tag = encrypt_string(
-                cleaned_field,
-                settings.ENCRYPTION_KEY
-            )
-            self.instance.sponsor_2_nric_nonce = nonce
-            self.instance.sponsor_2_nric_tag = tag
-            return ciphertext
+            return cleaned_field
         else:
             return None
 
@@ -1576,8 +1561,9 @@ class EmployerSponsorForm(forms.ModelForm):
         else:
             return None
 
-    def clean_sponsor_2_spouse_nric_num(self):
-        cleaned_field = self.cleaned_data.get('sponsor_2_spouse_nric_num')
+    def clean_sponsor_2_spouse_nric(self):
+        cleaned_field = self.cleaned_data.get('sponsor_2_spouse_nric')
+        self.instance.clear_legacy_fields('sponsor_2_spouse_nric')
         sponsor_2_required = self.cleaned_data.get('sponsor_2_required')
         marital_status = self.cleaned_data.get('sponsor_2_marital_status')
         if sponsor_2_required:
@@ -1588,13 +1574,7 @@ class EmployerSponsorForm(forms.ModelForm):
                 if is_not_null(cleaned_field):
                     if is_local(spouse_residential_status):
                         validate_nric("Sponsor 2's spouse", cleaned_field)
-                        ciphertext, nonce, tag = encrypt_string(
-                            cleaned_field,
-                            settings.ENCRYPTION_KEY
-                        )
-                        self.instance.sponsor_2_spouse_nric_nonce = nonce
-                        self.instance.sponsor_2_spouse_nric_tag = tag
-                        return ciphertext
+                        return cleaned_field
                     else:
                         return None
                 else:
@@ -1604,8 +1584,9 @@ class EmployerSponsorForm(forms.ModelForm):
         else:
             return None
 
-    def clean_sponsor_2_spouse_fin_num(self):
-        cleaned_field = self.cleaned_data.get('sponsor_2_spouse_fin_num')
+    def clean_sponsor_2_spouse_fin(self):
+        cleaned_field = self.cleaned_data.get('sponsor_2_spouse_fin')
+        self.instance.clear_legacy_fields('sponsor_2_spouse_fin')
         sponsor_2_required = self.cleaned_data.get('sponsor_2_required')
         marital_status = self.cleaned_data.get('sponsor_2_marital_status')
         if sponsor_2_required and is_married(marital_status):
@@ -1614,20 +1595,15 @@ class EmployerSponsorForm(forms.ModelForm):
             )
             if is_foreigner(spouse_residential_status):
                 validate_fin("Sponsor 2's spouse's", cleaned_field)
-                ciphertext, nonce, tag = encrypt_string(
-                    cleaned_field,
-                    settings.ENCRYPTION_KEY
-                )
-                self.instance.sponsor_2_spouse_fin_nonce = nonce
-                self.instance.sponsor_2_spouse_fin_tag = tag
-                return ciphertext
+                return cleaned_field
             else:
                 return None
         else:
             return None
 
-    def clean_sponsor_2_spouse_passport_num(self):
-        cleaned_field = self.cleaned_data.get('sponsor_2_spouse_passport_num')
+    def clean_sponsor_2_spouse_passport(self):
+        cleaned_field = self.cleaned_data.get('sponsor_2_spouse_passport')
+        self.instance.clear_legacy_fields('sponsor_2_spouse_passport')
         sponsor_2_required = self.cleaned_data.get('sponsor_2_required')
         marital_status = self.cleaned_data.get('sponsor_2_marital_status')
         if is_not_null(cleaned_field):
@@ -1637,13 +1613,7 @@ class EmployerSponsorForm(forms.ModelForm):
                 )
                 if is_foreigner(spouse_residential_status):
                     validate_passport("Sponsor 2's spouse", cleaned_field)
-                    ciphertext, nonce, tag = encrypt_string(
-                        cleaned_field,
-                        settings.ENCRYPTION_KEY
-                    )
-                    self.instance.sponsor_2_spouse_passport_nonce = nonce
-                    self.instance.sponsor_2_spouse_passport_tag = tag
-                    return ciphertext
+                    return cleaned_field
                 else:
                     return None
             else:
@@ -1741,7 +1711,7 @@ class EmployerSponsorForm(forms.ModelForm):
                 'sponsor_1_name',
                 'sponsor_1_gender',
                 'sponsor_1_date_of_birth',
-                'sponsor_1_nric_num',
+                'sponsor_1_nric',
                 'sponsor_1_nationality',
                 'sponsor_1_residential_status',
                 'sponsor_1_mobile_number',
@@ -1756,16 +1726,16 @@ class EmployerSponsorForm(forms.ModelForm):
                 'sponsor_1_spouse_date_of_birth',
                 'sponsor_1_spouse_nationality',
                 'sponsor_1_spouse_residential_status',
-                'sponsor_1_spouse_nric_num',
-                'sponsor_1_spouse_fin_num',
-                'sponsor_1_spouse_passport_num',
+                'sponsor_1_spouse_nric',
+                'sponsor_1_spouse_fin',
+                'sponsor_1_spouse_passport',
                 'sponsor_1_spouse_passport_date',
                 'sponsor_2_required',
                 'sponsor_2_relationship',
                 'sponsor_2_name',
                 'sponsor_2_gender',
                 'sponsor_2_date_of_birth',
-                'sponsor_2_nric_num',
+                'sponsor_2_nric',
                 'sponsor_2_nationality',
                 'sponsor_2_residential_status',
                 'sponsor_2_mobile_number',
@@ -1780,9 +1750,9 @@ class EmployerSponsorForm(forms.ModelForm):
                 'sponsor_2_spouse_date_of_birth',
                 'sponsor_2_spouse_nationality',
                 'sponsor_2_spouse_residential_status',
-                'sponsor_2_spouse_nric_num',
-                'sponsor_2_spouse_fin_num',
-                'sponsor_2_spouse_passport_num',
+                'sponsor_2_spouse_nric',
+                'sponsor_2_spouse_fin',
+                'sponsor_2_spouse_passport',
                 'sponsor_2_spouse_passport_date'
             ]
             if not set(strict_fields).isdisjoint(self.changed_data):
@@ -1799,12 +1769,16 @@ class EmployerJointApplicantForm(forms.ModelForm):
         model = EmployerJointApplicant
         exclude = [
             'employer',
+            'joint_applicant_nric_num',
             'joint_applicant_nric_nonce',
             'joint_applicant_nric_tag',
+            'joint_applicant_spouse_nric_num',
             'joint_applicant_spouse_nric_nonce',
             'joint_applicant_spouse_nric_tag',
+            'joint_applicant_spouse_fin_num',
             'joint_applicant_spouse_fin_nonce',
             'joint_applicant_spouse_fin_tag',
+            'joint_applicant_spouse_passport_num',
             'joint_applicant_spouse_passport_nonce',
             'joint_applicant_spouse_passport_tag',
         ]
@@ -1821,10 +1795,10 @@ class EmployerJointApplicantForm(forms.ModelForm):
         jas_fin_num = self.instance.get_joint_applicant_spouse_fin_full()
         jas_pass_num = self.instance.get_joint_applicant_spouse_passport_full()
         self.initial.update({
-            'joint_applicant_nric_num': ja_nric_num,
-            'joint_applicant_spouse_nric_num': jas_nric_num,
-            'joint_applicant_spouse_fin_num': jas_fin_num,
-            'joint_applicant_spouse_passport_num': jas_pass_num
+            'joint_applicant_nric': ja_nric_num,
+            'joint_applicant_spouse_nric': jas_nric_num,
+            'joint_applicant_spouse_fin': jas_fin_num,
+            'joint_applicant_spouse_passport': jas_pass_num
         })
 
         self.helper = FormHelper()
@@ -1863,7 +1837,7 @@ class EmployerJointApplicantForm(forms.ModelForm):
                     ),
                     Row(
                         Column(
-                            'joint_applicant_nric_num',
+                            'joint_applicant_nric',
                             css_class='form-group col-md-12 pr-md-3',
                         ),
                         Column(
@@ -1942,19 +1916,19 @@ class EmployerJointApplicantForm(forms.ModelForm):
                             ),
                             Row(
                                 Column(
-                                    'joint_applicant_spouse_nric_num',
+                                    'joint_applicant_spouse_nric',
                                     css_class='form-group col-md-12 spouse-1',
                                     id='ja_spouse_id_nric',
                                 ),
                                 Column(
-                                    'joint_applicant_spouse_fin_num',
+                                    'joint_applicant_spouse_fin',
                                     css_class='form-group col-md-12 spouse-1',
                                     id='ja_spouse_id_fin',
                                 )
                             ),
                             Row(
                                 Column(
-                                    'joint_applicant_spouse_passport_num',
+                                    'joint_applicant_spouse_passport',
                                     css_class='form-group col-md-12 spouse-1',
                                 ),
                                 Column(
@@ -1994,26 +1968,22 @@ class EmployerJointApplicantForm(forms.ModelForm):
             )
         )
 
-    def clean_joint_applicant_nric_num(self):
-        cleaned_field = self.cleaned_data.get('joint_applicant_nric_num')
+    def clean_joint_applicant_nric(self):
+        cleaned_field = self.cleaned_data.get('joint_applicant_nric')
+        self.instance.clear_legacy_fields('joint_applicant_nric')
         validate_nric("The joint applicant", cleaned_field)
-        ciphertext, nonce, tag = encrypt_string(
-            cleaned_field,
-            settings.ENCRYPTION_KEY
-        )
-        self.instance.joint_applicant_nric_nonce = nonce
-        self.instance.joint_applicant_nric_tag = tag
-        return ciphertext
+        return cleaned_field
 
     def clean_joint_applicant_date_of_birth(self):
         cleaned_field = self.cleaned_data.get('joint_applicant_date_of_birth')
         validate_age(cleaned_field, 18)
         return cleaned_field
 
-    def clean_joint_applicant_spouse_nric_num(self):
+    def clean_joint_applicant_spouse_nric(self):
         cleaned_field = self.cleaned_data.get(
-            'joint_applicant_spouse_nric_num'
+            'joint_applicant_spouse_nric'
         )
+        self.instance.clear_legacy_fields('joint_applicant_spouse_nric')
         marital_status = self.cleaned_data.get(
             'joint_applicant_marital_status'
         )
@@ -2024,13 +1994,7 @@ class EmployerJointApplicantForm(forms.ModelForm):
             if is_not_null(cleaned_field):
                 if is_local(spouse_residential_status):
                     validate_nric("The joint applicant's spouse", cleaned_field)
-                    ciphertext, nonce, tag = encrypt_string(
-                        cleaned_field,
-                        settings.ENCRYPTION_KEY
-                    )
-                    self.instance.joint_applicant_spouse_nric_nonce = nonce
-                    self.instance.joint_applicant_spouse_nric_tag = tag
-                    return ciphertext
+                    return cleaned_field
                 else:
                     return None
             else:
@@ -2038,8 +2002,9 @@ class EmployerJointApplicantForm(forms.ModelForm):
         else:
             return None
 
-    def clean_joint_applicant_spouse_fin_num(self):
-        cleaned_field = self.cleaned_data.get('joint_applicant_spouse_fin_num')
+    def clean_joint_applicant_spouse_fin(self):
+        cleaned_field = self.cleaned_data.get('joint_applicant_spouse_fin')
+        self.instance.clear_legacy_fields('joint_applicant_spouse_fin')
         marital_status = self.cleaned_data.get(
             'joint_applicant_marital_status'
         )
@@ -2049,22 +2014,17 @@ class EmployerJointApplicantForm(forms.ModelForm):
             )
             if is_foreigner(spouse_residential_status):
                 validate_fin("The Joint Applicant spouse's", cleaned_field)
-                ciphertext, nonce, tag = encrypt_string(
-                    cleaned_field,
-                    settings.ENCRYPTION_KEY
-                )
-                self.instance.joint_applicant_spouse_fin_nonce = nonce
-                self.instance.joint_applicant_spouse_fin_tag = tag
-                return ciphertext
+                return cleaned_field
             else:
                 return None
         else:
             return None
 
-    def clean_joint_applicant_spouse_passport_num(self):
+    def clean_joint_applicant_spouse_passport(self):
         cleaned_field = self.cleaned_data.get(
-            'joint_applicant_spouse_passport_num'
+            'joint_applicant_spouse_passport'
         )
+        self.instance.clear_legacy_fields('joint_applicant_spouse_passport')
         marital_status = self.cleaned_data.get(
             'joint_applicant_marital_status'
         )
@@ -2074,13 +2034,7 @@ class EmployerJointApplicantForm(forms.ModelForm):
             )
             if is_foreigner(spouse_residential_status):
                 validate_passport("The joint applicant's spouse", cleaned_field)
-                ciphertext, nonce, tag = encrypt_string(
-                    cleaned_field,
-                    settings.ENCRYPTION_KEY
-                )
-                self.instance.joint_applicant_spouse_passport_nonce = nonce
-                self.instance.joint_applicant_spouse_passport_tag = tag
-                return ciphertext
+                return cleaned_field
             else:
                 return None
         else:
@@ -2179,7 +2133,7 @@ class EmployerJointApplicantForm(forms.ModelForm):
                 'joint_applicant_name',
                 'joint_applicant_gender',
                 'joint_applicant_date_of_birth',
-                'joint_applicant_nric_num',
+                'joint_applicant_nric',
                 'joint_applicant_nationality',
                 'joint_applicant_residential_status',
                 'joint_applicant_address_1',
@@ -2192,9 +2146,9 @@ class EmployerJointApplicantForm(forms.ModelForm):
                 'joint_applicant_spouse_date_of_birth',
                 'joint_applicant_spouse_nationality',
                 'joint_applicant_spouse_residential_status',
-                'joint_applicant_spouse_nric_num',
-                'joint_applicant_spouse_fin_num',
-                'joint_applicant_spouse_passport_num',
+                'joint_applicant_spouse_nric',
+                'joint_applicant_spouse_fin',
+                'joint_applicant_spouse_passport',
                 'joint_applicant_spouse_passport_date'
             ]
             if not set(strict_fields).isdisjoint(self.changed_data):
@@ -2295,6 +2249,7 @@ class EmployerHouseholdDetailsForm(forms.ModelForm):
         model = EmployerHousehold
         exclude = [
             'employer',
+            'household_id_num',
             'household_id_nonce',
             'household_id_tag',
         ]
@@ -2311,19 +2266,15 @@ class EmployerHouseholdDetailsForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         instance = self.instance
         self.initial.update({
-            'household_id_num': instance.get_household_id_full(),
+            'household_id': instance.get_household_id_full(),
         })
 
-    def clean_household_id_num(self):
-        cleaned_field = self.cleaned_data.get('household_id_num')
+    def clean_household_id(self):
+        cleaned_field = self.cleaned_data.get('household_id')
         validate_nric("This member", cleaned_field)
-        ciphertext, nonce, tag = encrypt_string(
-            cleaned_field,
-            settings.ENCRYPTION_KEY
-        )
-        self.instance.household_id_nonce = nonce
-        self.instance.household_id_tag = tag
-        return ciphertext
+        # Encrypted by the model field on save
+        self.instance.clear_legacy_fields('household_id')
+        return cleaned_field
 
 
 class MaidInventoryForm(forms.ModelForm):
@@ -2497,6 +2448,7 @@ class DocServiceFeeScheduleForm(forms.ModelForm):
         model = DocServiceFeeSchedule
         exclude = [
             'employer_doc',
+            'fdw_replaced_passport_num',
             'fdw_replaced_passport_nonce',
             'fdw_replaced_passport_tag',
             'ca_remaining_payment_amount'
@@ -2511,7 +2463,7 @@ class DocServiceFeeScheduleForm(forms.ModelForm):
 
         passport_num = self.instance.get_fdw_replaced_passport_full()
         self.initial.update({
-            'fdw_replaced_passport_num': passport_num
+            'fdw_replaced_passport': passport_num
         })
 
         self.helper = FormHelper()
@@ -2540,7 +2492,7 @@ class DocServiceFeeScheduleForm(forms.ModelForm):
                             css_class='form-group col-md-12 pr-md-3'
                         ),
                         Column(
-                            'fdw_replaced_passport_num',
+                            'fdw_replaced_passport',
                             css_class='form-group col-md-12 pl-md-3'
                         )
                     ),
@@ -2744,17 +2696,12 @@ class DocServiceFeeScheduleForm(forms.ModelForm):
             )
         )
 
-    def clean_fdw_replaced_passport_num(self):
-        cleaned_field = self.cleaned_data.get('fdw_replaced_passport_num')
+    def clean_fdw_replaced_passport(self):
+        cleaned_field = self.cleaned_data.get('fdw_replaced_passport')
+        self.instance.clear_legacy_fields('fdw_replaced_passport')
         if cleaned_field:
             validate_passport("FDW", cleaned_field)
-            ciphertext, nonce, tag = encrypt_string(
-                cleaned_field,
-                settings.ENCRYPTION_KEY
-            )
-            self.instance.fdw_replaced_passport_nonce = nonce
-            self.instance.fdw_replaced_passport_tag = tag
-            return ciphertext
+            return cleaned_field
 
     def clean_b4_loan_transferred(self):
         is_new_case = self.cleaned_data.get('is_new_case')
@@ -2771,7 +2718,7 @@ class DocServiceFeeScheduleForm(forms.ModelForm):
     def clean(self) -> Dict[str, Any]:
         cleaned_data = super().clean()
         fdw_replaced_passport_num = cleaned_data.get(
-            'fdw_replaced_passport_num')
+            'fdw_replaced_passport')
         is_new_case = cleaned_data.get('is_new_case')
         if not is_new_case and fdw_replaced_passport_num:
             error_msg = _('The replaced FDW passport number is required')
@@ -2782,9 +2729,7 @@ class DocServiceFeeScheduleForm(forms.ModelForm):
             strict_fields = [
                 'is_new_case',
                 'fdw_replaced_name',
-                'fdw_replaced_passport_num',
-                'fdw_replaced_passport_nonce',
-                'fdw_replaced_passport_tag',
+                'fdw_replaced_passport',
                 'b4_loan_transferred',
                 'b1_service_fee',
                 'b2a_work_permit_application_collection',
@@ -3443,6 +3388,20 @@ class CaseStatusForm(forms.ModelForm):
 # Signature Forms
 
 
+class SignatureFormField(forms.CharField):
+    # Base64 data URL posted by a signature pad
+    def validate(self, value):
+        super().validate(value)
+        if value:
+            try:
+                data_url_to_signature(value)
+            except ValueError:
+                raise ValidationError(
+                    _('There was an issue uploading your signature, please '
+                      'try again.')
+                )
+
+
 class SignatureForm(forms.ModelForm):
     class Meta:
         model = CaseSignature
@@ -3454,6 +3413,16 @@ class SignatureForm(forms.ModelForm):
         self.form_fields = kwargs.pop('form_fields')
         super().__init__(*args, **kwargs)
 
+        # Signatures are not model fields, see SignatureDescriptor
+        if self.model_field_name in CaseSignature.SIGNATURE_NAMES:
+            self.fields[self.model_field_name] = SignatureFormField(
+                required=False
+            )
+            self.initial[self.model_field_name] = getattr(
+                self.instance,
+                self.model_field_name
+            )
+
         # Make copy of all field names, then remove fields that are not
         # in self.form_fields.
         fields_copy = list(self.fields)
@@ -3542,6 +3511,15 @@ class SignatureForm(forms.ModelForm):
         else:
             return cleaned_data
 
+    def save(self, commit=True):
+        if self.model_field_name in CaseSignature.SIGNATURE_NAMES:
+            setattr(
+                self.instance,
+                self.model_field_name,
+                self.cleaned_data[self.model_field_name]
+            )
+        return super().save(commit)
+
 
 class ChallengeForm(forms.Form):
     nric_fin = forms.CharField(
@@ -3618,7 +3596,7 @@ class ChallengeForm(forms.Form):
 
 
 class EmployerSignatureForm(forms.Form):
-    employer_signature = forms.CharField(
+    employer_signature = SignatureFormField(
         widget=forms.HiddenInput()
     )
 
@@ -3674,10 +3652,10 @@ class EmployerSignatureForm(forms.Form):
 
 
 class EmployerWithSpouseSignatureForm(forms.Form):
-    employer_signature = forms.CharField(
+    employer_signature = SignatureFormField(
         widget=forms.HiddenInput()
     )
-    employer_spouse_signature = forms.CharField(
+    employer_spouse_signature = SignatureFormField(
         widget=forms.HiddenInput()
     )
 
@@ -3753,10 +3731,10 @@ class EmployerWithSpouseSignatureForm(forms.Form):
 
 
 class EmployerWithOneSponsorSignatureForm(forms.Form):
-    employer_signature = forms.CharField(
+    employer_signature = SignatureFormField(
         widget=forms.HiddenInput()
     )
-    employer_sponsor1_signature = forms.CharField(
+    employer_sponsor1_signature = SignatureFormField(
         widget=forms.HiddenInput()
     )
 
@@ -3832,13 +3810,13 @@ class EmployerWithOneSponsorSignatureForm(forms.Form):
 
 
 class EmployerWithTwoSponsorSignatureForm(forms.Form):
-    employer_signature = forms.CharField(
+    employer_signature = SignatureFormField(
         widget=forms.HiddenInput()
     )
-    employer_sponsor1_signature = forms.CharField(
+    employer_sponsor1_signature = SignatureFormField(
         widget=forms.HiddenInput()
     )
-    employer_sponsor2_signature = forms.CharField(
+    employer_sponsor2_signature = SignatureFormField(
         widget=forms.HiddenInput()
     )
 
@@ -3936,11 +3914,11 @@ class EmployerWithTwoSponsorSignatureForm(forms.Form):
 
 
 class EmployerWithJointApplicantSignatureForm(forms.Form):
-    employer_signature = forms.CharField(
+    employer_signature = SignatureFormField(
         widget=forms.HiddenInput()
     )
 
-    joint_applicant_signature = forms.CharField(
+    joint_applicant_signature = SignatureFormField(
         widget=forms.HiddenInput()
     )
 
@@ -4016,13 +3994,13 @@ class EmployerWithJointApplicantSignatureForm(forms.Form):
 
 
 class HandoverSignatureForm(forms.Form):
-    agency_employee_signature = forms.CharField(
+    agency_employee_signature = SignatureFormField(
         widget=forms.HiddenInput()
     )
-    employer_signature = forms.CharField(
+    employer_signature = SignatureFormField(
         widget=forms.HiddenInput()
     )
-    fdw_signature = forms.CharField(
+    fdw_signature = SignatureFormField(
         widget=forms.HiddenInput()
     )
 
@@ -4116,3 +4094,22 @@ class HandoverSignatureForm(forms.Form):
                 )
             )
         )
+
+
+class CaseDocumentsExportForm(forms.Form):
+    start_date = forms.DateField(
+        label=_('Contract Date From')
+    )
+    end_date = forms.DateField(
+        label=_('Contract Date To')
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start_date = cleaned_data.get('start_date')
+        end_date = cleaned_data.get('end_date')
+        if start_date and end_date and start_date > end_date:
+            raise ValidationError(
+                _('The start date must not be after the end date')
+            )
+        return cleaned_data
@@ -42,7 +42,7 @@ class EmployerHouseholdFormSetHelper(FormHelper):
                             css_class='col-lg-12 pl-md-3',
                         ),
                         Column(
-                            'household_id_num',
+                            'household_id',
                             css_class='col-xl-12 pr-md-3'
                         ),
                         Column(
@@ -1,3 +1,5 @@
+import base64
+
 from onlinemaid.constants import FullNationsChoices
 
 from .constants import (EmployerTypeOfApplicantChoices,
@@ -34,3 +36,22 @@ def nationality_residential_status_match(n, rs) -> bool:
         return n == FullNationsChoices.SINGAPORE
     else:
         return True
+
+
+def signature_to_data_url(content_type, image) -> str:
+    return 'data:{};base64,{}'.format(
+        content_type,
+        base64.b64encode(image).decode('ascii')
+    )
+
+
+def data_url_to_signature(data_url):
+    # Data URL as posted by the signature pad, 'data:image/png;base64,...'.
+    # Returns the content type and the decoded image bytes.
+    header, _, data = data_url.partition(',')
+    if not header.startswith('data:') or not header.endswith(';base64'):
+        raise ValueError('Signature is not a base64 data URL')
+    content_type = header[len('data:'):-len(';base64')]
+    if content_type != 'image/png':
+        raise ValueError('Signature is not a PNG image')
+    return content_type, base64.b64decode(data, validate=True)
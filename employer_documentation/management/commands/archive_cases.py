@@ -0,0 +1,57 @@
+import uuid
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from employer_documentation.case_archiving import (ARCHIVE_BATCH_SIZE,
+                                                   archive_cases)
+from employer_documentation.constants import CaseStatusChoices
+from employer_documentation.models import EmployerDoc
+
+
+class Command(BaseCommand):
+    help = 'Archives cases in bulk, by default every case waiting to handover'
+
+    def add_arguments(self, parser):
+        parser.add_argument('case_pks', nargs='*', type=uuid.UUID)
+        parser.add_argument(
+            '--status',
+            choices=CaseStatusChoices.values,
+            help='Only archive cases with this status'
+        )
+        parser.add_argument(
+            '--agreement-date-before',
+            type=lambda value: datetime.strptime(value, '%Y-%m-%d').date(),
+            help='Only archive cases with a contract date before YYYY-MM-DD'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=ARCHIVE_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        qs = EmployerDoc.objects.all()
+        if options['case_pks']:
+            qs = qs.filter(pk__in=options['case_pks'])
+        elif not options['status']:
+            qs = qs.filter(status=CaseStatusChoices.WAITING_TO_HANDOVER)
+        if options['status']:
+            qs = qs.filter(status=options['status'])
+        if options['agreement_date_before']:
+            qs = qs.filter(
+                agreement_date__lt=options['agreement_date_before']
+            )
+
+        def progress(archived, total):
+            self.stdout.write(f'Archived {archived} of {total} cases')
+
+        archived = archive_cases(
+            qs,
+            batch_size=options['batch_size'],
+            progress=progress
+        )
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} cases'))
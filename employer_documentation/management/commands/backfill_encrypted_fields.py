@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+
+from employer_documentation.models import (Employer, EmployerHousehold,
+                                           EmployerJointApplicant,
+                                           EmployerSponsor)
+from maid.models import Maid
+
+ENCRYPTED_FIELD_MODELS = [
+    Employer,
+    EmployerSponsor,
+    EmployerJointApplicant,
+    EmployerHousehold,
+    Maid,
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes the blind indexes and masked values of the NRIC/FIN/'
+        'passport numbers of every employer, sponsor, joint applicant, '
+        'household member and maid'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def backfill(self, model, batch_size):
+        derived_fields = [
+            field
+            for name in model.encrypted_fields
+            for field in model.get_derived_field_names(name)
+        ]
+        source_fields = [
+            field
+            for fields in model.encrypted_fields.values()
+            for field in fields
+        ]
+        checked = updated = 0
+        changed = []
+        for obj in model.objects.only(
+            'pk',
+            *source_fields,
+            *derived_fields
+        ).iterator(chunk_size=batch_size):
+            old_values = [getattr(obj, field) for field in derived_fields]
+            obj.set_derived_fields()
+            if old_values != [getattr(obj, field) for field in derived_fields]:
+                changed.append(obj)
+            checked += 1
+            if len(changed) >= batch_size:
+                model.objects.bulk_update(changed, derived_fields)
+                updated += len(changed)
+                changed = []
+        if changed:
+            model.objects.bulk_update(changed, derived_fields)
+            updated += len(changed)
+        return checked, updated
+
+    def handle(self, *args, **options):
+        for model in ENCRYPTED_FIELD_MODELS:
+            checked, updated = self.backfill(model, options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f'{model._meta.verbose_name_plural}: updated {updated} of '
+                f'{checked} rows'
+            ))
@@ -0,0 +1,71 @@
+import datetime
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from employer_documentation.case_export import stream_case_documents
+from employer_documentation.models import EmployerDoc
+
+
+class Command(BaseCommand):
+    help = (
+        'Writes every generated and uploaded PDF of the given cases, or of '
+        'an agency\'s cases in a contract date range, to one ZIP file'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('case_pks', nargs='*', type=uuid.UUID)
+        parser.add_argument('--agency', type=int, help='Agency pk')
+        parser.add_argument(
+            '--start-date',
+            type=datetime.date.fromisoformat,
+            help='First contract date, YYYY-MM-DD'
+        )
+        parser.add_argument(
+            '--end-date',
+            type=datetime.date.fromisoformat,
+            help='Last contract date, YYYY-MM-DD'
+        )
+        parser.add_argument('--output', default='cases.zip')
+        parser.add_argument(
+            '--base-url',
+            default='http://localhost:8000/',
+            help='Site URL the documents are rendered for'
+        )
+
+    def handle(self, *args, **options):
+        if options['case_pks']:
+            employer_docs = EmployerDoc.objects.filter(
+                pk__in=options['case_pks']
+            )
+        elif (
+            options['agency']
+            and options['start_date']
+            and options['end_date']
+        ):
+            employer_docs = EmployerDoc.objects.filter(
+                employer__agency_employee__agency__pk=options['agency'],
+                agreement_date__range=(
+                    options['start_date'],
+                    options['end_date']
+                )
+            )
+        else:
+            raise CommandError(
+                'Give case pks, or --agency with --start-date and --end-date'
+            )
+
+        employer_docs = employer_docs.select_related(
+            'rn_docupload_ed'
+        ).order_by('agreement_date', 'case_ref_no')
+        count = employer_docs.count()
+        with open(options['output'], 'wb') as f:
+            for chunk in stream_case_documents(
+                employer_docs.iterator(),
+                options['base_url']
+            ):
+                f.write(chunk)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported the documents of {count} cases to {options["output"]}'
+        ))
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from employer_documentation.models import CaseSignature
+
+
+class Command(BaseCommand):
+    help = (
+        'Moves signatures still stored as base64 text on CaseSignature into '
+        'CaseSignatureImage'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        legacy_fields = [
+            f'legacy_{name}' for name in CaseSignature.SIGNATURE_NAMES
+        ]
+        has_legacy = Q()
+        for legacy_field in legacy_fields:
+            has_legacy |= Q(**{f'{legacy_field}__isnull': False})
+        pks = list(
+            CaseSignature.objects.filter(
+                has_legacy
+            ).order_by('pk').values_list('pk', flat=True)
+        )
+
+        moved = 0
+        for start in range(0, len(pks), batch_size):
+            # Only a batch of the base64 text is held in memory at a time
+            for case_signature in CaseSignature.objects.filter(
+                pk__in=pks[start:start + batch_size]
+            ).only('pk', *legacy_fields):
+                update_fields = []
+                for name in CaseSignature.SIGNATURE_NAMES:
+                    legacy_field = f'legacy_{name}'
+                    data_url = getattr(case_signature, legacy_field)
+                    if data_url is None:
+                        continue
+                    try:
+                        setattr(case_signature, name, data_url)
+                    except ValueError as e:
+                        # Left in place to be looked at
+                        self.stderr.write(
+                            f'Case signature {case_signature.pk} {name}: {e}'
+                        )
+                        continue
+                    setattr(case_signature, legacy_field, None)
+                    update_fields += [legacy_field, f'{name}_signed_at']
+                    moved += 1
+                if update_fields:
+                    case_signature.save(update_fields=update_fields)
+            self.stdout.write(
+                f'{min(start + batch_size, len(pks))} of {len(pks)} case '
+                f'signatures done'
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'Moved {moved} signatures'))
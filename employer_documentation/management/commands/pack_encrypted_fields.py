@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from employer_documentation.models import (ArchivedMaid,
+                                           DocServiceFeeSchedule, Employer,
+                                           EmployerHousehold,
+                                           EmployerJointApplicant,
+                                           EmployerSponsor)
+from maid.models import Maid
+from onlinemaid.helper_functions import pack_encrypted
+
+# Models whose encrypted_fields all moved to an EncryptedField, each
+# model.encrypted_fields[name] being the legacy ciphertext, nonce and tag
+PACKED_MODELS = [
+    Employer,
+    EmployerSponsor,
+    EmployerJointApplicant,
+    EmployerHousehold,
+    DocServiceFeeSchedule,
+    Maid,
+    ArchivedMaid,
+]
+
+PACKED_FIELDS = [
+    (model, name)
+    for model in PACKED_MODELS
+    for name in model.encrypted_fields
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Moves encrypted numbers still stored as separate ciphertext, nonce '
+        'and tag columns into their packed EncryptedField column'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def pack(self, model, name, batch_size):
+        ciphertext_field, nonce_field, tag_field = model.encrypted_fields[name]
+        legacy_fields = [ciphertext_field, nonce_field, tag_field]
+        qs = model.objects.filter(
+            **{f'{name}__isnull': True}
+        ).exclude(
+            **{f'{ciphertext_field}__isnull': True}
+        ).values_list('pk', *legacy_fields)
+
+        packed = 0
+        rows = list(qs.iterator(chunk_size=batch_size))
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            with transaction.atomic():
+                for pk, ciphertext, nonce, tag in batch:
+                    if not ciphertext:
+                        continue
+                    # Concatenated as is, the values are never decrypted
+                    model.objects.filter(pk=pk).update(**{
+                        name: pack_encrypted(ciphertext, nonce, tag),
+                        ciphertext_field: None,
+                        nonce_field: None,
+                        tag_field: None
+                    })
+                    packed += 1
+        return packed
+
+    def handle(self, *args, **options):
+        for model, name in PACKED_FIELDS:
+            packed = self.pack(model, name, options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f'{model._meta.verbose_name_plural}: packed {packed} {name} '
+                f'values'
+            ))
@@ -0,0 +1,48 @@
+import os
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from employer_documentation.models import EmployerDoc
+from employer_documentation.pdf_rendering import render_case_documents
+
+
+class Command(BaseCommand):
+    help = 'Renders every HTML based PDF document of the given cases'
+
+    def add_arguments(self, parser):
+        parser.add_argument('case_pks', nargs='+', type=uuid.UUID)
+        parser.add_argument(
+            '--output-dir',
+            default='.',
+            help='Directory the PDFs are written to, one folder per case'
+        )
+        parser.add_argument(
+            '--base-url',
+            default='http://localhost:8000/',
+            help='Base URL used to resolve relative links in the templates'
+        )
+
+    def handle(self, *args, **options):
+        for pk in options['case_pks']:
+            try:
+                employer_doc = EmployerDoc.objects.get(pk=pk)
+            except EmployerDoc.DoesNotExist:
+                raise CommandError(f'Case {pk} does not exist')
+
+            case_dir = os.path.join(
+                options['output_dir'],
+                str(employer_doc.case_ref_no or employer_doc.pk)
+            )
+            os.makedirs(case_dir, exist_ok=True)
+            documents = render_case_documents(
+                employer_doc,
+                options['base_url']
+            )
+            for filename, pdf_file in documents.items():
+                with open(os.path.join(case_dir, filename), 'wb') as f:
+                    f.write(pdf_file)
+
+            self.stdout.write(self.style.SUCCESS(
+                f'Rendered {len(documents)} documents for case {pk}'
+            ))
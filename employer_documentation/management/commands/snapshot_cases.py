@@ -0,0 +1,79 @@
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from employer_documentation.case_snapshots import (create_case_snapshot,
+                                                   get_case_snapshot,
+                                                   verify_case_snapshot)
+from employer_documentation.constants import CaseStatusChoices
+from employer_documentation.models import EmployerDoc
+
+
+class Command(BaseCommand):
+    help = (
+        'Stores the PDF snapshot of archived cases that do not have one yet, '
+        'e.g. cases archived with archive_cases, or verifies the stored '
+        'snapshots against their manifests'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('case_pks', nargs='*', type=uuid.UUID)
+        parser.add_argument(
+            '--base-url',
+            default='http://localhost:8000/',
+            help='Site URL the documents are rendered for'
+        )
+        parser.add_argument(
+            '--replace',
+            action='store_true',
+            help='Render the snapshots of the cases again'
+        )
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Only check the stored PDFs against their manifest hashes'
+        )
+
+    def handle(self, *args, **options):
+        qs = EmployerDoc.objects.filter(
+            status=CaseStatusChoices.ARCHIVED
+        ).select_related(
+            'rn_docupload_ed'
+        ).order_by('agreement_date')
+        if options['case_pks']:
+            qs = qs.filter(pk__in=options['case_pks'])
+
+        done = 0
+        for employer_doc in qs.iterator():
+            if options['verify']:
+                mismatched = verify_case_snapshot(employer_doc)
+                if mismatched is None:
+                    self.stdout.write(f'{employer_doc.pk}: no snapshot')
+                elif mismatched:
+                    self.stdout.write(self.style.ERROR(
+                        f'{employer_doc.pk}: {", ".join(mismatched)} do not '
+                        f'match the manifest'
+                    ))
+                done += 1
+                continue
+
+            if not options['replace'] and get_case_snapshot(employer_doc):
+                continue
+            try:
+                manifest = create_case_snapshot(
+                    employer_doc,
+                    options['base_url'],
+                    replace=options['replace']
+                )
+            except Exception as e:
+                self.stderr.write(f'{employer_doc.pk}: {e}')
+                continue
+            self.stdout.write(
+                f'{employer_doc.pk}: {len(manifest["documents"])} documents'
+            )
+            done += 1
+
+        if options['verify']:
+            self.stdout.write(self.style.SUCCESS(f'Verified {done} cases'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Stored the snapshots of {done} cases'))
@@ -1,23 +1,25 @@
-import calendar
-import datetime
 import uuid
 from typing import Any, Dict
 
+from agency.helper_functions import get_authority
 from agency.mixins import AgencyLoginRequiredMixin
 from django.conf import settings
-from django.contrib.auth import get_user_model
-from django.http import HttpResponse
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import FileResponse, Http404, HttpResponse
 from django.http.request import HttpRequest as req
 from django.http.response import HttpResponseBase as RESBASE
 from django.template.loader import render_to_string
 from django.urls.base import reverse_lazy
+from django.views.generic.detail import SingleObjectMixin
 from maid.constants import COUNTRY_LANGUAGE_MAP
 from onlinemaid.constants import AG_ADMINS, AG_MANAGERS, AG_OWNERS, AG_SALES
-from onlinemaid.helper_functions import intervening_weekdays
 from onlinemaid.mixins import GroupRequiredMixin
-from weasyprint import CSS, HTML
 
+from .case_snapshots import open_snapshot_document
 from .models import EmployerDoc
+from .pdf_cache import get_or_render_pdf
+from .pdf_rendering import PdfRenderQueueFull, PdfRenderTimeout
+from .repayment_schedule import get_repayment_schedule
 
 
 class PdfHtmlViewMixin:
@@ -55,16 +57,38 @@ class PdfHtmlViewMixin:
         return context
 
     def generate_pdf_response(self, request, context):
-        # Render PDF
+        # Render PDF in the rendering pool, unless the exact same document
+        # has been rendered before
         html_template = render_to_string(self.template_name, context)
-        pdf_file = HTML(
-            string=html_template,
-            base_url=request.build_absolute_uri()
-        ).write_pdf(
-            # Load separate CSS stylesheet from static folder
-            stylesheets=[CSS(settings.STATIC_URL + 'css/pdf.css')]
-        )
-        response = HttpResponse(pdf_file, content_type='application/pdf')
+        try:
+            pdf_file = get_or_render_pdf(
+                html_template,
+                request.build_absolute_uri()
+            )
+        except (PdfRenderQueueFull, PdfRenderTimeout) as e:
+            response = HttpResponse(str(e), status=503)
+            response['Retry-After'] = settings.PDF_RENDER_QUEUE_TIMEOUT
+            return response
+        response = FileResponse(pdf_file, content_type='application/pdf')
+        if self.content_disposition:
+            response['Content-Disposition'] = self.content_disposition
+        else:
+            response['Content-Disposition'] = (
+                'inline; filename=' + self.DEFAULT_DOWNLOAD_FILENAME
+            )
+        return response
+
+    def get_snapshot_response(self, filename):
+        # Archived cases are served from the PDFs stored when they were
+        # archived, without rendering
+        if not isinstance(self.object, EmployerDoc) or not (
+            self.object.is_archived_doc
+        ):
+            return None
+        pdf_file = open_snapshot_document(self.object, filename)
+        if pdf_file is None:
+            return None
+        response = FileResponse(pdf_file, content_type='application/pdf')
         if self.content_disposition:
             response['Content-Disposition'] = self.content_disposition
         else:
@@ -76,150 +100,24 @@ class PdfHtmlViewMixin:
     def generate_pdf_file(self, request, context, template_name):
         # Render PDF
         html_template = render_to_string(template_name, context)
-        return HTML(
-            string=html_template,
-            base_url=request.build_absolute_uri()
-        ).write_pdf(
-            # Load separate CSS stylesheet from static folder
-            stylesheets=[CSS(settings.STATIC_URL + 'css/pdf.css')]
-        )
+        with get_or_render_pdf(
+            html_template,
+            request.build_absolute_uri()
+        ) as pdf_file:
+            return pdf_file.read()
 
     def calc_repayment_schedule(self):
-        repayment_table = {}
+        return get_repayment_schedule(self.object)
 
-        # Salary constant
-        BASIC_SALARY = self.object.fdw_salary
 
-        # Off day constants
-        PER_OFF_DAY_COMPENSATION = self.object.get_per_off_day_compensation()
-        FDW_OFF_DAYS_PER_MONTH = self.object.fdw_off_days
-        OFF_DAY_OF_WEEK = int(self.object.fdw_off_day_of_week)
+class CaseDocumentContextMixin(PdfHtmlViewMixin, SingleObjectMixin):
+    # Builds the PDF template context of a case outside of a request, used
+    # when all of a case's documents are rendered in one go
+    model = EmployerDoc
 
-        # Initialise loan amounts
-        MONTHLY_LOAN_REPAYMENT = self.object.fdw_monthly_loan_repayment
-        fdw_loan_balance = self.object.fdw_loan
-
-        if (
-            hasattr(self.object, 'rn_casestatus_ed')
-            and self.object.rn_casestatus_ed.fdw_work_commencement_date
-        ):
-            DEPLOYMENT_DATE = (
-                self.object.rn_casestatus_ed.fdw_work_commencement_date
-            )
-        else:
-            DEPLOYMENT_DATE = None
-
-        if DEPLOYMENT_DATE:
-            # Initialise dates
-            payment_year = DEPLOYMENT_DATE.year
-            payment_month = DEPLOYMENT_DATE.month
-            payment_day = min(
-                DEPLOYMENT_DATE.day,
-                calendar.monthrange(
-                    payment_year,
-                    payment_month
-                )[1]
-            )
-
-            for i in range(1, 25):
-                # Set start_date for calculation of potential_off_days_in_month
-                payment_date = datetime.date(
-                    payment_year,
-                    payment_month,
-                    payment_day
-                )
-                start_date = payment_date + datetime.timedelta(days=1)
-
-                # Set payment date
-                payment_month += 1
-                if payment_month % 12 == 0:
-                    payment_month = 12
-                else:
-                    payment_month = payment_month % 12
-                payment_year += 1 if payment_month % 12 == 1 else 0
-                payment_day = min(
-                    DEPLOYMENT_DATE.day,
-                    calendar.monthrange(payment_year, payment_month)[1]
-                )
-
-                # Calculate potential_off_days_in_month
-                end_date = datetime.date(
-                    payment_year,
-                    payment_month,
-                    payment_day
-                )
-                potential_off_days_in_month = intervening_weekdays(
-                    start_date, end_date,
-                    inclusive=True,
-                    weekdays=[OFF_DAY_OF_WEEK]
-                )
-
-                # Calculate salary and loan payments in month
-                fdw_off_days_remaining = (
-                    potential_off_days_in_month - FDW_OFF_DAYS_PER_MONTH
-                )
-                balance_off_day_compensation = (
-                    PER_OFF_DAY_COMPENSATION * fdw_off_days_remaining
-                )
-                total_salary = BASIC_SALARY + balance_off_day_compensation
-                loan_repaid = min(
-                    MONTHLY_LOAN_REPAYMENT,
-                    BASIC_SALARY,
-                    fdw_loan_balance
-                )
-
-                # Each row of repayment table
-                repayment_table[i] = {
-                    'salary_date': '{day}/{month}/{year}'.format(
-                        day=str(payment_day).zfill(2),
-                        month=str(payment_month).zfill(2),
-                        year=str(payment_year).zfill(4),
-                    ),
-                    'basic_salary': BASIC_SALARY,
-                    'off_day_compensation': balance_off_day_compensation,
-                    'total_salary': total_salary,
-                    'loan_repaid': loan_repaid,
-                    'salary_received': total_salary - loan_repaid,
-                }
-
-                # Update remaining loan balance
-                if fdw_loan_balance - loan_repaid >= 0:
-                    fdw_loan_balance = fdw_loan_balance - loan_repaid
-                else:
-                    fdw_loan_balance = 0
-
-        else:
-            # if work commencement date not set, then generate table without
-            # dates
-            for i in range(1, 25):
-                # Calculate salary and loan payments in month
-                fdw_off_days_remaining = 4 - FDW_OFF_DAYS_PER_MONTH
-                balance_off_day_compensation = (
-                    PER_OFF_DAY_COMPENSATION * fdw_off_days_remaining
-                )
-                total_salary = BASIC_SALARY + balance_off_day_compensation
-                loan_repaid = min(
-                    MONTHLY_LOAN_REPAYMENT,
-                    BASIC_SALARY,
-                    fdw_loan_balance
-                )
-
-                # Each row of repayment table
-                repayment_table[i] = {
-                    'salary_date': '',
-                    'basic_salary': BASIC_SALARY,
-                    'off_day_compensation': balance_off_day_compensation,
-                    'total_salary': total_salary,
-                    'loan_repaid': loan_repaid,
-                    'salary_received': total_salary - loan_repaid,
-                }
-
-                # Update remaining loan balance
-                if fdw_loan_balance - loan_repaid >= 0:
-                    fdw_loan_balance = fdw_loan_balance - loan_repaid
-                else:
-                    fdw_loan_balance = 0
-        return repayment_table
+    def __init__(self, employer_doc, **kwargs):
+        super().__init__(**kwargs)
+        self.object = employer_doc
 
 
 class EmployerRequiredMixin(GroupRequiredMixin):
@@ -229,125 +127,148 @@ class EmployerRequiredMixin(GroupRequiredMixin):
                                 action'''
 
 
-class EmployerDocAccessMixin(EmployerRequiredMixin):
-    permission_denied_message = '''Access permission denied'''
+class ObjectAccessMixin:
+    """
+    Decides access to the object named by the URL before the view runs.
 
-    def dispatch(self, request: req, *args: Any, **kwargs: Any) -> RESBASE:
-        handler = super().dispatch(request, *args, **kwargs)
-        access_granted = False
+    The object is resolved once, with the view's own get_object(), and the
+    view's later get_object() calls return that same object. Decisions are
+    kept on the request, per access mixin and object.
+    """
 
-        # If URL has pk, then check user access permissions
-        if self.kwargs.get(self.pk_url_kwarg):
-            # Set agency user object
+    def get_access_object(self):
+        if not hasattr(self, 'access_object'):
             try:
-                test_user = get_user_model().objects.get(
-                    pk=request.user.pk
-                )
-            except Exception:
-                access_granted = False
-            else:
-
-                # Set employer object
-                test_obj = self.get_object()
-                required_user = test_obj.employer.potential_employer.user
-                access_granted = test_user == required_user
-
-            uuid_list = request.session.get(
-                str(uuid.uuid5(
-                    uuid.UUID(settings.ACCOUNT_UUID_NAMESPACE),
-                    str(self.request.user.pk)
-                )),
-                None
-            )
+                self.access_object = self.get_object()
+            except ObjectDoesNotExist:
+                raise Http404
+            self.get_object = lambda *args, **kwargs: self.access_object
+        return self.access_object
+
+    def has_object_access(self, request: req) -> bool:
+        """
+        Whether the request's user may access the access object. Overridden
+        by the access mixins, the default denies access.
+        """
+        return False
+
+    def check_object_access(self, request: req) -> bool:
+        # Views without a pk in their URL fall back to the inherited checks
+        pk_url_kwarg = getattr(self, 'pk_url_kwarg', None)
+        if not pk_url_kwarg or not self.kwargs.get(pk_url_kwarg):
+            return True
+
+        decisions = request.__dict__.setdefault('_object_access', {})
+        key = (
+            self.access_scope,
+            pk_url_kwarg,
+            str(self.kwargs.get(pk_url_kwarg))
+        )
+        if key not in decisions:
+            decisions[key] = self.has_object_access(request)
+        return decisions[key]
 
-            if uuid_list:
-                if str(test_obj.key_uuid) in uuid_list:
-                    access_granted = True
-                else:
-                    self.login_url = reverse_lazy('employer_doc_challenge',
-                                                  kwargs={
-                                                      'level_1_pk': test_obj.pk
-                                                  })
-                    access_granted = False
-            else:
-                self.login_url = reverse_lazy('employer_doc_challenge',
-                                              kwargs={
-                                                  'level_1_pk': test_obj.pk
-                                              })
-                access_granted = False
-
-        # If URL does not have pk, then fall back to inherited dispatch handler
-        else:
-            access_granted = True
 
-        if access_granted:
-            return handler
-        else:
+class EmployerDocAccessMixin(ObjectAccessMixin, EmployerRequiredMixin):
+    permission_denied_message = '''Access permission denied'''
+    access_scope = 'employer'
+
+    def has_object_access(self, request: req) -> bool:
+        # Employers get access to a case by passing its challenge, which
+        # adds the case's key to their session
+        uuid_list = request.session.get(
+            str(uuid.uuid5(
+                uuid.UUID(settings.ACCOUNT_UUID_NAMESPACE),
+                str(request.user.pk)
+            )),
+            None
+        )
+        return bool(
+            uuid_list
+            and str(self.get_access_object().key_uuid) in uuid_list
+        )
+
+    def dispatch(self, request: req, *args: Any, **kwargs: Any) -> RESBASE:
+        # Anonymous users are sent to sign in by EmployerRequiredMixin
+        if (
+            request.user.is_authenticated
+            and not self.check_object_access(request)
+        ):
+            self.login_url = reverse_lazy(
+                'employer_doc_challenge',
+                kwargs={
+                    'level_1_pk': self.kwargs.get(self.pk_url_kwarg)
+                }
+            )
             return self.handle_no_permission(request)
 
+        return super().dispatch(request, *args, **kwargs)
+
 
-class AgencyAccessToEmployerDocAppMixin(AgencyLoginRequiredMixin):
+class AgencyAccessToEmployerDocAppMixin(
+    ObjectAccessMixin,
+    AgencyLoginRequiredMixin
+):
     permission_denied_message = '''Access permission denied'''
+    access_scope = 'agency'
+
+    def get_access_employer(self):
+        test_obj = self.get_access_object()
+        if hasattr(test_obj, 'applicant_type'):
+            return test_obj
+        elif hasattr(test_obj, 'employer'):
+            return test_obj.employer
+        elif hasattr(test_obj, 'employer_doc'):
+            return test_obj.employer_doc.employer
+        return None
+
+    def has_object_access(self, request: req) -> bool:
+        authority_details = get_authority(request)
+        authority = authority_details['authority']
+        if not authority_details['agency_id']:
+            return False
+
+        employer_obj = self.get_access_employer()
+        if not employer_obj:
+            return False
+        agency_employee = employer_obj.agency_employee
+        if agency_employee.agency_id != authority_details['agency_id']:
+            return False
+
+        # Owners and administrators see every case of their agency, like in
+        # the case list
+        if authority == AG_OWNERS or authority == AG_ADMINS:
+            return True
+        elif authority == AG_MANAGERS:
+            return (
+                agency_employee.branch_id
+                == request.user.agency_employee.branch_id
+            )
+        elif authority == AG_SALES:
+            return agency_employee.pk == request.user.agency_employee.pk
+        return False
 
     def dispatch(self, request: req, *args: Any, **kwargs: Any) -> RESBASE:
-        handler = super().dispatch(request, *args, **kwargs)
-        access_granted = False
-
-        # If URL has pk, then check user access permissions
-        if self.kwargs.get(self.pk_url_kwarg):
-            # Set agency user object
-            test_user = get_user_model().objects.get(pk=request.user.pk)
-            if hasattr(test_user, 'agency_owner'):
-                agency_user_obj = test_user.agency_owner
-            elif hasattr(test_user, 'agency_employee'):
-                agency_user_obj = test_user.agency_employee
-            else:
-                agency_user_obj = None
-
-            # Set employer object
-            employer_obj = None
-            test_obj = self.get_object() if agency_user_obj else None
-            if test_obj:
-                if hasattr(test_obj, 'applicant_type'):
-                    employer_obj = test_obj
-                elif hasattr(test_obj, 'employer'):
-                    employer_obj = test_obj.employer
-                elif hasattr(test_obj, 'employer_doc'):
-                    employer_obj = test_obj.employer_doc.employer
-
-            # Check agency user permissions vs employer object
-            if (
-                employer_obj
-                and employer_obj.agency_employee.agency == agency_user_obj.agency
-            ):
-                if self.authority == AG_OWNERS:
-                    access_granted = True
-                elif self.authority == AG_ADMINS:
-                    access_granted = True  # TODO: Handle no permission
-                elif self.authority == AG_MANAGERS:
-                    employer_agent = employer_obj.agency_employee
-                    if employer_agent.branch == agency_user_obj.branch:
-                        access_granted = True
-                elif self.authority == AG_SALES:
-                    if employer_obj.agency_employee == agency_user_obj:
-                        access_granted = True
-
-        # If URL does not have pk, then fall back to inherited dispatch handler
-        else:
-            access_granted = True
-
-        if access_granted:
-            return handler
-        else:
+        # Anonymous users and superusers are turned away by
+        # AgencyLoginRequiredMixin
+        if (
+            request.user.is_authenticated
+            and not request.user.is_superuser
+            and not self.check_object_access(request)
+        ):
             return self.handle_no_permission(request)
 
+        return super().dispatch(request, *args, **kwargs)
+
 
 class OwnerAccessToEmployerDocAppMixin(AgencyAccessToEmployerDocAppMixin):
     permission_denied_message = '''Access permission denied'''
 
     def dispatch(self, request: req, *args: Any, **kwargs: Any) -> RESBASE:
-        handler = super().dispatch(request, *args, **kwargs)
-        if self.authority == AG_OWNERS:
-            return handler
-        else:
+        if (
+            request.user.is_authenticated
+            and get_authority(request)['authority'] != AG_OWNERS
+        ):
             return self.handle_no_permission(request)
+
+        return super().dispatch(request, *args, **kwargs)
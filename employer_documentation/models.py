@@ -1,6 +1,5 @@
 import os
 import uuid
-from datetime import datetime
 from decimal import ROUND_HALF_UP, Decimal
 
 from accounts.models import PotentialEmployer
@@ -9,19 +8,20 @@ from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.files.storage import FileSystemStorage
 from django.core.validators import FileExtensionValidator, RegexValidator
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
-from maid.constants import TypeOfMaidChoices
 from maid.models import Maid
 from onlinemaid.constants import TrueFalseChoices
-from onlinemaid.fields import (CustomBinaryField, GenderCharField,
+from onlinemaid.fields import (BlindIndexField, CustomBinaryField,
+                               EncryptedField, EncryptedFieldsModelMixin,
+                               GenderCharField,
                                MaritalStatusCharField, NationalityCharField,
                                NullableBooleanField, NullableCharField,
                                NullableDateField, NullableGenderCharField,
                                NullableMaritalStatusCharField,
-                               NullableNationalityCharField)
-from onlinemaid.helper_functions import decrypt_string, is_married
+                               NullableNationalityCharField, PartialField)
+from onlinemaid.helper_functions import is_married
 from onlinemaid.storage_backends import EmployerDocumentationStorage
 
 from .constants import (NUMBER_OF_WORK_DAYS_IN_MONTH, CaseStatusChoices,
@@ -31,10 +31,10 @@ from .constants import (NUMBER_OF_WORK_DAYS_IN_MONTH, CaseStatusChoices,
                         ResidentialStatusPartialChoices, WeekChoices)
 from .fields import (CustomMoneyDecimalField,
                      NullableResidentialStatusCharField,
-                     ResidentialStatusCharField)
+                     ResidentialStatusCharField, SignatureDescriptor)
 from .helper_functions import (is_applicant_joint_applicant,
                                is_applicant_sponsor, is_applicant_spouse,
-                               is_local)
+                               is_local, signature_to_data_url)
 
 
 class OverwriteStorage(FileSystemStorage):
@@ -67,17 +67,72 @@ class ReceiptMaster(models.Model):
         default=0
     )
 
+    # The single row holding the counter
+    RECEIPT_MASTER_PK = 1
+
     def get_running_number(self):
         return self.number
 
-    def set_increment_running_number(self):
-        self.number += 1
-        self.save()
+    @classmethod
+    def reserve_running_numbers(cls, count=1):
+        """
+        Reserves count consecutive running numbers and returns the first.
+
+        The counter is incremented by a single UPDATE, which locks the row
+        until the transaction commits, and read back in the same
+        transaction. Concurrent callers therefore always get distinct
+        ranges. Use employer_documentation.receipts to allocate numbers.
+        """
+        counter = cls.objects.filter(pk=cls.RECEIPT_MASTER_PK)
+        with transaction.atomic():
+            if not counter.update(number=models.F('number') + count):
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(pk=cls.RECEIPT_MASTER_PK)
+                except IntegrityError:
+                    # Created by a concurrent caller
+                    pass
+                counter.update(number=models.F('number') + count)
+            last_number = counter.values_list('number', flat=True).get()
+        return last_number - count + 1
 
 # Employer e-Documentation Models
 
 
-class Employer(models.Model):
+class Employer(EncryptedFieldsModelMixin, models.Model):
+    encrypted_fields = {
+        'employer_nric': (
+            'employer_nric_num',
+            'employer_nric_nonce',
+            'employer_nric_tag'
+        ),
+        'employer_fin': (
+            'employer_fin_num',
+            'employer_fin_nonce',
+            'employer_fin_tag'
+        ),
+        'employer_passport': (
+            'employer_passport_num',
+            'employer_passport_nonce',
+            'employer_passport_tag'
+        ),
+        'spouse_nric': (
+            'spouse_nric_num',
+            'spouse_nric_nonce',
+            'spouse_nric_tag'
+        ),
+        'spouse_fin': (
+            'spouse_fin_num',
+            'spouse_fin_nonce',
+            'spouse_fin_tag'
+        ),
+        'spouse_passport': (
+            'spouse_passport_num',
+            'spouse_passport_nonce',
+            'spouse_passport_tag'
+        )
+    }
+
     id = models.UUIDField(
         primary_key=True,
         default=uuid.uuid4,
@@ -181,30 +236,40 @@ class Employer(models.Model):
         verbose_name=_("Employer residential status")
     )
 
-    employer_nric_num = CustomBinaryField(
+    employer_nric = EncryptedField(
         verbose_name=_('Employer NRIC')
     )
-
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    employer_nric_num = CustomBinaryField()
     employer_nric_nonce = CustomBinaryField()
-
     employer_nric_tag = CustomBinaryField()
 
-    employer_fin_num = CustomBinaryField(
+    employer_nric_blind_index = BlindIndexField()
+
+    employer_nric_partial = PartialField()
+
+    employer_fin = EncryptedField(
         verbose_name=_('Employer FIN')
     )
-
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    employer_fin_num = CustomBinaryField()
     employer_fin_nonce = CustomBinaryField()
-
     employer_fin_tag = CustomBinaryField()
 
-    employer_passport_num = CustomBinaryField(
+    employer_fin_blind_index = BlindIndexField()
+
+    employer_fin_partial = PartialField()
+
+    employer_passport = EncryptedField(
         verbose_name=_('Employer passport')
     )
-
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    employer_passport_num = CustomBinaryField()
     employer_passport_nonce = CustomBinaryField()
-
     employer_passport_tag = CustomBinaryField()
 
+    employer_passport_blind_index = BlindIndexField()
+
     employer_passport_date = NullableDateField(
         verbose_name=_('Employer passport expiry date')
     )
@@ -248,71 +313,58 @@ class Employer(models.Model):
         verbose_name=_("Spouse's residential status")
     )
 
-    spouse_nric_num = CustomBinaryField(
+    spouse_nric = EncryptedField(
         verbose_name=_("Spouse's NRIC")
     )
-
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    spouse_nric_num = CustomBinaryField()
     spouse_nric_nonce = CustomBinaryField()
-
     spouse_nric_tag = CustomBinaryField()
 
-    spouse_fin_num = CustomBinaryField(
+    spouse_nric_blind_index = BlindIndexField()
+
+    spouse_nric_partial = PartialField()
+
+    spouse_fin = EncryptedField(
         verbose_name=_("Spouse's FIN")
     )
-
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    spouse_fin_num = CustomBinaryField()
     spouse_fin_nonce = CustomBinaryField()
-
     spouse_fin_tag = CustomBinaryField()
 
-    spouse_passport_num = CustomBinaryField(
+    spouse_fin_blind_index = BlindIndexField()
+
+    spouse_fin_partial = PartialField()
+
+    spouse_passport = EncryptedField(
         verbose_name=_("Spouse's Passport No")
     )
-
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    spouse_passport_num = CustomBinaryField()
     spouse_passport_nonce = CustomBinaryField()
-
     spouse_passport_tag = CustomBinaryField()
 
+    spouse_passport_blind_index = BlindIndexField()
+
     spouse_passport_date = NullableDateField(
         verbose_name=_("Spouse's Passport Expiry Date")
     )
 
     def get_employer_nric_full(self):
-        return decrypt_string(
-            self.employer_nric_num,
-            settings.ENCRYPTION_KEY,
-            self.employer_nric_nonce,
-            self.employer_nric_tag,
-        )
+        return self.decrypt_field('employer_nric')
 
     def get_employer_nric_partial(self, padded=True):
-        plaintext = self.get_employer_nric_full()
-        if padded:
-            return 'x' * 5 + plaintext[-4:] if plaintext else ''
-        else:
-            return plaintext[-4:] if plaintext else ''
+        return self.get_partial('employer_nric', padded)
 
     def get_employer_fin_full(self):
-        return decrypt_string(
-            self.employer_fin_num,
-            settings.ENCRYPTION_KEY,
-            self.employer_fin_nonce,
-            self.employer_fin_tag,
-        )
+        return self.decrypt_field('employer_fin')
 
     def get_employer_fin_partial(self, padded=True):
-        plaintext = self.get_employer_fin_full()
-        if padded:
-            return 'x' * 5 + plaintext[-4:] if plaintext else ''
-        else:
-            return plaintext[-4:] if plaintext else ''
+        return self.get_partial('employer_fin', padded)
 
     def get_employer_passport_full(self):
-        return decrypt_string(
-            self.employer_passport_num,
-            settings.ENCRYPTION_KEY,
-            self.employer_passport_nonce,
-            self.employer_passport_tag,
-        )
+        return self.decrypt_field('employer_passport')
 
     def get_mobile_partial_sg(self):
         return '+65 ' + self.employer_mobile_number[:4] + ' ' + 'x' * 4
@@ -321,42 +373,19 @@ class Employer(models.Model):
         return self.employer_email[:3] + '_' * 8 + self.employer_email[-3:]
 
     def get_employer_spouse_nric_full(self):
-        return decrypt_string(
-            self.spouse_nric_num,
-            settings.ENCRYPTION_KEY,
-            self.spouse_nric_nonce,
-            self.spouse_nric_tag,
-        )
+        return self.decrypt_field('spouse_nric')
 
     def get_employer_spouse_nric_partial(self, padded=True):
-        plaintext = self.get_employer_spouse_nric_full()
-        if padded:
-            return 'x' * 5 + plaintext[-4:] if plaintext else ''
-        else:
-            return plaintext[-4:] if plaintext else ''
+        return self.get_partial('spouse_nric', padded)
 
     def get_employer_spouse_fin_full(self):
-        return decrypt_string(
-            self.spouse_fin_num,
-            settings.ENCRYPTION_KEY,
-            self.spouse_fin_nonce,
-            self.spouse_fin_tag,
-        )
+        return self.decrypt_field('spouse_fin')
 
     def get_employer_spouse_fin_partial(self, padded=True):
-        plaintext = self.get_employer_spouse_fin_full()
-        if padded:
-            return 'x' * 5 + plaintext[-4:] if plaintext else ''
-        else:
-            return plaintext[-4:] if plaintext else ''
+        return self.get_partial('spouse_fin', padded)
 
     def get_employer_spouse_passport_full(self):
-        return decrypt_string(
-            self.spouse_passport_num,
-            settings.ENCRYPTION_KEY,
-            self.spouse_passport_nonce,
-            self.spouse_passport_tag,
-        )
+        return self.decrypt_field('spouse_passport')
 
     def set_potential_employer_relation(self, new_email):
         try:
@@ -401,7 +430,7 @@ class Employer(models.Model):
 
         return error_msg_list
 
-    def get_details_missing_employer(self):
+    def get_details_missing_employer(self, has_household=None):
         # Retrieve verbose name ->
         # self._meta.get_field('field_name_str').verbose_name
         error_msg_list = []
@@ -437,11 +466,11 @@ class Employer(models.Model):
         if not hasattr(self, 'rn_income_employer'):
             error_msg_list.append('rn_income_employer')
 
-        if (
-            self.household_details_required
-            and not self.rn_household_employer.all().count()
-        ):
-            error_msg_list.append('rn_household_employer')
+        if self.household_details_required:
+            if has_household is None:
+                has_household = self.rn_household_employer.exists()
+            if not has_household:
+                error_msg_list.append('rn_household_employer')
 
         return error_msg_list
 
@@ -475,7 +504,50 @@ class Employer(models.Model):
 # Sponsors
 
 
-class EmployerSponsor(models.Model):
+class EmployerSponsor(EncryptedFieldsModelMixin, models.Model):
+    encrypted_fields = {
+        'sponsor_1_nric': (
+            'sponsor_1_nric_num',
+            'sponsor_1_nric_nonce',
+            'sponsor_1_nric_tag'
+        ),
+        'sponsor_1_spouse_nric': (
+            'sponsor_1_spouse_nric_num',
+            'sponsor_1_spouse_nric_nonce',
+            'sponsor_1_spouse_nric_tag'
+        ),
+        'sponsor_1_spouse_fin': (
+            'sponsor_1_spouse_fin_num',
+            'sponsor_1_spouse_fin_nonce',
+            'sponsor_1_spouse_fin_tag'
+        ),
+        'sponsor_1_spouse_passport': (
+            'sponsor_1_spouse_passport_num',
+            'sponsor_1_spouse_passport_nonce',
+            'sponsor_1_spouse_passport_tag'
+        ),
+        'sponsor_2_nric': (
+            'sponsor_2_nric_num',
+            'sponsor_2_nric_nonce',
+            'sponsor_2_nric_tag'
+        ),
+        'sponsor_2_spouse_nric': (
+            'sponsor_2_spouse_nric_num',
+            'sponsor_2_spouse_nric_nonce',
+            'sponsor_2_spouse_nric_tag'
+        ),
+        'sponsor_2_spouse_fin': (
+            'sponsor_2_spouse_fin_num',
+            'sponsor_2_spouse_fin_nonce',
+            'sponsor_2_spouse_fin_tag'
+        ),
+        'sponsor_2_spouse_passport': (
+            'sponsor_2_spouse_passport_num',
+            'sponsor_2_spouse_passport_nonce',
+            'sponsor_2_spouse_passport_tag'
+        )
+    }
+
     employer = models.OneToOneField(
         Employer,
         on_delete=models.CASCADE,
@@ -499,16 +571,18 @@ class EmployerSponsor(models.Model):
     sponsor_1_date_of_birth = models.DateField(
         verbose_name=_('Sponsor 1 date of birth')
     )
-    sponsor_1_nric_num = models.BinaryField(
+    sponsor_1_nric = EncryptedField(
         verbose_name=_('Sponsor 1 NRIC'),
-        editable=True
-    )
-    sponsor_1_nric_nonce = models.BinaryField(
-        editable=True
-    )
-    sponsor_1_nric_tag = models.BinaryField(
-        editable=True
+        blank=False
     )
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    sponsor_1_nric_num = CustomBinaryField()
+    sponsor_1_nric_nonce = CustomBinaryField()
+    sponsor_1_nric_tag = CustomBinaryField()
+
+    sponsor_1_nric_blind_index = BlindIndexField()
+
+    sponsor_1_nric_partial = PartialField()
     sponsor_1_nationality = NationalityCharField(
         verbose_name=_("Sponsor 1 nationality/citizenship")
     )
@@ -575,21 +649,33 @@ class EmployerSponsor(models.Model):
     sponsor_1_spouse_residential_status = NullableResidentialStatusCharField(
         verbose_name=_("Sponsor 1 spouse residential status")
     )
-    sponsor_1_spouse_nric_num = CustomBinaryField(
+    sponsor_1_spouse_nric = EncryptedField(
         verbose_name=_('Sponsor 1 spouse NRIC')
     )
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    sponsor_1_spouse_nric_num = CustomBinaryField()
     sponsor_1_spouse_nric_nonce = CustomBinaryField()
     sponsor_1_spouse_nric_tag = CustomBinaryField()
-    sponsor_1_spouse_fin_num = CustomBinaryField(
+
+    sponsor_1_spouse_nric_blind_index = BlindIndexField()
+    sponsor_1_spouse_fin = EncryptedField(
         verbose_name=_('Sponsor 1 spouse FIN')
     )
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    sponsor_1_spouse_fin_num = CustomBinaryField()
     sponsor_1_spouse_fin_nonce = CustomBinaryField()
     sponsor_1_spouse_fin_tag = CustomBinaryField()
-    sponsor_1_spouse_passport_num = CustomBinaryField(
+
+    sponsor_1_spouse_fin_blind_index = BlindIndexField()
+    sponsor_1_spouse_passport = EncryptedField(
         verbose_name=_('Sponsor 1 spouse passport')
     )
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    sponsor_1_spouse_passport_num = CustomBinaryField()
     sponsor_1_spouse_passport_nonce = CustomBinaryField()
     sponsor_1_spouse_passport_tag = CustomBinaryField()
+
+    sponsor_1_spouse_passport_blind_index = BlindIndexField()
     sponsor_1_spouse_passport_date = NullableDateField(
         verbose_name=_('Sponsor 1 spouse passport expiry date')
     )
@@ -621,11 +707,17 @@ class EmployerSponsor(models.Model):
     sponsor_2_date_of_birth = NullableDateField(
         verbose_name=_('Sponsor 2 date of birth')
     )
-    sponsor_2_nric_num = CustomBinaryField(
+    sponsor_2_nric = EncryptedField(
         verbose_name=_('Sponsor 2 NRIC')
     )
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    sponsor_2_nric_num = CustomBinaryField()
     sponsor_2_nric_nonce = CustomBinaryField()
     sponsor_2_nric_tag = CustomBinaryField()
+
+    sponsor_2_nric_blind_index = BlindIndexField()
+
+    sponsor_2_nric_partial = PartialField()
     sponsor_2_nationality = NullableNationalityCharField(
         verbose_name=_("Sponsor 2 nationality/citizenship")
     )
@@ -694,102 +786,66 @@ class EmployerSponsor(models.Model):
     sponsor_2_spouse_residential_status = NullableResidentialStatusCharField(
         verbose_name=_("Sponsor 2 spouse residential status")
     )
-    sponsor_2_spouse_nric_num = CustomBinaryField(
+    sponsor_2_spouse_nric = EncryptedField(
         verbose_name=_('Sponsor 2 spouse NRIC')
     )
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    sponsor_2_spouse_nric_num = CustomBinaryField()
     sponsor_2_spouse_nric_nonce = CustomBinaryField()
     sponsor_2_spouse_nric_tag = CustomBinaryField()
-    sponsor_2_spouse_fin_num = CustomBinaryField(
+
+    sponsor_2_spouse_nric_blind_index = BlindIndexField()
+    sponsor_2_spouse_fin = EncryptedField(
         verbose_name=_('Sponsor 2 spouse FIN')
     )
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    sponsor_2_spouse_fin_num = CustomBinaryField()
     sponsor_2_spouse_fin_nonce = CustomBinaryField()
     sponsor_2_spouse_fin_tag = CustomBinaryField()
-    sponsor_2_spouse_passport_num = CustomBinaryField(
+
+    sponsor_2_spouse_fin_blind_index = BlindIndexField()
+    sponsor_2_spouse_passport = EncryptedField(
         verbose_name=_('Sponsor 2 spouse passport')
     )
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    sponsor_2_spouse_passport_num = CustomBinaryField()
     sponsor_2_spouse_passport_nonce = CustomBinaryField()
     sponsor_2_spouse_passport_tag = CustomBinaryField()
+
+    sponsor_2_spouse_passport_blind_index = BlindIndexField()
     sponsor_2_spouse_passport_date = NullableDateField(
         verbose_name=_('Sponsor 2 spouse passport expiry date')
     )
 
     def get_sponsor_1_nric_full(self):
-        return decrypt_string(
-            self.sponsor_1_nric_num,
-            settings.ENCRYPTION_KEY,
-            self.sponsor_1_nric_nonce,
-            self.sponsor_1_nric_tag,
-        )
+        return self.decrypt_field('sponsor_1_nric')
 
     def get_sponsor_1_nric_partial(self, padded=True):
-        plaintext = self.get_sponsor_1_nric_full()
-        if padded:
-            return 'x' * 5 + plaintext[-4:] if plaintext else ''
-        else:
-            return plaintext[-4:] if plaintext else ''
+        return self.get_partial('sponsor_1_nric', padded)
 
     def get_sponsor_1_spouse_nric_full(self):
-        return decrypt_string(
-            self.sponsor_1_spouse_nric_num,
-            settings.ENCRYPTION_KEY,
-            self.sponsor_1_spouse_nric_nonce,
-            self.sponsor_1_spouse_nric_tag,
-        )
+        return self.decrypt_field('sponsor_1_spouse_nric')
 
     def get_sponsor_1_spouse_fin_full(self):
-        return decrypt_string(
-            self.sponsor_1_spouse_fin_num,
-            settings.ENCRYPTION_KEY,
-            self.sponsor_1_spouse_fin_nonce,
-            self.sponsor_1_spouse_fin_tag,
-        )
+        return self.decrypt_field('sponsor_1_spouse_fin')
 
     def get_sponsor_1_spouse_passport_full(self):
-        return decrypt_string(
-            self.sponsor_1_spouse_passport_num,
-            settings.ENCRYPTION_KEY,
-            self.sponsor_1_spouse_passport_nonce,
-            self.sponsor_1_spouse_passport_tag,
-        )
+        return self.decrypt_field('sponsor_1_spouse_passport')
 
     def get_sponsor_2_nric_full(self):
-        return decrypt_string(
-            self.sponsor_2_nric_num,
-            settings.ENCRYPTION_KEY,
-            self.sponsor_2_nric_nonce,
-            self.sponsor_2_nric_tag,
-        )
+        return self.decrypt_field('sponsor_2_nric')
 
     def get_sponsor_2_nric_partial(self, padded=True):
-        plaintext = self.get_sponsor_2_nric_full()
-        if padded:
-            return 'x' * 5 + plaintext[-4:] if plaintext else ''
-        else:
-            return plaintext[-4:] if plaintext else ''
+        return self.get_partial('sponsor_2_nric', padded)
 
     def get_sponsor_2_spouse_nric_full(self):
-        return decrypt_string(
-            self.sponsor_2_spouse_nric_num,
-            settings.ENCRYPTION_KEY,
-            self.sponsor_2_spouse_nric_nonce,
-            self.sponsor_2_spouse_nric_tag,
-        )
+        return self.decrypt_field('sponsor_2_spouse_nric')
 
     def get_sponsor_2_spouse_fin_full(self):
-        return decrypt_string(
-            self.sponsor_2_spouse_fin_num,
-            settings.ENCRYPTION_KEY,
-            self.sponsor_2_spouse_fin_nonce,
-            self.sponsor_2_spouse_fin_tag,
-        )
+        return self.decrypt_field('sponsor_2_spouse_fin')
 
     def get_sponsor_2_spouse_passport_full(self):
-        return decrypt_string(
-            self.sponsor_2_spouse_passport_num,
-            settings.ENCRYPTION_KEY,
-            self.sponsor_2_spouse_passport_nonce,
-            self.sponsor_2_spouse_passport_tag,
-        )
+        return self.decrypt_field('sponsor_2_spouse_passport')
 
     def get_details_missing_sponsor_2_spouse(self):
         error_msg_list = []
@@ -887,7 +943,30 @@ class EmployerSponsor(models.Model):
 # Joint Applicants
 
 
-class EmployerJointApplicant(models.Model):
+class EmployerJointApplicant(EncryptedFieldsModelMixin, models.Model):
+    encrypted_fields = {
+        'joint_applicant_nric': (
+            'joint_applicant_nric_num',
+            'joint_applicant_nric_nonce',
+            'joint_applicant_nric_tag'
+        ),
+        'joint_applicant_spouse_nric': (
+            'joint_applicant_spouse_nric_num',
+            'joint_applicant_spouse_nric_nonce',
+            'joint_applicant_spouse_nric_tag'
+        ),
+        'joint_applicant_spouse_fin': (
+            'joint_applicant_spouse_fin_num',
+            'joint_applicant_spouse_fin_nonce',
+            'joint_applicant_spouse_fin_tag'
+        ),
+        'joint_applicant_spouse_passport': (
+            'joint_applicant_spouse_passport_num',
+            'joint_applicant_spouse_passport_nonce',
+            'joint_applicant_spouse_passport_tag'
+        )
+    }
+
     employer = models.OneToOneField(
         Employer,
         on_delete=models.CASCADE,
@@ -909,16 +988,18 @@ class EmployerJointApplicant(models.Model):
     joint_applicant_date_of_birth = models.DateField(
         verbose_name=_("Joint applicant's date of birth")
     )
-    joint_applicant_nric_num = models.BinaryField(
+    joint_applicant_nric = EncryptedField(
         verbose_name=_('Joint applicant NRIC'),
-        editable=True
-    )
-    joint_applicant_nric_nonce = models.BinaryField(
-        editable=True
-    )
-    joint_applicant_nric_tag = models.BinaryField(
-        editable=True
+        blank=False
     )
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    joint_applicant_nric_num = CustomBinaryField()
+    joint_applicant_nric_nonce = CustomBinaryField()
+    joint_applicant_nric_tag = CustomBinaryField()
+
+    joint_applicant_nric_blind_index = BlindIndexField()
+
+    joint_applicant_nric_partial = PartialField()
     joint_applicant_nationality = NationalityCharField(
         verbose_name=_("Joint applicant's nationality/citizenship")
     )
@@ -972,66 +1053,51 @@ class EmployerJointApplicant(models.Model):
     joint_applicant_spouse_residential_status = NullableResidentialStatusCharField(
         verbose_name=_("Joint applicant's spouse residential status")
     )
-    joint_applicant_spouse_nric_num = models.BinaryField(
-        verbose_name=_("Joint applicant's spouse NRIC"),
-        editable=True,
-        blank=True,
-        null=True
+    joint_applicant_spouse_nric = EncryptedField(
+        verbose_name=_("Joint applicant's spouse NRIC")
     )
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    joint_applicant_spouse_nric_num = CustomBinaryField()
     joint_applicant_spouse_nric_nonce = CustomBinaryField()
     joint_applicant_spouse_nric_tag = CustomBinaryField()
-    joint_applicant_spouse_fin_num = CustomBinaryField(
+
+    joint_applicant_spouse_nric_blind_index = BlindIndexField()
+    joint_applicant_spouse_fin = EncryptedField(
         verbose_name=_("Joint applicant's spouse FIN")
     )
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    joint_applicant_spouse_fin_num = CustomBinaryField()
     joint_applicant_spouse_fin_nonce = CustomBinaryField()
     joint_applicant_spouse_fin_tag = CustomBinaryField()
-    joint_applicant_spouse_passport_num = CustomBinaryField(
+
+    joint_applicant_spouse_fin_blind_index = BlindIndexField()
+    joint_applicant_spouse_passport = EncryptedField(
         verbose_name=_("Joint applicant's spouse passport")
     )
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    joint_applicant_spouse_passport_num = CustomBinaryField()
     joint_applicant_spouse_passport_nonce = CustomBinaryField()
     joint_applicant_spouse_passport_tag = CustomBinaryField()
+
+    joint_applicant_spouse_passport_blind_index = BlindIndexField()
     joint_applicant_spouse_passport_date = NullableDateField(
         verbose_name=_("Joint applicant's spouse passport expiry date")
     )
 
     def get_joint_applicant_nric_full(self):
-        return decrypt_string(
-            self.joint_applicant_nric_num,
-            settings.ENCRYPTION_KEY,
-            self.joint_applicant_nric_nonce,
-            self.joint_applicant_nric_tag,
-        )
+        return self.decrypt_field('joint_applicant_nric')
 
     def get_joint_applicant_nric_partial(self, padded=True):
-        plaintext = self.get_joint_applicant_nric_full()
-        if padded:
-            return 'x' * 5 + plaintext[-4:] if plaintext else ''
-        else:
-            return plaintext[-4:] if plaintext else ''
+        return self.get_partial('joint_applicant_nric', padded)
 
     def get_joint_applicant_spouse_nric_full(self):
-        return decrypt_string(
-            self.joint_applicant_spouse_nric_num,
-            settings.ENCRYPTION_KEY,
-            self.joint_applicant_spouse_nric_nonce,
-            self.joint_applicant_spouse_nric_tag,
-        )
+        return self.decrypt_field('joint_applicant_spouse_nric')
 
     def get_joint_applicant_spouse_fin_full(self):
-        return decrypt_string(
-            self.joint_applicant_spouse_fin_num,
-            settings.ENCRYPTION_KEY,
-            self.joint_applicant_spouse_fin_nonce,
-            self.joint_applicant_spouse_fin_tag,
-        )
+        return self.decrypt_field('joint_applicant_spouse_fin')
 
     def get_joint_applicant_spouse_passport_full(self):
-        return decrypt_string(
-            self.joint_applicant_spouse_passport_num,
-            settings.ENCRYPTION_KEY,
-            self.joint_applicant_spouse_passport_nonce,
-            self.joint_applicant_spouse_passport_tag,
-        )
+        return self.decrypt_field('joint_applicant_spouse_passport')
 
     def get_details_missing_joint_applicant_spouse(self):
         error_msg_list = []
@@ -1050,7 +1116,7 @@ class EmployerJointApplicant(models.Model):
                     error_msg_list.append(field)
 
             if is_local(self.joint_applicant_spouse_residential_status):
-                if not self.joint_applicant_spouse_nric_full():
+                if not self.get_joint_applicant_spouse_nric_full():
                     error_msg_list.append('joint_applicant_spouse_nric_num')
             else:
                 if not self.get_joint_applicant_spouse_fin_full():
@@ -1107,7 +1173,15 @@ class EmployerIncome(models.Model):
     )
 
 
-class EmployerHousehold(models.Model):
+class EmployerHousehold(EncryptedFieldsModelMixin, models.Model):
+    encrypted_fields = {
+        'household_id': (
+            'household_id_num',
+            'household_id_nonce',
+            'household_id_tag'
+        )
+    }
+
     employer = models.ForeignKey(
         Employer,
         verbose_name=_("Name of Employer"),
@@ -1125,16 +1199,15 @@ class EmployerHousehold(models.Model):
         choices=HouseholdIdTypeChoices.choices,
         # default=HouseholdIdTypeChoices.NRIC
     )
-    household_id_num = models.BinaryField(
+    household_id = EncryptedField(
         verbose_name=_("Household member's ID number"),
-        editable=True
-    )
-    household_id_nonce = models.BinaryField(
-        editable=True
-    )
-    household_id_tag = models.BinaryField(
-        editable=True
+        blank=False
     )
+    household_id_blind_index = BlindIndexField()
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    household_id_num = CustomBinaryField()
+    household_id_nonce = CustomBinaryField()
+    household_id_tag = CustomBinaryField()
     household_date_of_birth = models.DateField(
         verbose_name=_("Household member's date of birth")
     )
@@ -1146,12 +1219,7 @@ class EmployerHousehold(models.Model):
     )
 
     def get_household_id_full(self):
-        return decrypt_string(
-            self.household_id_num,
-            settings.ENCRYPTION_KEY,
-            self.household_id_nonce,
-            self.household_id_tag,
-        )
+        return self.decrypt_field('household_id')
 
 
 class EmployerDoc(models.Model):
@@ -1289,104 +1357,45 @@ class EmployerDoc(models.Model):
         else:
             return _('Sunday')
 
-    def get_missing_case_dets_pre_signing_1(self):
-        error_msg_list = self.employer.get_details_missing_employer()
-
-        if not hasattr(self, 'rn_servicefeeschedule_ed'):
-            error_msg_list.append('rn_servicefeeschedule_ed')
-
-        if not hasattr(self, 'rn_serviceagreement_ed'):
-            error_msg_list.append('rn_serviceagreement_ed')
+    def get_readiness(self, refresh=False):
+        # Memoized, templates and views may touch several is_ready_*
+        # properties of the same case
+        if refresh or not hasattr(self, '_readiness'):
+            from .case_readiness import CaseReadiness
+            self._readiness = CaseReadiness(self)
+        return self._readiness
 
-        if hasattr(self, 'rn_docupload_ed'):
-            if not self.rn_docupload_ed.job_order_pdf:
-                error_msg_list.append('rn_docupload_ed.job_order_pdf')
-        else:
-            error_msg_list.append('rn_docupload_ed')
-
-        if not hasattr(self, 'rn_signatures_ed'):
-            error_msg_list.append('rn_signatures_ed')
-
-        if (
-            self.fdw.maid_type == TypeOfMaidChoices.NEW
-            and not hasattr(self, 'rn_safetyagreement_ed')
-        ):
-            error_msg_list.append('rn_safetyagreement_ed')
-
-        return error_msg_list
+    def get_missing_case_dets_pre_signing_1(self):
+        return list(self.get_readiness().missing_pre_signing_1)
 
     def get_missing_case_dets_pre_signing_1_5(self):
-        error_msg_list = self.get_missing_case_dets_pre_signing_1()
-
-        if not self.rn_signatures_ed.agency_staff_signature:
-            error_msg_list.append('agency_staff_signature')
-
-        return error_msg_list
+        return list(self.get_readiness().missing_pre_signing_1_5)
 
     def get_missing_case_dets_pre_signing_2(self):
-        error_msg_list = self.get_missing_case_dets_pre_signing_1_5()
-
-        if hasattr(self, 'rn_docupload_ed'):
-            if not self.rn_docupload_ed.ipa_pdf:
-                error_msg_list.append('rn_docupload_ed.ipa_pdf')
-            if not self.rn_docupload_ed.medical_report_pdf:
-                error_msg_list.append('rn_docupload_ed.medical_report_pdf')
-
-        if hasattr(self, 'rn_casestatus_ed'):
-            if not self.rn_casestatus_ed.fdw_work_commencement_date:
-                error_msg_list.append(
-                    'rn_casestatus_ed.fdw_work_commencement_date'
-                )
-        else:
-            error_msg_list.append('rn_casestatus_ed')
-
-        if not self.rn_maid_inventory.all().count():
-            error_msg_list.append('rn_maid_inventory')
-
-        if not self.fdw.get_passport_number():
-            error_msg_list.append('fdw.passport_number')
-
-        if not self.fdw.get_fdw_fin_full():
-            error_msg_list.append('fdw.fin_number')
-
-        return error_msg_list
+        return list(self.get_readiness().missing_pre_signing_2)
 
     def get_stage(self):
-        if self.rn_signatures_ed.employer_signature_1:
+        if self.rn_signatures_ed.is_signed('employer_signature_1'):
             return 1
-        elif self.rn_signatures_ed.employer_signature_2:
+        elif self.rn_signatures_ed.is_signed('employer_signature_2'):
             return 2
         else:
             return 0
 
-    def set_archive(self):
-        if not self.is_archived_doc():
-            archived_agency_details = ArchivedAgencyDetails.objects.create(
-                agency_name=self.employer.agency_employee.agency.name,
-                agency_license_no=self.employer.agency_employee.agency.license_number,
-                agency_address_line_1=self.employer.agency_employee.agency.get_main_branch().address_1,
-                agency_address_line_2=self.employer.agency_employee.agency.get_main_branch().address_2,
-                agency_postal_code=self.employer.agency_employee.agency.get_main_branch().postal_code,
-                agency_employee_name=self.employer.agency_employee.name,
-                agency_employee_ea_personnel_number=self.employer.agency_employee.ea_personnel_number,
-                agency_employee_branch=self.employer.agency_employee.branch.name
-            )
-            archived_maid = ArchivedMaid.objects.create(
-                name=self.fdw.name,
-                nationality=self.fdw.get_country_of_origin_display(),
-                passport_number=self.fdw.passport_number,
-                passport_number_nonce=self.fdw.passport_number_nonce,
-                passport_number_tag=self.fdw.passport_number_tag,
-                fin_number=self.fdw.fin_number,
-                fin_number_nonce=self.fdw.fin_number_nonce,
-                fin_number_tag=self.fdw.fin_number_tag
-            )
-
-            self.archived_agency_details = archived_agency_details
-            self.archived_maid = archived_maid
-
-            self.status = CaseStatusChoices.ARCHIVED
-            self.save()
+    def set_archive(self, site_url=None):
+        # site_url, e.g. request.build_absolute_uri('/'), is needed to render
+        # the case's PDF snapshot
+        if not self.is_archived_doc:
+            from .case_archiving import archive_case_batch
+            archive_case_batch([self.pk])
+            self.refresh_from_db(fields=[
+                'status',
+                'archived_agency_details',
+                'archived_maid',
+            ])
+            if site_url:
+                from .case_snapshots import create_case_snapshot
+                create_case_snapshot(self, site_url)
 
     def set_increment_version_number(self):
         self.rn_signatures_ed.set_erase_signatures()
@@ -1439,18 +1448,26 @@ class EmployerDoc(models.Model):
 
     @property
     def is_ready_for_ea_to_sign(self):
-        return True if self.get_missing_case_dets_pre_signing_1() else False
+        return self.get_readiness().is_ready_for_ea_to_sign
 
     @property
     def is_ready_for_emp_to_sign(self):
-        return True if self.get_missing_case_dets_pre_signing_1_5() else False
+        return self.get_readiness().is_ready_for_emp_to_sign
 
     @property
     def is_ready_for_handover(self):
-        return True if self.get_missing_case_dets_pre_signing_2() else False
+        return self.get_readiness().is_ready_for_handover
 
 
-class DocServiceFeeSchedule(models.Model):
+class DocServiceFeeSchedule(EncryptedFieldsModelMixin, models.Model):
+    encrypted_fields = {
+        'fdw_replaced_passport': (
+            'fdw_replaced_passport_num',
+            'fdw_replaced_passport_nonce',
+            'fdw_replaced_passport_tag'
+        )
+    }
+
     employer_doc = models.OneToOneField(
         EmployerDoc,
         on_delete=models.CASCADE,
@@ -1468,9 +1485,11 @@ class DocServiceFeeSchedule(models.Model):
         verbose_name=_("Name of FDW Replaced"),
         max_length=50
     )
-    fdw_replaced_passport_num = CustomBinaryField(
+    fdw_replaced_passport = EncryptedField(
         verbose_name=_('Passport No. of FDW Replaced')
     )
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    fdw_replaced_passport_num = CustomBinaryField()
     fdw_replaced_passport_nonce = CustomBinaryField()
     fdw_replaced_passport_tag = CustomBinaryField()
     b4_loan_transferred = CustomMoneyDecimalField(
@@ -1619,21 +1638,11 @@ class DocServiceFeeSchedule(models.Model):
         return balance
 
     def get_fdw_replaced_passport_full(self):
-        return decrypt_string(
-            self.fdw_replaced_passport_num,
-            settings.ENCRYPTION_KEY,
-            self.fdw_replaced_passport_nonce,
-            self.fdw_replaced_passport_tag,
-        )
+        return self.decrypt_field('fdw_replaced_passport')
 
     def get_receipt_no(self):
-        receipt_master = ReceiptMaster()
-        running_receipt_no = receipt_master.get_running_number()
-        receipt_master.set_increment_running_number()
-        month = datetime.now().strftime('%m')
-        year = datetime.now().strftime('%Y')
-        invoice_number = f'{running_receipt_no}/{month}/{year}'
-        return invoice_number
+        from .receipts import allocate_receipt_numbers, format_receipt_number
+        return format_receipt_number(allocate_receipt_numbers()[0])
 
     def set_invoice(self, invoice_type):
         if invoice_type == 'Deposit':
@@ -1930,6 +1939,17 @@ class MaidInventory(models.Model):
 
 
 class CaseSignature(models.Model):
+    SIGNATURE_NAMES = [
+        'employer_signature_1',
+        'employer_signature_2',
+        'fdw_signature',
+        'agency_staff_signature',
+        'employer_spouse_signature',
+        'sponsor_1_signature',
+        'sponsor_2_signature',
+        'joint_applicant_signature',
+    ]
+
     employer_doc = models.OneToOneField(
         EmployerDoc,
         on_delete=models.CASCADE,
@@ -1937,69 +1957,210 @@ class CaseSignature(models.Model):
     )
 
     # Mandatory signatures
-    employer_signature_1 = models.TextField(
+    employer_signature_1 = SignatureDescriptor(
         # For docs excluding handover checklist
+        verbose_name=_('Employer Signature')
+    )
+    employer_signature_2 = SignatureDescriptor(
+        # For handover checklist
+        verbose_name=_('Employer Signature')
+    )
+    fdw_signature = SignatureDescriptor(
+        verbose_name=_('FDW Signature')
+    )
+    agency_staff_signature = SignatureDescriptor(
+        verbose_name=_('Agency Staff Member Signature')
+    )
+
+    # Optional signatures
+    employer_spouse_signature = SignatureDescriptor(
+        verbose_name=_('Employer Spouse Signature')
+    )
+    sponsor_1_signature = SignatureDescriptor(
+        verbose_name=_('Sponsor 1 Signature')
+    )
+    sponsor_2_signature = SignatureDescriptor(
+        verbose_name=_('Sponsor 2 Signature')
+    )
+    joint_applicant_signature = SignatureDescriptor(
+        verbose_name=_('Joint Applicant Signature')
+    )
+
+    # When each signature was made, empty while it is not signed
+    employer_signature_1_signed_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False
+    )
+    employer_signature_2_signed_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False
+    )
+    fdw_signature_signed_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False
+    )
+    agency_staff_signature_signed_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False
+    )
+    employer_spouse_signature_signed_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False
+    )
+    sponsor_1_signature_signed_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False
+    )
+    sponsor_2_signature_signed_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False
+    )
+    joint_applicant_signature_signed_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False
+    )
+
+    # Base64 signatures stored before CaseSignatureImage, on their original
+    # columns. Emptied by the move_case_signatures command, drop them once it
+    # has run everywhere.
+    legacy_employer_signature_1 = models.TextField(
+        db_column='employer_signature_1',
         verbose_name=_('Employer Signature'),
         blank=True,
         null=True
     )
-    employer_signature_2 = models.TextField(
-        # For handover checklist
+    legacy_employer_signature_2 = models.TextField(
+        db_column='employer_signature_2',
         verbose_name=_('Employer Signature'),
         blank=True,
         null=True
     )
-    fdw_signature = models.TextField(
+    legacy_fdw_signature = models.TextField(
+        db_column='fdw_signature',
         verbose_name=_('FDW Signature'),
         blank=True,
         null=True
     )
-    agency_staff_signature = models.TextField(
+    legacy_agency_staff_signature = models.TextField(
+        db_column='agency_staff_signature',
         verbose_name=_('Agency Staff Member Signature'),
         blank=True,
         null=True
     )
-
-    # Optional signatures
-    employer_spouse_signature = models.TextField(
+    legacy_employer_spouse_signature = models.TextField(
+        db_column='employer_spouse_signature',
         verbose_name=_('Employer Spouse Signature'),
         blank=True,
         null=True
     )
-    sponsor_1_signature = models.TextField(
+    legacy_sponsor_1_signature = models.TextField(
+        db_column='sponsor_1_signature',
         verbose_name=_('Sponsor 1 Signature'),
         blank=True,
         null=True
     )
-    sponsor_2_signature = models.TextField(
+    legacy_sponsor_2_signature = models.TextField(
+        db_column='sponsor_2_signature',
         verbose_name=_('Sponsor 2 Signature'),
         blank=True,
         null=True
     )
-    joint_applicant_signature = models.TextField(
+    legacy_joint_applicant_signature = models.TextField(
+        db_column='joint_applicant_signature',
         verbose_name=_('Joint Applicant Signature'),
         blank=True,
         null=True
     )
 
+    def save(self, *args, **kwargs):
+        pending = self.__dict__.get('_pending_signatures', {})
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            for name, signature in pending.items():
+                if signature:
+                    content_type, image = signature
+                    CaseSignatureImage.objects.update_or_create(
+                        case_signature=self,
+                        name=name,
+                        defaults={
+                            'content_type': content_type,
+                            'image': image
+                        }
+                    )
+                else:
+                    self.images.filter(name=name).delete()
+        self.__dict__.pop('_pending_signatures', None)
+        # Loaded again on the next read
+        self.__dict__.pop('_signature_data_urls', None)
+
+    def get_signature_data_urls(self):
+        if '_signature_data_urls' not in self.__dict__:
+            self._signature_data_urls = {
+                name: signature_to_data_url(content_type, bytes(image))
+                for name, content_type, image in self.images.values_list(
+                    'name',
+                    'content_type',
+                    'image'
+                )
+            }
+        return self._signature_data_urls
+
+    def is_signed(self, name):
+        # Signatures not moved by move_case_signatures yet have no signed_at
+        return bool(
+            getattr(self, f'{name}_signed_at')
+            or getattr(self, f'legacy_{name}')
+        )
+
     def get_employer_signature(self):
-        if self.employer_signature_2:
+        if self.is_signed('employer_signature_2'):
             return self.employer_signature_2
         else:
             return self.employer_signature_1
 
     def set_erase_signatures(self):
-        self.employer_signature_1 = None if self.employer_signature_1 else self.employer_signature_1
-        self.fdw_signature = None if self.fdw_signature else self.fdw_signature
-        self.agency_staff_signature = None if self.agency_staff_signature else self.agency_staff_signature
-        self.employer_spouse_signature = None if self.employer_spouse_signature else self.employer_spouse_signature
-        self.sponsor_1_signature = None if self.sponsor_1_signature else self.sponsor_1_signature
-        self.sponsor_2_signature = None if self.sponsor_2_signature else self.sponsor_2_signature
-        self.joint_applicant_signature = None if self.joint_applicant_signature else self.joint_applicant_signature
+        self.employer_signature_1 = None
+        self.fdw_signature = None
+        self.agency_staff_signature = None
+        self.employer_spouse_signature = None
+        self.sponsor_1_signature = None
+        self.sponsor_2_signature = None
+        self.joint_applicant_signature = None
         self.save()
         self.employer_doc.set_status_wait_ea_sign()
 
 
+class CaseSignatureImage(models.Model):
+    case_signature = models.ForeignKey(
+        CaseSignature,
+        on_delete=models.CASCADE,
+        related_name='images'
+    )
+    name = models.CharField(
+        verbose_name=_('Signature'),
+        max_length=30,
+        choices=[
+            (name, name) for name in CaseSignature.SIGNATURE_NAMES
+        ]
+    )
+    content_type = models.CharField(
+        max_length=30,
+        default='image/png'
+    )
+    image = models.BinaryField()
+
+    class Meta:
+        unique_together = [['case_signature', 'name']]
+
+
 class CaseStatus(models.Model):
     employer_doc = models.OneToOneField(
         EmployerDoc,
@@ -2068,7 +2229,20 @@ class ArchivedAgencyDetails(models.Model):
     )
 
 
-class ArchivedMaid(models.Model):
+class ArchivedMaid(EncryptedFieldsModelMixin, models.Model):
+    encrypted_fields = {
+        'passport_number': (
+            'passport_number_num',
+            'passport_number_nonce',
+            'passport_number_tag'
+        ),
+        'fin_number': (
+            'fin_number_num',
+            'fin_number_nonce',
+            'fin_number_tag'
+        )
+    }
+
     name = models.CharField(
         verbose_name=_('Name'),
         max_length=255
@@ -2079,32 +2253,27 @@ class ArchivedMaid(models.Model):
         max_length=255
     )
 
-    passport_number = models.BinaryField(
-        editable=True,
-        blank=True
+    # Copied packed from the maid, never decrypted when archiving
+    passport_number = EncryptedField(
+        db_column='passport_number_packed'
     )
-
-    passport_number_nonce = models.BinaryField(
-        editable=True,
-        blank=True
+    fin_number = EncryptedField(
+        db_column='fin_number_packed'
     )
-
-    passport_number_tag = models.BinaryField(
-        editable=True,
-        blank=True
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    passport_number_num = CustomBinaryField(
+        db_column='passport_number'
     )
-
-    fin_number = models.BinaryField(
-        editable=True,
-        blank=True
+    passport_number_nonce = CustomBinaryField()
+    passport_number_tag = CustomBinaryField()
+    fin_number_num = CustomBinaryField(
+        db_column='fin_number'
     )
+    fin_number_nonce = CustomBinaryField()
+    fin_number_tag = CustomBinaryField()
 
-    fin_number_nonce = models.BinaryField(
-        editable=True,
-        blank=True
-    )
+    def get_passport_number(self):
+        return self.decrypt_field('passport_number')
 
-    fin_number_tag = models.BinaryField(
-        editable=True,
-        blank=True
-    )
+    def get_fin_number(self):
+        return self.decrypt_field('fin_number')
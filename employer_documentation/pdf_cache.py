@@ -0,0 +1,150 @@
+import hashlib
+import io
+import os
+import tempfile
+import threading
+
+from django.conf import settings
+
+from .pdf_rendering import PDF_STYLESHEET, find_pdf_stylesheet, render_pdf
+
+_stylesheet_fingerprints = {}
+
+# Bytes this process has stored since it last swept the cache
+_bytes_since_eviction = 0
+_eviction_lock = threading.Lock()
+_cache_dir_ready = False
+
+
+def get_stylesheet_fingerprint():
+    # Part of every key so that a deploy with a changed pdf.css never serves
+    # PDFs rendered with the old stylesheet
+    path = find_pdf_stylesheet()
+    if not path:
+        return settings.STATIC_URL + PDF_STYLESHEET
+    stamp = (path, os.stat(path).st_mtime)
+    if stamp not in _stylesheet_fingerprints:
+        with open(path, 'rb') as f:
+            _stylesheet_fingerprints.clear()
+            _stylesheet_fingerprints[stamp] = hashlib.sha256(
+                f.read()
+            ).hexdigest()
+    return _stylesheet_fingerprints[stamp]
+
+
+def get_pdf_cache_key(html_string, base_url):
+    # The rendered HTML already carries the case version and every related
+    # field and signature the PDF shows, so hashing it addresses the PDF by
+    # its content without having to track which rows it was built from
+    digest = hashlib.sha256()
+    for part in [get_stylesheet_fingerprint(), base_url, html_string]:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def get_pdf_cache_path(key):
+    return os.path.join(settings.PDF_CACHE_DIR, key[:2], f'{key}.pdf')
+
+
+def ensure_pdf_cache_dir():
+    # The cached PDFs hold personal data, only the application user may read
+    # them. A directory that was created with looser permissions is fixed.
+    global _cache_dir_ready
+    if not _cache_dir_ready:
+        os.makedirs(settings.PDF_CACHE_DIR, mode=0o700, exist_ok=True)
+        os.chmod(settings.PDF_CACHE_DIR, 0o700)
+        _cache_dir_ready = True
+
+
+def open_cached_pdf(key):
+    try:
+        pdf_file = open(get_pdf_cache_path(key), 'rb')
+    except FileNotFoundError:
+        return None
+    # The modified time doubles as the last used time for LRU eviction
+    try:
+        os.utime(pdf_file.fileno())
+    except OSError:
+        pass
+    return pdf_file
+
+
+def store_pdf(key, pdf_bytes):
+    global _bytes_since_eviction
+    ensure_pdf_cache_dir()
+    path = get_pdf_cache_path(key)
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    # Written next to the final path and moved in place, readers never see a
+    # partially written file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(pdf_bytes)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+    # Sweeping walks the whole cache, so it only happens every
+    # PDF_CACHE_EVICT_EVERY_BYTES written rather than on every store
+    with _eviction_lock:
+        _bytes_since_eviction += len(pdf_bytes)
+        if _bytes_since_eviction < settings.PDF_CACHE_EVICT_EVERY_BYTES:
+            return
+        _bytes_since_eviction = 0
+    evict_pdf_cache()
+
+
+def evict_pdf_cache(max_bytes=None):
+    """
+    Deletes the least recently used PDFs until the cache fits in max_bytes,
+    PDF_CACHE_MAX_BYTES by default.
+    """
+    if max_bytes is None:
+        max_bytes = settings.PDF_CACHE_MAX_BYTES
+
+    entries = []
+    total_bytes = 0
+    for dirpath, dirnames, filenames in os.walk(settings.PDF_CACHE_DIR):
+        for filename in filenames:
+            if not filename.endswith('.pdf'):
+                continue
+            path = os.path.join(dirpath, filename)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_bytes += stat.st_size
+
+    if total_bytes <= max_bytes:
+        return
+
+    entries.sort()
+    for mtime, size, path in entries:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        total_bytes -= size
+        if total_bytes <= max_bytes:
+            break
+
+
+def get_or_render_pdf(html_string, base_url):
+    """
+    Returns an open file of the PDF for the given HTML, rendering and storing
+    it first if it is not cached yet.
+    """
+    key = get_pdf_cache_key(html_string, base_url)
+    pdf_file = open_cached_pdf(key)
+    if pdf_file is None:
+        pdf_bytes = render_pdf(html_string, base_url)
+        store_pdf(key, pdf_bytes)
+        try:
+            pdf_file = open(get_pdf_cache_path(key), 'rb')
+        except FileNotFoundError:
+            # Evicted straight away, only when it is larger than the cache
+            pdf_file = io.BytesIO(pdf_bytes)
+    return pdf_file
@@ -0,0 +1,244 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.template.loader import render_to_string
+
+# Case documents rendered from HTML, with the filename they are served under
+# and whether they need the repayment table in their context
+CASE_DOCUMENT_TEMPLATES = [
+    ('pdf/01-service-fee-schedule.html', 'service_fee_schedule.pdf', False),
+    ('pdf/03-service-agreement.html', 'service_agreement.pdf', False),
+    ('pdf/04-employment-contract.html', 'employment-contract.pdf', False),
+    ('pdf/05-repayment-schedule.html', 'repayment-schedule.pdf', True),
+    ('pdf/06-rest-day-agreement.html', 'rest-day-agreement.pdf', False),
+    ('pdf/08-handover-checklist.html', 'handover-checklist.pdf', False),
+    ('pdf/09-transfer-consent.html', 'transfer-consent.pdf', False),
+    (
+        'pdf/10-work-pass-authorisation.html',
+        'work-pass-authorisation.pdf',
+        False
+    ),
+    (
+        'pdf/13-income-tax-declaration.html',
+        'income-tax-declaration.pdf',
+        False
+    ),
+    ('pdf/14-safety-agreement.html', 'safety-agreement.pdf', False),
+    ('pdf/deposit-invoice.html', 'deposit-invoice.pdf', False),
+]
+
+
+class PdfRenderQueueFull(Exception):
+    pass
+
+
+class PdfRenderTimeout(Exception):
+    pass
+
+
+PDF_STYLESHEET = 'css/pdf.css'
+
+_pdf_context = None
+_executor = None
+_executor_lock = threading.Lock()
+_queue_slots = threading.BoundedSemaphore(settings.PDF_RENDER_QUEUE_SIZE)
+
+
+def find_pdf_stylesheet():
+    # Local copy of the stylesheet, so that it is never fetched over HTTP
+    # (a round trip to S3 when USE_S3 is on)
+    path = finders.find(PDF_STYLESHEET)
+    if not path and getattr(settings, 'STATIC_ROOT', None):
+        path = os.path.join(settings.STATIC_ROOT, PDF_STYLESHEET)
+    if path and os.path.isfile(path):
+        return path
+    return None
+
+
+class PdfRenderingContext:
+    """
+    WeasyPrint state shared by every render of a process.
+
+    pdf.css is parsed once and the fonts it declares are loaded once into a
+    single FontConfiguration, instead of both happening for each document.
+    """
+
+    def __init__(self):
+        from weasyprint import CSS
+        from weasyprint.fonts import FontConfiguration
+
+        self.font_config = FontConfiguration()
+        self.stylesheet_path = find_pdf_stylesheet()
+        if self.stylesheet_path:
+            self.stylesheet_mtime = os.stat(self.stylesheet_path).st_mtime
+            stylesheet = CSS(
+                filename=self.stylesheet_path,
+                font_config=self.font_config
+            )
+        else:
+            self.stylesheet_mtime = None
+            stylesheet = CSS(
+                url=settings.STATIC_URL + PDF_STYLESHEET,
+                font_config=self.font_config
+            )
+        self.stylesheets = [stylesheet]
+
+    def is_stale(self):
+        if not self.stylesheet_path:
+            return False
+        try:
+            return (
+                os.stat(self.stylesheet_path).st_mtime != self.stylesheet_mtime
+            )
+        except FileNotFoundError:
+            return True
+
+    def write_pdf(self, html_string, base_url):
+        from weasyprint import HTML
+        return HTML(
+            string=html_string,
+            base_url=base_url
+        ).write_pdf(
+            stylesheets=self.stylesheets,
+            font_config=self.font_config
+        )
+
+
+def get_pdf_context():
+    # A changed pdf.css on disk is picked up on the next render
+    global _pdf_context
+    if _pdf_context is None or _pdf_context.is_stale():
+        _pdf_context = PdfRenderingContext()
+    return _pdf_context
+
+
+def write_pdf(html_string, base_url):
+    # Runs inside the pool worker processes
+    return get_pdf_context().write_pdf(html_string, base_url)
+
+
+def get_executor():
+    # Created lazily so that every web worker process gets its own pool after
+    # the application server has forked it
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PDF_RENDER_WORKERS,
+                initializer=get_pdf_context
+            )
+        return _executor
+
+
+def reset_executor(broken_executor):
+    global _executor
+    with _executor_lock:
+        if _executor is broken_executor:
+            _executor = None
+    broken_executor.shutdown(wait=False)
+
+
+def submit_render(html_string, base_url):
+    """
+    Queues a render on the pool and returns its Future.
+
+    At most PDF_RENDER_QUEUE_SIZE renders are queued or running per process,
+    raises PdfRenderQueueFull when no slot frees up within
+    PDF_RENDER_QUEUE_TIMEOUT seconds.
+    """
+    if not _queue_slots.acquire(timeout=settings.PDF_RENDER_QUEUE_TIMEOUT):
+        raise PdfRenderQueueFull(
+            'Too many PDF documents are being generated, please try again'
+        )
+
+    executor = get_executor()
+    try:
+        future = executor.submit(write_pdf, html_string, base_url)
+    except BrokenProcessPool:
+        reset_executor(executor)
+        try:
+            future = get_executor().submit(write_pdf, html_string, base_url)
+        except Exception:
+            _queue_slots.release()
+            raise
+    except Exception:
+        _queue_slots.release()
+        raise
+
+    future.add_done_callback(lambda f: _queue_slots.release())
+    return future
+
+
+def get_render_result(future):
+    """
+    PDF bytes of a queued render. Raises PdfRenderTimeout when it does not
+    finish within PDF_RENDER_TIMEOUT seconds, after cancelling it if it has
+    not started yet.
+    """
+    try:
+        return future.result(timeout=settings.PDF_RENDER_TIMEOUT)
+    except TimeoutError:
+        future.cancel()
+        raise PdfRenderTimeout(
+            'The PDF document took too long to generate, please try again'
+        )
+
+
+def render_pdf(html_string, base_url):
+    return get_render_result(submit_render(html_string, base_url))
+
+
+def iter_case_document_html(employer_doc, template_names=None):
+    """
+    Renders the HTML of every HTML based document of a case, yielding its
+    template name, filename and HTML in CASE_DOCUMENT_TEMPLATES order.
+    """
+    from .mixins import CaseDocumentContextMixin
+
+    context_builder = CaseDocumentContextMixin(employer_doc)
+    context = context_builder.get_context_data()
+    repayment_table = None
+
+    for template_name, filename, use_repayment_table in (
+        CASE_DOCUMENT_TEMPLATES
+    ):
+        if template_names and template_name not in template_names:
+            continue
+        template_context = dict(context)
+        if use_repayment_table:
+            if repayment_table is None:
+                repayment_table = context_builder.calc_repayment_schedule()
+            template_context['repayment_table'] = repayment_table
+        yield (
+            template_name,
+            filename,
+            render_to_string(template_name, template_context)
+        )
+
+
+def render_case_documents(employer_doc, base_url, template_names=None):
+    """
+    Renders every HTML based document of a case in parallel.
+
+    Returns a dict of filename to PDF bytes, in CASE_DOCUMENT_TEMPLATES order.
+    """
+    futures = {}
+    try:
+        for template_name, filename, html_string in iter_case_document_html(
+            employer_doc,
+            template_names
+        ):
+            futures[filename] = submit_render(html_string, base_url)
+
+        return {
+            filename: get_render_result(future)
+            for filename, future in futures.items()
+        }
+    finally:
+        # Renders still queued when one fails are not needed any more
+        for future in futures.values():
+            future.cancel()
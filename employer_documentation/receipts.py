@@ -0,0 +1,91 @@
+import os
+import threading
+from datetime import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import DocServiceFeeSchedule, ReceiptMaster
+
+
+class ReceiptNumberAllocator:
+    """
+    Hands out receipt running numbers from blocks reserved on ReceiptMaster.
+
+    Each process reserves block_size numbers at a time, so the counter row is
+    only updated once per block instead of once per receipt. Numbers are
+    unique across workers, but are not in issue order between workers.
+    Numbers left in a block when a process exits are never used.
+    """
+
+    def __init__(self, block_size):
+        self.block_size = block_size
+        self.lock = threading.Lock()
+        self.pid = None
+        self.next_number = 0
+        self.end = 0
+
+    def allocate(self, count=1):
+        with self.lock:
+            # A block reserved before the application server forked would
+            # be shared by every worker
+            if self.pid != os.getpid():
+                self.pid = os.getpid()
+                self.next_number = self.end = 0
+
+            numbers = list(range(
+                self.next_number,
+                min(self.next_number + count, self.end)
+            ))
+            missing = count - len(numbers)
+            if missing:
+                # Bulk allocations larger than a block get their own range
+                reserved = max(missing, self.block_size)
+                start = ReceiptMaster.reserve_running_numbers(reserved)
+                numbers += list(range(start, start + missing))
+                self.next_number = start + missing
+                self.end = start + reserved
+            else:
+                self.next_number += count
+            return numbers
+
+
+_allocator = ReceiptNumberAllocator(settings.RECEIPT_NUMBER_BLOCK_SIZE)
+
+
+def allocate_receipt_numbers(count=1):
+    """
+    Returns count unique receipt running numbers.
+
+    Inside a transaction the numbers are reserved directly, without a block.
+    A rollback releases them again, and a block kept by the process could
+    then be handed out twice.
+    """
+    if transaction.get_connection().in_atomic_block:
+        start = ReceiptMaster.reserve_running_numbers(count)
+        return list(range(start, start + count))
+    return _allocator.allocate(count)
+
+
+def format_receipt_number(running_number, date=None):
+    date = date or datetime.now()
+    return f'{running_number}/{date.strftime("%m")}/{date.strftime("%Y")}'
+
+
+def set_deposit_invoices(service_fee_schedules):
+    """
+    Bulk version of DocServiceFeeSchedule.set_deposit_invoice, numbers the
+    deposit receipts of many cases with one allocation and one UPDATE.
+    """
+    service_fee_schedules = list(service_fee_schedules)
+    now = timezone.now()
+    numbers = allocate_receipt_numbers(len(service_fee_schedules))
+    for schedule, number in zip(service_fee_schedules, numbers):
+        schedule.ca_deposit_date = now
+        schedule.ca_deposit_receipt_no = format_receipt_number(number)
+    DocServiceFeeSchedule.objects.bulk_update(
+        service_fee_schedules,
+        ['ca_deposit_date', 'ca_deposit_receipt_no']
+    )
+    return service_fee_schedules
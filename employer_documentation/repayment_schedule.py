@@ -0,0 +1,216 @@
+import threading
+from collections import OrderedDict
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+
+from .constants import NUMBER_OF_WORK_DAYS_IN_MONTH
+
+REPAYMENT_SCHEDULE_MONTHS = 24
+
+# Assumed number of potential off days in a month when the work commencement
+# date is not known yet
+DEFAULT_POTENTIAL_OFF_DAYS = 4
+
+SCHEDULE_CACHE_SIZE = 1024
+
+_schedule_cache = OrderedDict()
+_schedule_cache_lock = threading.Lock()
+
+
+def get_schedule_key(employer_doc):
+    case_status = getattr(employer_doc, 'rn_casestatus_ed', None)
+    return (
+        employer_doc.fdw_salary,
+        employer_doc.fdw_loan,
+        employer_doc.fdw_monthly_loan_repayment,
+        employer_doc.fdw_off_days,
+        int(employer_doc.fdw_off_day_of_week),
+        case_status.fdw_work_commencement_date if case_status else None
+    )
+
+
+def to_cents(amount):
+    return int(
+        Decimal(amount).quantize(Decimal('.01'), rounding=ROUND_HALF_UP) * 100
+    )
+
+
+def from_cents(cents):
+    return Decimal(int(cents)).scaleb(-2)
+
+
+def get_payment_dates(commencement_dates):
+    """
+    Payment dates of every case, one row per case with the commencement date
+    followed by REPAYMENT_SCHEDULE_MONTHS monthly payment dates. The payment
+    day is the commencement day, capped at the last day of shorter months.
+    """
+    commencement_dates = np.array(commencement_dates, dtype='datetime64[D]')
+    first_months = commencement_dates.astype('datetime64[M]')
+    days = (commencement_dates - first_months.astype('datetime64[D]')) + 1
+
+    months = first_months[:, None] + np.arange(REPAYMENT_SCHEDULE_MONTHS + 1)
+    month_starts = months.astype('datetime64[D]')
+    days_in_month = (
+        (months + 1).astype('datetime64[D]') - month_starts
+    ).astype(int)
+    payment_days = np.minimum(days.astype(int)[:, None], days_in_month)
+    return month_starts + (payment_days - 1)
+
+
+def count_off_days(payment_dates, off_days_of_week):
+    """
+    Number of off day weekdays after each payment date, up to and including
+    the next one. Counted per distinct weekday with numpy.busday_count.
+    """
+    potential_off_days = np.empty(
+        (len(payment_dates), REPAYMENT_SCHEDULE_MONTHS),
+        dtype=int
+    )
+    off_days_of_week = np.asarray(off_days_of_week)
+    for weekday in np.unique(off_days_of_week):
+        rows = off_days_of_week == weekday
+        weekmask = [day == weekday for day in range(7)]
+        potential_off_days[rows] = np.busday_count(
+            payment_dates[rows, :-1] + 1,
+            payment_dates[rows, 1:] + 1,
+            weekmask=weekmask
+        )
+    return potential_off_days
+
+
+def compute_schedules(keys):
+    """
+    Computes the repayment schedules of many cases in one batch, all money is
+    handled as integer cents so the results are exact.
+    """
+    count = len(keys)
+    salary = np.array([to_cents(key[0]) for key in keys], dtype=np.int64)
+    loan = np.array([to_cents(key[1]) for key in keys], dtype=np.int64)
+    monthly_repayment = np.array(
+        [to_cents(key[2]) for key in keys],
+        dtype=np.int64
+    )
+    off_days = np.array([key[3] for key in keys], dtype=np.int64)
+    per_off_day_compensation = np.array(
+        [
+            to_cents(Decimal(key[0] / NUMBER_OF_WORK_DAYS_IN_MONTH))
+            for key in keys
+        ],
+        dtype=np.int64
+    )
+
+    # Off days, only cases with a commencement date have real dates
+    potential_off_days = np.full(
+        (count, REPAYMENT_SCHEDULE_MONTHS),
+        DEFAULT_POTENTIAL_OFF_DAYS,
+        dtype=np.int64
+    )
+    salary_dates = [[''] * REPAYMENT_SCHEDULE_MONTHS for i in range(count)]
+    dated_rows = [i for i, key in enumerate(keys) if key[5]]
+    if dated_rows:
+        payment_dates = get_payment_dates([keys[i][5] for i in dated_rows])
+        potential_off_days[dated_rows] = count_off_days(
+            payment_dates,
+            [keys[i][4] for i in dated_rows]
+        )
+        for row, dates in zip(dated_rows, payment_dates[:, 1:].tolist()):
+            salary_dates[row] = [d.strftime('%d/%m/%Y') for d in dates]
+
+    off_day_compensation = (
+        per_off_day_compensation[:, None]
+        * (potential_off_days - off_days[:, None])
+    )
+    total_salary = salary[:, None] + off_day_compensation
+
+    # The monthly repayment is fixed and capped by the salary, so the amount
+    # repaid in month i is that repayment capped by the balance left after
+    # the previous i months
+    repayment = np.maximum(np.minimum(monthly_repayment, salary), 0)
+    repaid_before = repayment[:, None] * np.arange(REPAYMENT_SCHEDULE_MONTHS)
+    loan_repaid = np.clip(
+        loan[:, None] - repaid_before,
+        0,
+        repayment[:, None]
+    )
+    salary_received = total_salary - loan_repaid
+
+    return [
+        (
+            salary[i],
+            salary_dates[i],
+            off_day_compensation[i].tolist(),
+            total_salary[i].tolist(),
+            loan_repaid[i].tolist(),
+            salary_received[i].tolist()
+        )
+        for i in range(count)
+    ]
+
+
+def to_repayment_table(schedule):
+    salary, salary_dates, compensation, total, repaid, received = schedule
+    basic_salary = from_cents(salary)
+    return {
+        month + 1: {
+            'salary_date': salary_dates[month],
+            'basic_salary': basic_salary,
+            'off_day_compensation': from_cents(compensation[month]),
+            'total_salary': from_cents(total[month]),
+            'loan_repaid': from_cents(repaid[month]),
+            'salary_received': from_cents(received[month]),
+        }
+        for month in range(REPAYMENT_SCHEDULE_MONTHS)
+    }
+
+
+def copy_repayment_table(repayment_table):
+    # Cached tables are shared, callers get their own copy to modify
+    return {month: dict(row) for month, row in repayment_table.items()}
+
+
+def get_schedules_for_keys(keys):
+    schedules = {}
+    with _schedule_cache_lock:
+        for key in keys:
+            if key in _schedule_cache:
+                _schedule_cache.move_to_end(key)
+                schedules[key] = _schedule_cache[key]
+
+    missing_keys = list(set(keys) - set(schedules))
+    if missing_keys:
+        computed = compute_schedules(missing_keys)
+        with _schedule_cache_lock:
+            for key, schedule in zip(missing_keys, computed):
+                schedules[key] = to_repayment_table(schedule)
+                _schedule_cache[key] = schedules[key]
+            while len(_schedule_cache) > SCHEDULE_CACHE_SIZE:
+                _schedule_cache.popitem(last=False)
+    return schedules
+
+
+def get_repayment_schedule(employer_doc):
+    """
+    Repayment table of a case, a dict of month number (1 to 24) to that
+    month's salary date, salary, off day compensation and loan repayment.
+    """
+    key = get_schedule_key(employer_doc)
+    return copy_repayment_table(get_schedules_for_keys([key])[key])
+
+
+def get_repayment_schedules(employer_docs):
+    """
+    Bulk version of get_repayment_schedule, returns a dict of case pk to
+    repayment table. Cases sharing the same terms are computed once.
+
+    Pass a queryset with select_related('rn_casestatus_ed') to avoid a
+    query per case.
+    """
+    employer_docs = list(employer_docs)
+    keys = [get_schedule_key(employer_doc) for employer_doc in employer_docs]
+    schedules = get_schedules_for_keys(keys)
+    tables = {}
+    for employer_doc, key in zip(employer_docs, keys):
+        tables[employer_doc.pk] = copy_repayment_table(schedules[key])
+    return tables
@@ -1,3 +1,326 @@
+import datetime
+import uuid
+from unittest import mock
+
+from agency.models import Agency, AgencyBranch, AgencyEmployee, AgencyOwner
+from django.conf import settings
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.views.generic import View
+from maid.models import Maid
+from onlinemaid.constants import (AG_ADMINS, AG_MANAGERS, AG_OWNERS,
+                                  AG_SALES, EMPLOYERS)
+from onlinemaid.helper_functions import (create_test_user, r_contact_number,
+                                         r_string)
+
+from . import receipts
+from .mixins import AgencyAccessToEmployerDocAppMixin, EmployerDocAccessMixin
+from .models import Employer, EmployerDoc, ReceiptMaster
+from .receipts import ReceiptNumberAllocator, allocate_receipt_numbers
+from .views import CaseDocumentsExportAgencyView
+
+# Start of Tests
+
+
+def get_receipt_counter():
+    return ReceiptMaster.objects.get(
+        pk=ReceiptMaster.RECEIPT_MASTER_PK
+    ).number
+
+
+class ReceiptRunningNumberTest(TestCase):
+    def testCounterRowIsCreatedOnFirstReservation(self):
+        self.assertFalse(ReceiptMaster.objects.exists())
+        self.assertEqual(ReceiptMaster.reserve_running_numbers(3), 1)
+        self.assertEqual(get_receipt_counter(), 3)
+        self.assertEqual(ReceiptMaster.reserve_running_numbers(), 4)
+        self.assertEqual(ReceiptMaster.objects.count(), 1)
+
+    def testSingleAllocationsAreConsecutive(self):
+        allocator = ReceiptNumberAllocator(block_size=5)
+        numbers = [allocator.allocate()[0] for i in range(7)]
+        self.assertEqual(numbers, list(range(1, 8)))
+        # One counter update per block of 5
+        self.assertEqual(get_receipt_counter(), 10)
+
+    def testBulkAllocationLargerThanBlock(self):
+        allocator = ReceiptNumberAllocator(block_size=5)
+        self.assertEqual(allocator.allocate(), [1])
+        # The rest of the block, then a range of its own for the remainder
+        self.assertEqual(allocator.allocate(12), list(range(2, 14)))
+        self.assertEqual(get_receipt_counter(), 13)
+        self.assertEqual(allocator.allocate(), [14])
+        self.assertEqual(get_receipt_counter(), 18)
+
+    def testNewBlockAfterFork(self):
+        allocator = ReceiptNumberAllocator(block_size=5)
+        with mock.patch.object(receipts.os, 'getpid', return_value=100):
+            self.assertEqual(allocator.allocate(), [1])
+        # The parent's block is left behind rather than shared
+        with mock.patch.object(receipts.os, 'getpid', return_value=200):
+            self.assertEqual(allocator.allocate(), [6])
+        self.assertEqual(get_receipt_counter(), 10)
+
+    def testReservesDirectlyInsideTransaction(self):
+        with mock.patch.object(receipts, '_allocator') as allocator:
+            with transaction.atomic():
+                numbers = allocate_receipt_numbers(3)
+        allocator.allocate.assert_not_called()
+        self.assertEqual(numbers, [1, 2, 3])
+        self.assertEqual(get_receipt_counter(), 3)
+
+
+def create_test_agency():
+    agency = Agency.objects.create(
+        name=r_string(10),
+        license_number=r_string(8),
+        profile=r_string(20),
+        services=r_string(20)
+    )
+    branches = [
+        AgencyBranch.objects.create(
+            agency=agency,
+            name=r_string(10),
+            address_1=r_string(10),
+            address_2=r_string(10),
+            postal_code='123456',
+            office_number=r_contact_number(),
+            mobile_number=r_contact_number(),
+            email=f'{r_string(6)}@{r_string(6)}.com'
+        )
+        for i in range(2)
+    ]
+    return agency, branches
+
+
+def create_test_agency_user(agency, branch, group_name):
+    user = create_test_user()['obj']
+    user.groups.add(Group.objects.get_or_create(name=group_name)[0])
+    if group_name == AG_OWNERS:
+        AgencyOwner.objects.create(
+            user=user,
+            agency=agency,
+            name=r_string(10),
+            mobile_number=r_contact_number()
+        )
+    else:
+        AgencyEmployee.objects.create(
+            user=user,
+            agency=agency,
+            branch=branch,
+            name=r_string(10),
+            contact_number=r_contact_number(),
+            email=user.email
+        )
+    return user
+
+
+def create_test_case(agency_employee):
+    employer = Employer.objects.create(
+        agency_employee=agency_employee,
+        employer_name=r_string(10),
+        employer_mobile_number=r_contact_number(),
+        employer_email=f'{r_string(6)}@{r_string(6)}.com',
+        employer_address_1=r_string(10),
+        employer_post_code='123456',
+        employer_date_of_birth=datetime.date(1980, 1, 1)
+    )
+    fdw = Maid.objects.create(
+        agency=agency_employee.agency,
+        reference_number=r_string(8),
+        height=150,
+        weight=50,
+        repatriation_airport=r_string(10)
+    )
+    return EmployerDoc.objects.create(
+        case_ref_no=r_string(8),
+        agreement_date=datetime.date(2021, 1, 1),
+        employer=employer,
+        fdw=fdw,
+        fdw_salary=600,
+        fdw_loan=0,
+        fdw_monthly_loan_repayment=0
+    )
+
+
+class AccessTestViewMixin:
+    pk_url_kwarg = 'level_1_pk'
+
+    def get_object(self):
+        return EmployerDoc.objects.get(pk=self.kwargs[self.pk_url_kwarg])
+
+    def get(self, request, *args, **kwargs):
+        request.view_called = True
+        return HttpResponse()
+
+
+class AgencyAccessTestView(
+    AccessTestViewMixin,
+    AgencyAccessToEmployerDocAppMixin,
+    View
+):
+    pass
+
+
+class EmployerAccessTestView(
+    AccessTestViewMixin,
+    EmployerDocAccessMixin,
+    View
+):
+    pass
+
+
+class EmployerDocObjectAccessTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        agency, (branch, other_branch) = create_test_agency()
+        other_agency, other_agency_branches = create_test_agency()
+        cls.owner = create_test_agency_user(agency, branch, AG_OWNERS)
+        cls.admin = create_test_agency_user(agency, branch, AG_ADMINS)
+        cls.manager = create_test_agency_user(agency, branch, AG_MANAGERS)
+        cls.other_branch_manager = create_test_agency_user(
+            agency,
+            other_branch,
+            AG_MANAGERS
+        )
+        cls.sales = create_test_agency_user(agency, branch, AG_SALES)
+        cls.other_sales = create_test_agency_user(agency, branch, AG_SALES)
+        cls.other_agency_owner = create_test_agency_user(
+            other_agency,
+            other_agency_branches[0],
+            AG_OWNERS
+        )
+        cls.employer_user = create_test_user()['obj']
+        cls.employer_user.groups.add(
+            Group.objects.get_or_create(name=EMPLOYERS)[0]
+        )
+        cls.employer_doc = create_test_case(cls.sales.agency_employee)
+
+    def request_case(self, view_class, user, pk=None, session=None):
+        request = RequestFactory().get('/')
+        request.user = user
+        if session is not None:
+            request.session = session
+        response = view_class.as_view()(
+            request,
+            level_1_pk=pk or self.employer_doc.pk
+        )
+        return response, getattr(request, 'view_called', False)
+
+    def assertAllowed(self, view_class, user, **kwargs):
+        response, view_called = self.request_case(view_class, user, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(view_called)
+
+    def assertDenied(self, view_class, user, **kwargs):
+        response, view_called = self.request_case(view_class, user, **kwargs)
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(view_called)
+
+    def testAgencyStaffWithAccess(self):
+        for user in [self.owner, self.admin, self.manager, self.sales]:
+            self.assertAllowed(AgencyAccessTestView, user)
+
+    def testManagerOfAnotherBranchIsDenied(self):
+        self.assertDenied(AgencyAccessTestView, self.other_branch_manager)
+
+    def testSalesStaffOnAnotherAgentsCaseIsDenied(self):
+        self.assertDenied(AgencyAccessTestView, self.other_sales)
+
+    def testAnotherAgencyIsDenied(self):
+        self.assertDenied(AgencyAccessTestView, self.other_agency_owner)
+
+    def get_employer_session(self, *employer_docs):
+        # Session of the employer after passing the cases' challenges
+        session_key = str(uuid.uuid5(
+            uuid.UUID(settings.ACCOUNT_UUID_NAMESPACE),
+            str(self.employer_user.pk)
+        ))
+        return {
+            session_key: [
+                str(employer_doc.key_uuid) for employer_doc in employer_docs
+            ]
+        }
+
+    def testMissingCaseIsNotFound(self):
+        with self.assertRaises(Http404):
+            self.request_case(
+                AgencyAccessTestView,
+                self.owner,
+                pk=uuid.uuid4()
+            )
+        with self.assertRaises(Http404):
+            self.request_case(
+                EmployerAccessTestView,
+                self.employer_user,
+                pk=uuid.uuid4(),
+                session=self.get_employer_session(self.employer_doc)
+            )
+
+    def testEmployerNeedsTheChallenge(self):
+        self.assertDenied(
+            EmployerAccessTestView,
+            self.employer_user,
+            session={}
+        )
+        self.assertAllowed(
+            EmployerAccessTestView,
+            self.employer_user,
+            session=self.get_employer_session(self.employer_doc)
+        )
+
+    def request_export(self, user, **params):
+        request = RequestFactory().get(
+            reverse('case_documents_export_route'),
+            params
+        )
+        request.user = user
+        return CaseDocumentsExportAgencyView.as_view()(request)
+
+    def testExportNeedsAgencyStaff(self):
+        response = self.request_export(
+            self.employer_user,
+            start_date='2021-01-01',
+            end_date='2021-01-31'
+        )
+        self.assertEqual(response.status_code, 302)
+
+    def testExportValidatesTheDateRange(self):
+        self.assertEqual(self.request_export(self.sales).status_code, 400)
+        response = self.request_export(
+            self.sales,
+            start_date='2021-01-31',
+            end_date='2021-01-01'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(CASE_EXPORT_MAX_CASES=0)
+    def testExportIsLimitedToTheVisibleCases(self):
+        # The case is only counted against the limit where it is visible
+        for user in [self.owner, self.admin, self.manager, self.sales]:
+            response = self.request_export(
+                user,
+                start_date='2021-01-01',
+                end_date='2021-01-31'
+            )
+            self.assertEqual(response.status_code, 400)
+        for user in [
+            self.other_branch_manager,
+            self.other_sales,
+            self.other_agency_owner
+        ]:
+            response = self.request_export(
+                user,
+                start_date='2021-01-01',
+                end_date='2021-01-31'
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'application/zip')
+
+
 # from django.test import TestCase, RequestFactory
 # from django.conf import settings
 # from django.urls import reverse
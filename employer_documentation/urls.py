@@ -1,6 +1,7 @@
 from django.urls import include, path
 
-from .views import (CaseStatusAPIView, CaseStatusUpdateView, ChallengeFormView,
+from .views import (CaseDocumentsExportAgencyView, CaseDocumentsZipAgencyView,
+                    CaseStatusAPIView, CaseStatusUpdateView, ChallengeFormView,
                     DocSafetyAgreementCreateView, DocSafetyAgreementUpdateView,
                     DocServAgmtEmpCtrCreateView, DocServAgmtEmpCtrUpdateView,
                     DocServiceFeeScheduleCreateView,
@@ -95,6 +96,11 @@ urlpatterns = [
                 EmployerDocCreateView.as_view(),
                 name='case_create_route'
             ),
+            path(
+                'documents/export/',
+                CaseDocumentsExportAgencyView.as_view(),
+                name='case_documents_export_route'
+            ),
             path(
                 '<uuid:level_1_pk>/',
                 include([
@@ -295,6 +301,11 @@ urlpatterns = [
                                         ),
                                         name='pdf_agency_deposit_invoice'
                                     ),
+                                    path(
+                                        'all/',
+                                        CaseDocumentsZipAgencyView.as_view(),
+                                        name='pdf_agency_all_documents'
+                                    ),
                                 ])
                             ),
                             path(
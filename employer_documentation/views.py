@@ -1,15 +1,16 @@
 import uuid
 from typing import Any, Dict, Optional, Type
 
-from agency.mixins import GetAuthorityMixin
-from agency.models import Agency
+from agency.mixins import AgencyLoginRequiredMixin, GetAuthorityMixin
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.messages.views import SuccessMessageMixin
 from django.core.exceptions import ObjectDoesNotExist
 from django.db.models.query import QuerySet as QS
 from django.forms.forms import BaseForm
-from django.http import FileResponse, HttpResponseRedirect, JsonResponse
+from django.http import (FileResponse, HttpResponseBadRequest,
+                         HttpResponseRedirect, JsonResponse,
+                         StreamingHttpResponse)
 from django.http.request import HttpRequest as req
 from django.http.response import HttpResponse as res
 from django.shortcuts import get_object_or_404, redirect
@@ -20,16 +21,21 @@ from django.views.generic.edit import (CreateView, DeleteView, FormView,
                                        UpdateView)
 from django.views.generic.list import View
 from maid.helper_functions import is_maid_new
-from onlinemaid.constants import AG_SALES
+from onlinemaid.constants import AG_ADMINS, AG_MANAGERS, AG_OWNERS, AG_SALES
+from onlinemaid.mixins import GroupRequiredMixin
 from onlinemaid.types import T, _FormT
 
+from .case_export import get_case_folder, stream_case_documents
+from .case_readiness import get_case_readiness
+from .case_snapshots import get_document_filename, open_snapshot_document
 from .constants import (ERROR_MESSAGES_VERBOSE_NAME_MAP,
                         monthly_income_label_map)
-from .forms import (CaseStatusForm, ChallengeForm, DocSafetyAgreementForm,
-                    DocServAgmtEmpCtrForm, DocServiceFeeScheduleForm,
-                    DocUploadForm, EmployerDocForm, EmployerForm,
-                    EmployerIncomeDetailsForm, EmployerJointApplicantForm,
-                    EmployerSignatureForm, EmployerSponsorForm,
+from .forms import (CaseDocumentsExportForm, CaseStatusForm, ChallengeForm,
+                    DocSafetyAgreementForm, DocServAgmtEmpCtrForm,
+                    DocServiceFeeScheduleForm, DocUploadForm, EmployerDocForm,
+                    EmployerForm, EmployerIncomeDetailsForm,
+                    EmployerJointApplicantForm, EmployerSignatureForm,
+                    EmployerSponsorForm,
                     EmployerWithJointApplicantSignatureForm,
                     EmployerWithOneSponsorSignatureForm,
                     EmployerWithSpouseSignatureForm,
@@ -68,15 +74,6 @@ class EmployerDocDetailView(
     pk_url_kwarg = 'level_1_pk'
     template_name = 'detail/dashboard-case-detail.html'
 
-    def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
-        context = super().get_context_data(**kwargs)
-        context.update({
-            'agency_name': Agency.objects.get(
-                pk=self.agency_id
-            ).name
-        })
-        return context
-
 # Create Views
 
 
@@ -1093,8 +1090,9 @@ class SignatureUpdateByAgentView(
 
     def get(self, request: req, *args: str, **kwargs: Any) -> res:
         self.object = self.get_object()
-        ed = self.object.employer_doc
-        missing_details = ed.get_missing_case_dets_pre_signing_1()
+        missing_details = get_case_readiness(
+            self.object.employer_doc_id
+        ).missing_pre_signing_1
         if missing_details:
             for md in missing_details:
                 messages.warning(
@@ -1128,7 +1126,8 @@ class SignatureUpdateByAgentView(
 
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        model_field_verbose_name = CaseSignature._meta.get_field(
+        model_field_verbose_name = getattr(
+            CaseSignature,
             self.model_field_name
         ).verbose_name
         context.update({
@@ -1159,6 +1158,12 @@ class HtmlToRenderPdfAgencyView(
 
     def get(self, request: req, *args: str, **kwargs: Any) -> res:
         self.object = self.get_object()
+        snapshot_response = self.get_snapshot_response(
+            get_document_filename(self.template_name)
+        )
+        if snapshot_response:
+            return snapshot_response
+
         context = self.get_context_data()
 
         if self.use_repayment_table:
@@ -1183,6 +1188,12 @@ class HtmlToRenderPdfEmployerView(
 
     def get(self, request: req, *args: str, **kwargs: Any) -> res:
         self.object = self.get_object()
+        snapshot_response = self.get_snapshot_response(
+            get_document_filename(self.template_name)
+        )
+        if snapshot_response:
+            return snapshot_response
+
         context = self.get_context_data()
 
         if self.use_repayment_table:
@@ -1212,6 +1223,15 @@ class UploadedPdfAgencyView(
 
     def get(self, request: req, *args: str, **kwargs: Any) -> res:
         self.object = self.get_object()
+        if self.object.is_archived_doc:
+            pdf_file = open_snapshot_document(self.object, self.filename)
+            if pdf_file:
+                return FileResponse(
+                    pdf_file,
+                    as_attachment=self.as_attachment,
+                    filename=self.filename,
+                    content_type='application/pdf'
+                )
         try:
             return FileResponse(
                 getattr(self.object.rn_docupload_ed, self.field_name).open(),
@@ -1230,6 +1250,91 @@ class UploadedPdfAgencyView(
             )
 
 
+class CaseDocumentsZipAgencyView(
+    AgencyAccessToEmployerDocAppMixin,
+    GetAuthorityMixin,
+    DetailView
+):
+    model = EmployerDoc
+    pk_url_kwarg = 'level_1_pk'
+
+    def get(self, request: req, *args: str, **kwargs: Any) -> res:
+        self.object = self.get_object()
+        response = StreamingHttpResponse(
+            stream_case_documents(
+                [self.object],
+                request.build_absolute_uri('/')
+            ),
+            content_type='application/zip'
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{get_case_folder(self.object)}.zip"'
+        )
+        return response
+
+
+class CaseDocumentsExportAgencyView(
+    AgencyLoginRequiredMixin,
+    GroupRequiredMixin,
+    GetAuthorityMixin,
+    View
+):
+    # Every case of the agency with a contract date in the given range, as
+    # visible to the user in the case list. There is no object in the URL,
+    # access is given by the authority scoped queryset.
+    group_required = [AG_OWNERS, AG_ADMINS, AG_MANAGERS, AG_SALES]
+    http_method_names = ['get']
+
+    def get_queryset(self) -> QS[T]:
+        if self.authority == AG_OWNERS or self.authority == AG_ADMINS:
+            return EmployerDoc.objects.filter(
+                employer__agency_employee__agency__pk=self.agency_id
+            )
+        elif self.authority == AG_MANAGERS:
+            return EmployerDoc.objects.filter(
+                employer__agency_employee__branch=(
+                    self.request.user.agency_employee.branch
+                )
+            )
+        elif self.authority == AG_SALES:
+            return EmployerDoc.objects.filter(
+                employer__agency_employee=self.request.user.agency_employee
+            )
+        else:
+            return EmployerDoc.objects.none()
+
+    def get(self, request: req, *args: str, **kwargs: Any) -> res:
+        form = CaseDocumentsExportForm(request.GET)
+        if not form.is_valid():
+            return HttpResponseBadRequest(form.errors.as_text())
+
+        start_date = form.cleaned_data['start_date']
+        end_date = form.cleaned_data['end_date']
+        employer_docs = self.get_queryset().filter(
+            agreement_date__range=(start_date, end_date)
+        ).select_related(
+            'rn_docupload_ed'
+        ).order_by('agreement_date', 'case_ref_no')
+        # Larger exports hold a web worker and the rendering pool for too
+        # long, they are run with the export_case_documents command instead
+        if employer_docs.count() > settings.CASE_EXPORT_MAX_CASES:
+            return HttpResponseBadRequest(
+                f'At most {settings.CASE_EXPORT_MAX_CASES} cases can be '
+                f'exported at a time, please choose a shorter date range'
+            )
+        response = StreamingHttpResponse(
+            stream_case_documents(
+                employer_docs.iterator(),
+                request.build_absolute_uri('/')
+            ),
+            content_type='application/zip'
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="cases-{start_date}-{end_date}.zip"'
+        )
+        return response
+
+
 # Form Views
 
 
@@ -1516,8 +1621,9 @@ class HandoverFormView(FormView):
 
     def get(self, request: req, *args: str, **kwargs: Any) -> res:
         self.object = self.get_object()
-        ed = self.object.employer_doc
-        missing_details = ed.get_missing_case_dets_pre_signing_2()
+        missing_details = get_case_readiness(
+            self.object.employer_doc_id
+        ).missing_pre_signing_2
         if missing_details:
             for md in missing_details:
                 messages.warning(
@@ -1551,11 +1657,11 @@ class HandoverFormView(FormView):
         self.object.save()
 
         try:
-            self.object.employer_doc.set_archive()
+            self.object.employer_doc.set_archive(
+                site_url=self.request.build_absolute_uri('/')
+            )
         except Exception as e:
             print(e)
-        else:
-            self.object.employer_doc.delete()
 
         return super().form_valid(form)
 
@@ -111,6 +111,17 @@ class GeneralEnquiry(models.Model):
         editable=False
     )
 
+    created_on = models.DateTimeField(
+        verbose_name=_('Created On'),
+        auto_now_add=True,
+        editable=False
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_on', 'id'])
+        ]
+
     def get_maid_languages(self):
         txt = ''
         for i in self.languages_spoken.all():
@@ -224,6 +235,17 @@ class ShortlistedEnquiry(models.Model):
         editable=False
     )
 
+    created_on = models.DateTimeField(
+        verbose_name=_('Created On'),
+        auto_now_add=True,
+        editable=False
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_on', 'id'])
+        ]
+
     @property
     def is_shortlisted_enquiry(self):
         return True
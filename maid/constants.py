@@ -57,6 +57,17 @@ class MaidLanguageChoices(models.TextChoices):
     HINDI_TAMIL = 'H_T', _('Hindi / Tamil')
 
 
+# Bit assigned to each spoken language in the maid search bitmasks. Values
+# must never be reassigned once rows have been written with them.
+MAID_LANGUAGE_BITS = {
+    MaidLanguageChoices.ENGLISH: 1 << 0,
+    MaidLanguageChoices.MANDARIN: 1 << 1,
+    MaidLanguageChoices.CHINESE_DIALECT: 1 << 2,
+    MaidLanguageChoices.MALAY: 1 << 3,
+    MaidLanguageChoices.HINDI_TAMIL: 1 << 4,
+}
+
+
 class MaidReligionChoices(models.TextChoices):
     BUDDHIST = 'B', _('Buddhist')
     MUSLIM = 'M', _('Muslim')
@@ -84,6 +95,17 @@ class MaidResponsibilityChoices(models.TextChoices):
     MAID_RESP_CARE_FOR_DISABLED = 'CFD', _('Care for the Disabled')
 
 
+# Bit assigned to each responsibility in the maid search bitmasks. Values
+# must never be reassigned once rows have been written with them.
+MAID_RESPONSIBILITY_BITS = {
+    MaidResponsibilityChoices.MAID_RESP_GENERAL_HOUSEWORK: 1 << 0,
+    MaidResponsibilityChoices.MAID_RESP_COOKING: 1 << 1,
+    MaidResponsibilityChoices.MAID_RESP_CARE_FOR_INFANTS_CHILDREN: 1 << 2,
+    MaidResponsibilityChoices.MAID_RESP_CARE_FOR_ELDERLY: 1 << 3,
+    MaidResponsibilityChoices.MAID_RESP_CARE_FOR_DISABLED: 1 << 4,
+}
+
+
 class MaidGeneralHouseworkRemarksChoices(models.TextChoices):
     CAN_DO_ALL_HOUSEWORK = 'CAN', _('Able to do all general housework')
     OTHERS = 'OTH', _('Other remarks (Please specify)')
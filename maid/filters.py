@@ -2,6 +2,7 @@ from datetime import timedelta
 
 from agency.models import Agency
 from django import forms
+from django.db.models import F
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 from django_filters import (CharFilter, ChoiceFilter, FilterSet,
@@ -11,6 +12,7 @@ from onlinemaid.constants import MaritalStatusChoices
 
 from .constants import (MaidCountryOfOrigin, MaidCreatedOnChoices,
                         TypeOfMaidChoices)
+from .helper_functions import get_language_mask, get_responsibility_mask
 from .models import Maid, MaidLanguage, MaidResponsibility
 from .widgets import CustomRangeWidget
 
@@ -42,37 +44,38 @@ class MiniMaidFilter(FilterSet):
 
 
 class MaidFilter(FilterSet):
+    # All lookups go through the denormalised MaidSearchIndex row, so a search
+    # is a single one-to-one join with no m2m fan-out and no DISTINCT
     def filter_age_between(self, queryset, name, value):
         # gt and min value and lt max value
         print(value)
         return queryset
 
     name = CharFilter(
-        field_name='name',
-        lookup_expr='icontains',
-        label=_('Search by Maid Name')
+        label=_('Search by Maid Name'),
+        method='name_filter'
     )
     languages = ModelMultipleChoiceFilter(
-        field_name='languages',
-        lookup_expr='exact',
         queryset=MaidLanguage.objects.all(),
         widget=forms.CheckboxSelectMultiple(),
-        label=_('Language Spoken')
+        label=_('Language Spoken'),
+        method='languages_filter'
     )
     country_of_origin = ChoiceFilter(
-        field_name='country_of_origin',
+        field_name='search_index__country_of_origin',
         lookup_expr='exact',
         label=_('Country of Origin'),
         choices=MaidCountryOfOrigin.choices,
         empty_label=_('No Preference')
     )
     maid_type = ChoiceFilter(
+        field_name='search_index__maid_type',
         label=_('Type of Maid'),
         choices=TypeOfMaidChoices.choices,
         empty_label=_('No Preference')
     )
     marital_status = ChoiceFilter(
-        field_name='marital_status',
+        field_name='search_index__marital_status',
         lookup_expr='exact',
         label=_('Marital Status'),
         choices=MaritalStatusChoices.choices,
@@ -81,7 +84,8 @@ class MaidFilter(FilterSet):
     responsibilities = ModelMultipleChoiceFilter(
         queryset=MaidResponsibility.objects.all(),
         widget=forms.CheckboxSelectMultiple(),
-        label=_('Maid Responsibilites')
+        label=_('Maid Responsibilites'),
+        method='responsibilities_filter'
     )
     age = RangeFilter(
         label=_('Age'),
@@ -118,6 +122,35 @@ class MaidFilter(FilterSet):
             'created_on'
         ]
 
+    def name_filter(self, queryset, name, value):
+        # search_name is stored upper-cased so that a plain LIKE can use the
+        # trigram index
+        return queryset.filter(
+            search_index__search_name__contains=value.upper()
+        )
+
+    def languages_filter(self, queryset, name, value):
+        mask = get_language_mask(i.language for i in value)
+        if mask:
+            queryset = queryset.alias(
+                language_match=F('search_index__language_mask').bitand(mask)
+            ).filter(
+                language_match__gt=0
+            )
+        return queryset
+
+    def responsibilities_filter(self, queryset, name, value):
+        mask = get_responsibility_mask(i.name for i in value)
+        if mask:
+            queryset = queryset.alias(
+                responsibility_match=F(
+                    'search_index__responsibility_mask'
+                ).bitand(mask)
+            ).filter(
+                responsibility_match__gt=0
+            )
+        return queryset
+
     def custom_age_filter(self, queryset, name, value):
         time_now = timezone.now()
         start_date = time_now - timedelta(
@@ -127,7 +160,7 @@ class MaidFilter(FilterSet):
             365 * int(value.start) + int(value.start // 4)
         )
         return queryset.filter(
-            date_of_birth__range=(
+            search_index__date_of_birth__range=(
                 start_date,
                 end_date
             )
@@ -137,6 +170,8 @@ class MaidFilter(FilterSet):
         if value:
             time_now = timezone.now()
             queryset = queryset.filter(
-                created_on__gt=time_now - timedelta(days=int(value))
+                search_index__created_on__gt=time_now - timedelta(
+                    days=int(value)
+                )
             )
         return queryset
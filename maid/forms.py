@@ -5,12 +5,11 @@ from agency.models import Agency
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import HTML, Column, Div, Field, Layout, Row, Submit
 from django import forms
-from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils.translation import ugettext_lazy as _
 from employer_documentation.models import EmployerDoc
 from onlinemaid.constants import TrueFalseChoices
-from onlinemaid.helper_functions import encrypt_string, is_not_null, is_null
+from onlinemaid.helper_functions import is_not_null, is_null
 from onlinemaid.validators import validate_fin, validate_passport
 from onlinemaid.widgets import OMCustomTextarea
 
@@ -21,7 +20,7 @@ from .constants import (CookingRemarksChoices, DisabledCareRemarksChoices,
                         MaidDietaryRestrictionChoices, MaidExperienceChoices,
                         MaidFoodPreferenceChoices,
                         MaidLanguageProficiencyChoices,
-                        MaidPassportStatusChoices)
+                        MaidPassportStatusChoices, MaidStatusChoices)
 from .models import (Maid, MaidCooking, MaidDietaryRestriction,
                      MaidDisabledCare, MaidElderlyCare, MaidEmploymentHistory,
                      MaidFoodHandlingPreference, MaidGeneralHousework,
@@ -35,8 +34,9 @@ class MaidForm(forms.ModelForm):
         model = Maid
         exclude = [
             'agency', 'created_on', 'updated_on', 'about_me',
-            'responsibilities', 'languages', 'passport_number_nonce',
-            'passport_number_tag', 'fin_number_nonce', 'fin_number_tag'
+            'responsibilities', 'languages', 'passport_number_num',
+            'passport_number_nonce', 'passport_number_tag', 'fin_number_num',
+            'fin_number_nonce', 'fin_number_tag'
         ]
 
     def __init__(self, *args, **kwargs):
@@ -216,33 +216,44 @@ class MaidForm(forms.ModelForm):
         finally:
             return reference_number
 
+    def clean_status(self):
+        # Early warning only, Maid.save enforces the limit atomically
+        status = self.cleaned_data.get('status')
+        if (
+            status == MaidStatusChoices.FEATURED
+            and self.instance.get_stored_status() != MaidStatusChoices.FEATURED
+        ):
+            agency = Agency.objects.filter(
+                pk=self.agency_id
+            ).values(
+                'amount_of_featured_biodata',
+                'amount_of_featured_biodata_allowed'
+            ).first()
+            if agency and (
+                agency['amount_of_featured_biodata']
+                >= agency['amount_of_featured_biodata_allowed']
+            ):
+                raise ValidationError(
+                    _('You have reached the limit of featured biodata')
+                )
+        return status
+
     def clean_passport_number(self):
         cleaned_field = self.cleaned_data.get('passport_number')
 
         if is_not_null(cleaned_field):
             validate_passport("FDW", cleaned_field)
-            # Encryption
-            ciphertext, nonce, tag = encrypt_string(
-                cleaned_field,
-                settings.ENCRYPTION_KEY,
-            )
-            self.instance.passport_number_nonce = nonce
-            self.instance.passport_number_tag = tag
-            return ciphertext
+        # Encrypted by the model field on save
+        self.instance.clear_legacy_fields('passport_number')
+        return cleaned_field
 
     def clean_fin_number(self):
         cleaned_field = self.cleaned_data.get('fin_number')
         if cleaned_field:
             # If form errors then raise ValidationError, else continue
             validate_fin('FDW', cleaned_field)
-            # Encryption
-            ciphertext, nonce, tag = encrypt_string(
-                cleaned_field,
-                settings.ENCRYPTION_KEY,
-            )
-            self.instance.fin_number_nonce = nonce
-            self.instance.fin_number_tag = tag
-            return ciphertext
+        self.instance.clear_legacy_fields('fin_number')
+        return cleaned_field
 
     def clean_expected_salary(self):
         field_name = 'expected_salary'
@@ -1,4 +1,5 @@
-from .constants import MaidLanguageProficiencyChoices, TypeOfMaidChoices
+from .constants import (MAID_LANGUAGE_BITS, MAID_RESPONSIBILITY_BITS,
+                        MaidLanguageProficiencyChoices, TypeOfMaidChoices)
 
 
 def is_maid_new(maid_type):
@@ -11,3 +12,17 @@ def is_able_to_speak(LanguageProficiency):
 
 def is_not_able_to_speak(LanguageProficiency):
     return not is_able_to_speak(LanguageProficiency)
+
+
+def get_language_mask(languages):
+    mask = 0
+    for language in languages:
+        mask |= MAID_LANGUAGE_BITS.get(language, 0)
+    return mask
+
+
+def get_responsibility_mask(responsibilities):
+    mask = 0
+    for responsibility in responsibilities:
+        mask |= MAID_RESPONSIBILITY_BITS.get(responsibility, 0)
+    return mask
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+
+from maid.constants import MaidStatusChoices
+from maid.helper_functions import get_language_mask, get_responsibility_mask
+from maid.models import Maid, MaidSearchIndex
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes the language and responsibility bitmasks on every maid '
+        'and rebuilds the denormalised search index rows for published maids'
+    )
+
+    def handle(self, *args, **options):
+        maids = Maid.objects.prefetch_related(
+            'languages',
+            'responsibilities'
+        )
+        for maid in maids:
+            maid.language_mask = get_language_mask(
+                i.language for i in maid.languages.all()
+            )
+            maid.responsibility_mask = get_responsibility_mask(
+                i.name for i in maid.responsibilities.all()
+            )
+        Maid.objects.bulk_update(
+            maids,
+            ['language_mask', 'responsibility_mask'],
+            batch_size=500
+        )
+
+        published_statuses = [
+            MaidStatusChoices.PUBLISHED,
+            MaidStatusChoices.FEATURED
+        ]
+        MaidSearchIndex.objects.exclude(
+            maid__status__in=published_statuses,
+            maid__frozen=False
+        ).delete()
+
+        published_maids = [
+            maid for maid in maids
+            if maid.status in published_statuses and not maid.frozen
+        ]
+        for maid in published_maids:
+            maid.update_search_index()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Recomputed bitmasks for {len(maids)} maids and rebuilt search '
+            f'index for {len(published_maids)} maids'
+        ))
@@ -1,16 +1,21 @@
 
 from accounts.models import FDWAccount
 from agency.models import Agency
+from agency.quotas import (BIODATA, FEATURED_BIODATA, QuotaExceeded,
+                           adjust_quota, release_quota, reserve_quota)
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import (MaxValueValidator, MinValueValidator,
                                     RegexValidator)
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 # Imports from project
 from onlinemaid.constants import MaritalStatusChoices, TrueFalseChoices
-from onlinemaid.fields import CustomBinaryField, NullableEmailField
-from onlinemaid.helper_functions import decrypt_string, humanise_time_duration
+from onlinemaid.fields import (BlindIndexField, CustomBinaryField,
+                               EncryptedField, EncryptedFieldsModelMixin,
+                               NullableEmailField, PartialField)
+from onlinemaid.helper_functions import humanise_time_duration
 from onlinemaid.storage_backends import PublicMediaStorage
 
 
@@ -62,7 +67,20 @@ class MaidLanguage(models.Model):
         return f'{self.get_language_display()}'
 
 
-class Maid(models.Model):
+class Maid(EncryptedFieldsModelMixin, models.Model):
+    encrypted_fields = {
+        'passport_number': (
+            'passport_number_num',
+            'passport_number_nonce',
+            'passport_number_tag'
+        ),
+        'fin_number': (
+            'fin_number_num',
+            'fin_number_nonce',
+            'fin_number_tag'
+        )
+    }
+
     agency = models.ForeignKey(
         Agency,
         on_delete=models.CASCADE,
@@ -88,12 +106,21 @@ class Maid(models.Model):
         null=True
     )
 
-    passport_number = CustomBinaryField()
+    passport_number = EncryptedField(
+        db_column='passport_number_packed'
+    )
+
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    passport_number_num = CustomBinaryField(
+        db_column='passport_number'
+    )
 
     passport_number_nonce = CustomBinaryField()
 
     passport_number_tag = CustomBinaryField()
 
+    passport_number_blind_index = BlindIndexField()
+
     photo = models.FileField(
         verbose_name=_('Maid Photo'),
         null=True,
@@ -147,6 +174,13 @@ class Maid(models.Model):
         default=MaidStatusChoices.UNPUBLISHED
     )
 
+    # Set while the maid's agency is inactive, a frozen maid is left out of
+    # the public search whatever its status
+    frozen = models.BooleanField(
+        default=False,
+        editable=False
+    )
+
     marital_status = models.CharField(
         verbose_name=_('Marital Status'),
         max_length=9,
@@ -276,21 +310,94 @@ class Maid(models.Model):
         verbose_name=_('Email Address')
     )
 
-    fin_number = CustomBinaryField(
+    fin_number = EncryptedField(
         verbose_name=_('FDW FIN'),
+        db_column='fin_number_packed'
+    )
+
+    # Legacy unpacked columns, emptied by pack_encrypted_fields
+    fin_number_num = CustomBinaryField(
+        db_column='fin_number'
     )
 
     fin_number_nonce = CustomBinaryField()
 
     fin_number_tag = CustomBinaryField()
 
+    fin_number_blind_index = BlindIndexField()
+
+    fin_number_partial = PartialField()
+
+    language_mask = models.PositiveSmallIntegerField(
+        verbose_name=_('Spoken languages bitmask'),
+        default=0,
+        editable=False
+    )
+
+    responsibility_mask = models.PositiveSmallIntegerField(
+        verbose_name=_('Responsibilities bitmask'),
+        default=0,
+        editable=False
+    )
+
     class Meta:
         verbose_name = _("Maid")
         verbose_name_plural = _("Maids")
+        indexes = [
+            # Keyset pagination of an agency's maids in the partner API
+            models.Index(fields=['agency', 'created_on', 'id'])
+        ]
 
     def __str__(self) -> str:
         return self.reference_number + ' - ' + self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'status' in field_names:
+            instance._loaded_status = instance.status
+        return instance
+
+    def get_stored_status(self):
+        if self._state.adding:
+            return None
+        if hasattr(self, '_loaded_status'):
+            return self._loaded_status
+        # Not built by the ORM
+        return Maid.objects.filter(
+            pk=self.pk
+        ).values_list('status', flat=True).first()
+
+    def save(self, *args, **kwargs):
+        # The agency's biodata counters move by deltas when a maid is added
+        # or its status changes. Becoming featured reserves one of the
+        # agency's featured slots, raising QuotaExceeded when none is left.
+        adding = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        featured_delta = 0
+        if update_fields is None or 'status' in update_fields:
+            was_featured = (
+                self.get_stored_status() == MaidStatusChoices.FEATURED
+            )
+            featured_delta = int(self.is_featured) - int(was_featured)
+
+        with transaction.atomic():
+            if featured_delta > 0 and not reserve_quota(
+                self.agency_id,
+                FEATURED_BIODATA
+            ):
+                raise QuotaExceeded(
+                    _('You have reached the limit of featured biodata')
+                )
+            super().save(*args, **kwargs)
+            if featured_delta < 0:
+                release_quota(self.agency_id, FEATURED_BIODATA)
+            if adding:
+                adjust_quota(self.agency_id, BIODATA, 1)
+
+        if update_fields is None or 'status' in update_fields:
+            self._loaded_status = self.status
+
     def get_main_responsibility(self):
         main_responsibility = [
             i for i in self.responsibilities.all()
@@ -301,22 +408,10 @@ class Maid(models.Model):
             return None
 
     def get_passport_number(self):
-        plaintext = decrypt_string(
-            self.passport_number,
-            settings.ENCRYPTION_KEY,
-            self.passport_number_nonce,
-            self.passport_number_tag
-        )
-        return plaintext
+        return self.decrypt_field('passport_number')
 
     def get_fin_number(self):
-        plaintext = decrypt_string(
-            self.fin_number,
-            settings.ENCRYPTION_KEY,
-            self.fin_number_nonce,
-            self.fin_number_tag
-        )
-        return plaintext
+        return self.decrypt_field('fin_number')
 
     @property
     def age(self):
@@ -341,19 +436,10 @@ class Maid(models.Model):
             return today.year - self.date_of_birth.year
 
     def get_fdw_fin_full(self):
-        return decrypt_string(
-            self.fin_number,
-            settings.ENCRYPTION_KEY,
-            self.fin_number_nonce,
-            self.fin_number_tag
-        )
+        return self.decrypt_field('fin_number')
 
     def get_fdw_fin_partial(self, padded=True):
-        plaintext = self.get_fdw_fin_full()
-        if padded:
-            return 'x' * 5 + plaintext[-4:] if plaintext else ''
-        else:
-            return plaintext[-4:] if plaintext else ''
+        return self.get_partial('fin_number', padded)
 
     def toggle_published(self):
         if self.status == MaidStatusChoices.PUBLISHED:
@@ -366,16 +452,16 @@ class Maid(models.Model):
 
     def toggle_featured(self):
         err_msg = None
-        amt_of_featured = self.agency.amount_of_featured_biodata
-        amt_allowed = self.agency.amount_of_featured_biodata_allowed
         if self.status == MaidStatusChoices.PUBLISHED:
-            if amt_of_featured < amt_allowed:
-                self.status = MaidStatusChoices.FEATURED
-            else:
+            self.status = MaidStatusChoices.FEATURED
+            try:
+                self.save()
+            except QuotaExceeded:
+                self.status = MaidStatusChoices.PUBLISHED
                 err_msg = 'You have reached the limit of featured biodata'
         elif self.status == MaidStatusChoices.FEATURED:
             self.status = MaidStatusChoices.PUBLISHED
-        self.save()
+            self.save()
         return err_msg
 
     def get_language_list(self):
@@ -410,14 +496,27 @@ class Maid(models.Model):
             'Tamil': MaidLanguageChoices.HINDI_TAMIL
         }
         if hasattr(self, 'language_proficiency'):
-            if self.languages:
-                self.languages.clear()
-            for lang in self.get_language_list():
-                self.languages.add(
-                    MaidLanguage.objects.get(
-                        language=lang_model_map[lang]
-                    )
+            languages = set(
+                lang_model_map[lang] for lang in self.get_language_list()
+            )
+            # The language mask is kept in step by the m2m_changed receiver
+            self.languages.set(
+                MaidLanguage.objects.filter(
+                    language__in=languages
                 )
+            )
+
+    def set_language_mask(self, mask):
+        # Queryset update so that the bitmask does not re-trigger the Maid
+        # post_save receivers
+        self.language_mask = mask
+        Maid.objects.filter(pk=self.pk).update(language_mask=mask)
+        self.update_search_index()
+
+    def set_responsibility_mask(self, mask):
+        self.responsibility_mask = mask
+        Maid.objects.filter(pk=self.pk).update(responsibility_mask=mask)
+        self.update_search_index()
 
     def get_food_handling_pork(self):
         if self.food_handling_preferences.filter(
@@ -533,6 +632,120 @@ class Maid(models.Model):
     def is_featured(self):
         return self.status == MaidStatusChoices.FEATURED
 
+    def update_search_index(self):
+        if not self.is_published or self.frozen:
+            MaidSearchIndex.objects.filter(maid=self).delete()
+            return
+
+        MaidSearchIndex.objects.update_or_create(
+            maid=self,
+            defaults={
+                'search_name': (self.name or '').upper(),
+                'status': self.status,
+                'country_of_origin': self.country_of_origin,
+                'maid_type': self.maid_type,
+                'marital_status': self.marital_status,
+                'date_of_birth': self.date_of_birth,
+                'expected_salary': self.expected_salary,
+                'language_mask': self.language_mask,
+                'responsibility_mask': self.responsibility_mask,
+                'created_on': self.created_on
+            }
+        )
+
+
+class MaidSearchIndex(models.Model):
+    # Denormalised copy of the searchable maid fields, one row per published
+    # maid, so that the public search never has to join the m2m tables
+    maid = models.OneToOneField(
+        Maid,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_index'
+    )
+
+    search_name = models.CharField(
+        verbose_name=_('Upper-cased name'),
+        max_length=255,
+        blank=True
+    )
+
+    status = models.CharField(
+        verbose_name=_('Status'),
+        max_length=6,
+        choices=MaidStatusChoices.choices
+    )
+
+    country_of_origin = models.CharField(
+        verbose_name=_('Nationality'),
+        max_length=3,
+        null=True,
+        choices=MaidNationalityChoices.choices
+    )
+
+    maid_type = models.CharField(
+        verbose_name=_('Maid Type'),
+        max_length=6,
+        choices=TypeOfMaidChoices.choices
+    )
+
+    marital_status = models.CharField(
+        verbose_name=_('Marital Status'),
+        max_length=9,
+        choices=MaritalStatusChoices.choices
+    )
+
+    date_of_birth = models.DateField(
+        verbose_name=_('Date of Birth'),
+        null=True
+    )
+
+    expected_salary = models.PositiveSmallIntegerField(
+        verbose_name=_('Expected Salary'),
+        default=0
+    )
+
+    language_mask = models.PositiveSmallIntegerField(
+        verbose_name=_('Spoken languages bitmask'),
+        default=0
+    )
+
+    responsibility_mask = models.PositiveSmallIntegerField(
+        verbose_name=_('Responsibilities bitmask'),
+        default=0
+    )
+
+    created_on = models.DateTimeField(
+        verbose_name=_('Created On')
+    )
+
+    class Meta:
+        verbose_name = _("Maid Search Index")
+        verbose_name_plural = _("Maid Search Index")
+        indexes = [
+            models.Index(
+                fields=[
+                    'status', 'country_of_origin', 'maid_type',
+                    'marital_status'
+                ],
+                name='maid_search_attributes_idx'
+            ),
+            models.Index(
+                fields=['status', 'date_of_birth'],
+                name='maid_search_dob_idx'
+            ),
+            models.Index(
+                fields=['status', 'created_on'],
+                name='maid_search_created_on_idx'
+            ),
+            # Requires the pg_trgm extension (TrigramExtension operation)
+            GinIndex(
+                fields=['search_name'],
+                name='maid_search_name_trgm_idx',
+                opclasses=['gin_trgm_ops']
+            )
+        ]
+
 # Models which have a one-to-many relationship with the maid model
 
 
@@ -1,85 +1,39 @@
-import random
-
-from django.db.models.signals import post_save
+from agency.quotas import BIODATA, FEATURED_BIODATA, adjust_quota
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
-from .models import (Maid, MaidCooking, MaidDisabledCare, MaidElderlyCare,
-                     MaidGeneralHousework, MaidInfantChildCare,
-                     MaidResponsibility)
-
-
-def maid_main_responsibility(maid):
-    care_model_list = [
-        MaidInfantChildCare,
-        MaidElderlyCare,
-        MaidDisabledCare,
-        MaidGeneralHousework,
-        MaidCooking
-    ]
-
-    responsibility_transmap = {
-        'MaidInfantChildCare': 'CFI',
-        'MaidElderlyCare': 'CFE',
-        'MaidDisabledCare': 'CFD',
-        'MaidGeneralHousework': 'GEH',
-        'MaidCooking': 'COK'
-    }
+from .helper_functions import get_language_mask, get_responsibility_mask
+from .models import Maid
 
-    responsibility_dict = {}
 
-    for i in care_model_list:
-        for k, v in i.objects.get(maid=maid).__dict__.items():
-            if k == 'assessment':
-                responsibility_dict[i.__name__] = v
-
-    main_responsibility_value = max(responsibility_dict.values())
-    main_responsibilities = []
-    db_responsibilities = [
-        i.get_db_value() for i in maid.responsibilities.all()
-    ]
-    responsibilities_tbd = []
-
-    for k, v in responsibility_dict.items():
-        if v == main_responsibility_value:
-            main_responsibilities.append(
-                responsibility_transmap[k]
-            )
+@receiver(post_delete, sender=Maid)
+def maid_counter(sender, instance, **kwargs):
+    # Additions and status changes are counted by Maid.save
+    adjust_quota(instance.agency_id, BIODATA, -1)
+    if instance.is_featured:
+        adjust_quota(instance.agency_id, FEATURED_BIODATA, -1)
 
-    for i in main_responsibilities:
-        if i in db_responsibilities:
-            main_responsibilities = [i]
-        elif len(main_responsibilities) > 1:
-            main_responsibilities = [random.choice(main_responsibilities)]
 
-    for i in db_responsibilities:
-        if i not in main_responsibilities:
-            responsibilities_tbd.append(i)
-        else:
-            main_responsibilities.remove(i)
-
-    for i in responsibilities_tbd:
-        maid.responsibilities.remove(
-            MaidResponsibility.objects.get(
-                name=i
+@receiver(post_save, sender=Maid)
+def maid_search_index_updated(sender, instance, created, **kwargs):
+    instance.update_search_index()
+
+
+@receiver(m2m_changed, sender=Maid.languages.through)
+@receiver(m2m_changed, sender=Maid.responsibilities.through)
+def maid_bitmasks_updated(sender, instance, action, reverse, **kwargs):
+    # The bitmasks mirror the m2m tables, set_*_mask also re-indexes the maid
+    if reverse or action not in ['post_add', 'post_remove', 'post_clear']:
+        return
+    if sender is Maid.languages.through:
+        instance.set_language_mask(
+            get_language_mask(
+                instance.languages.values_list('language', flat=True)
             )
         )
-
-    for i in main_responsibilities:
-        maid.responsibilities.add(
-            MaidResponsibility.objects.get(
-                name=i
+    else:
+        instance.set_responsibility_mask(
+            get_responsibility_mask(
+                instance.responsibilities.values_list('name', flat=True)
             )
         )
-
-
-@receiver(post_save, sender=Maid)
-def maid_counter(sender, instance, created, **kwargs):
-    agency = instance.agency
-    agency.amount_of_biodata = Maid.objects.filter(
-        agency=agency
-    ).count()
-    agency.amount_of_featured_biodata = Maid.objects.filter(
-        agency=agency,
-        status='FEAT'
-    ).count()
-    agency.save()
@@ -1 +1,74 @@
-# Create your tests here.
+from django.conf import settings
+from django.test import SimpleTestCase
+from onlinemaid.helper_functions import encrypt_string, get_blind_index
+
+from .constants import MaidLanguageChoices, MaidResponsibilityChoices
+from .helper_functions import get_language_mask, get_responsibility_mask
+from .models import Maid
+
+# Start of Tests
+
+
+class MaidSearchMaskTest(SimpleTestCase):
+    def testLanguageMaskCombinesBits(self):
+        mask = get_language_mask([
+            MaidLanguageChoices.ENGLISH,
+            MaidLanguageChoices.HINDI_TAMIL
+        ])
+        self.assertEqual(mask, 0b10001)
+
+    def testResponsibilityMaskCombinesBits(self):
+        mask = get_responsibility_mask([
+            MaidResponsibilityChoices.MAID_RESP_COOKING,
+            MaidResponsibilityChoices.MAID_RESP_CARE_FOR_ELDERLY
+        ])
+        self.assertEqual(mask, 0b01010)
+
+    def testEmptyAndUnknownValuesGiveZeroMask(self):
+        self.assertEqual(get_language_mask([]), 0)
+        self.assertEqual(get_responsibility_mask(['XYZ']), 0)
+
+
+class MaidBlindIndexTest(SimpleTestCase):
+    def testBlindIndexIgnoresCaseAndSurroundingSpaces(self):
+        self.assertEqual(
+            get_blind_index(' e1234567 '),
+            get_blind_index('E1234567')
+        )
+        self.assertNotEqual(
+            get_blind_index('E1234567'),
+            get_blind_index('E1234568')
+        )
+        self.assertIsNone(get_blind_index(''))
+
+    def testSetDerivedFieldsFromCiphertext(self):
+        ciphertext, nonce, tag = encrypt_string(
+            'e1234567',
+            settings.ENCRYPTION_KEY
+        )
+        maid = Maid(
+            passport_number_num=ciphertext,
+            passport_number_nonce=nonce,
+            passport_number_tag=tag,
+            fin_number_num=ciphertext,
+            fin_number_nonce=nonce,
+            fin_number_tag=tag
+        )
+        maid.set_derived_fields()
+        self.assertEqual(
+            maid.passport_number_blind_index,
+            get_blind_index('E1234567')
+        )
+        self.assertEqual(maid.fin_number_partial, '4567')
+        self.assertEqual(maid.get_fdw_fin_partial(), 'xxxxx4567')
+        self.assertEqual(maid.get_fdw_fin_partial(padded=False), '4567')
+
+        maid = Maid(fin_number='e7654321')
+        maid.set_derived_fields()
+        self.assertEqual(maid.get_fdw_fin_partial(padded=False), '4321')
+        self.assertIsNone(maid.passport_number_blind_index)
+
+        maid = Maid()
+        maid.set_derived_fields()
+        self.assertIsNone(maid.fin_number_blind_index)
+        self.assertEqual(maid.get_fdw_fin_partial(), '')
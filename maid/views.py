@@ -74,7 +74,9 @@ class MaidList(LoginRequiredMixin, GetAuthorityMixin, ListFilteredMixin,
     context_object_name = 'maids'
     http_method_names = ['get']
     model = Maid
-    queryset = Maid.objects.filter(status=MaidStatusChoices.PUBLISHED)
+    queryset = Maid.objects.filter(
+        search_index__status=MaidStatusChoices.PUBLISHED
+    )
     template_name = 'list/maid-list.html'
     filter_set = MaidFilter
     paginate_by = settings.MAID_PAGINATE_BY
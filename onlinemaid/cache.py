@@ -0,0 +1,94 @@
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+
+# Sentinel so that cached None / falsy values still count as hits
+_MISSING = object()
+
+
+class TieredCache:
+    """
+    Two tier cache shared by the apps.
+
+    Reads go to the in-process `local` tier first, a bounded LRU, and fall
+    back to the `shared` tier. Values found in the shared tier are copied
+    into the local tier. Keys are namespaced per app so apps never have to
+    worry about collisions.
+
+    The shared tier is whatever SHARED_CACHE_BACKEND is set to. The default
+    file based cache is only seen by the workers of one host and culls
+    entries once it is full, so anything that must never be lost or that
+    every host has to see, like invalidation counters, belongs in the
+    database instead. Values kept there must be safe to lose: the authority
+    versions, for instance, are random tokens, so a culled version only
+    forces a fresh lookup.
+
+    A delete only clears the local tier of the current process, other
+    processes keep their copy until the local TTL runs out, so keep the
+    local TTL short for values that are invalidated by delete. Values whose
+    key changes when the data changes (e.g. generation keyed responses) can
+    use the full TTL.
+    """
+    stats = Counter()
+
+    def __init__(self, namespace, local_timeout=None, shared_timeout=None):
+        self.namespace = namespace
+        self.local = caches[settings.LOCAL_CACHE_ALIAS]
+        self.shared = caches[settings.SHARED_CACHE_ALIAS]
+        self.local_timeout = (
+            local_timeout
+            if local_timeout is not None
+            else self.local.default_timeout
+        )
+        self.shared_timeout = (
+            shared_timeout
+            if shared_timeout is not None
+            else self.shared.default_timeout
+        )
+
+    def make_key(self, key):
+        return f'{self.namespace}:{key}'
+
+    def record(self, tier, outcome):
+        self.stats[(self.namespace, tier, outcome)] += 1
+
+    def get(self, key, default=None):
+        key = self.make_key(key)
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            self.record('local', 'hit')
+            return value
+        self.record('local', 'miss')
+
+        value = self.shared.get(key, _MISSING)
+        if value is not _MISSING:
+            self.record('shared', 'hit')
+            self.local.set(key, value, self.local_timeout)
+            return value
+        self.record('shared', 'miss')
+        return default
+
+    def set(self, key, value):
+        key = self.make_key(key)
+        self.local.set(key, value, self.local_timeout)
+        self.shared.set(key, value, self.shared_timeout)
+
+    def get_or_set(self, key, default):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = default() if callable(default) else default
+            self.set(key, value)
+        return value
+
+    def delete(self, key):
+        key = self.make_key(key)
+        self.local.delete(key)
+        self.shared.delete(key)
+
+    def get_stats(self):
+        return {
+            f'{tier}_{outcome}': count
+            for (namespace, tier, outcome), count in self.stats.items()
+            if namespace == self.namespace
+        }
@@ -1,25 +1,11 @@
+from agency.helper_functions import get_authority
+
 # Start of Context Processors
 
 
 def authority(request):
-    authority = None
-    authority_groups = [
-        'Employers',
-        'Agency Owners',
-        'Agency Administrators',
-        'Agency Managers',
-        'Agency Sales Staff',
-        'Foreign Domestic Workers'
-    ]
-    if not request.user.is_anonymous:
-        for authority_name in authority_groups:
-            if request.user.groups.filter(
-                name=authority_name
-            ).exists():
-                authority = authority_name
-
     return {
-        'authority': authority
+        'authority': get_authority(request)['authority'] or None
     }
 
 
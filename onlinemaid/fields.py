@@ -1,6 +1,12 @@
+from django import forms
+from django.conf import settings
 from django.db import models
+from django.db.models.query_utils import DeferredAttribute
 
 from .constants import GenderChoices, FullNationsChoices, MaritalStatusChoices
+from .helper_functions import (decrypt_string, encrypt_string,
+                               get_blind_index, pack_encrypted,
+                               unpack_encrypted)
 
 
 class CustomBinaryField(models.BinaryField):
@@ -13,6 +19,252 @@ class CustomBinaryField(models.BinaryField):
         super().__init__(*args, **kwargs)
 
 
+class EncryptedFieldDescriptor(DeferredAttribute):
+    """
+    Plaintext access to an EncryptedField. The packed value loaded from the
+    database is only decrypted on first access and the plaintext is then
+    kept on the instance, e.g. for the whole of a request or PDF render.
+    """
+
+    def get_plaintexts(self, instance):
+        return instance.__dict__.setdefault('_encrypted_plaintexts', {})
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        plaintexts = self.get_plaintexts(instance)
+        attname = self.field.attname
+        if attname not in plaintexts:
+            packed = super().__get__(instance, cls)
+            if packed:
+                ciphertext, nonce, tag = unpack_encrypted(packed)
+                plaintexts[attname] = decrypt_string(
+                    ciphertext,
+                    settings.ENCRYPTION_KEY,
+                    nonce,
+                    tag
+                )
+            else:
+                plaintexts[attname] = None
+        return plaintexts[attname]
+
+    def __set__(self, instance, value):
+        plaintexts = self.get_plaintexts(instance)
+        attname = self.field.attname
+        if isinstance(value, (bytes, memoryview)):
+            # Packed value loaded from the database
+            instance.__dict__[attname] = bytes(value)
+            plaintexts.pop(attname, None)
+        else:
+            # Plaintext, encrypted when the instance is saved
+            instance.__dict__[attname] = None
+            plaintexts[attname] = value or None
+
+
+class EncryptedField(models.BinaryField):
+    """
+    AES-GCM encrypted string kept in a single column, packed as nonce, tag
+    and ciphertext, in place of the separate *_num, *_nonce and *_tag
+    columns. Reads and writes plaintext, see EncryptedFieldDescriptor.
+    """
+    descriptor_class = EncryptedFieldDescriptor
+
+    def __init__(self, *args, **kwargs) -> None:
+        kwargs.setdefault('blank', True)
+        kwargs.update({
+            'editable': True,
+            'null': True
+        })
+        super().__init__(*args, **kwargs)
+
+    def pre_save(self, model_instance, add):
+        packed = model_instance.__dict__.get(self.attname)
+        if packed is None:
+            plaintext = getattr(model_instance, self.attname)
+            if plaintext:
+                packed = pack_encrypted(*encrypt_string(
+                    plaintext,
+                    settings.ENCRYPTION_KEY
+                ))
+                model_instance.__dict__[self.attname] = packed
+        return packed
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        # Plaintext reaching the database without pre_save, e.g. through
+        # bulk_update or QuerySet.update
+        if isinstance(value, str):
+            value = pack_encrypted(*encrypt_string(
+                value,
+                settings.ENCRYPTION_KEY
+            )) if value else None
+        return super().get_db_prep_value(value, connection, prepared)
+
+    def to_python(self, value):
+        # Model and form cleaning pass the plaintext through
+        return value
+
+    def formfield(self, **kwargs):
+        return models.Field.formfield(self, **{
+            'form_class': forms.CharField,
+            **kwargs
+        })
+
+
+class BlindIndexField(models.CharField):
+    # Hex digest of onlinemaid.helper_functions.get_blind_index
+    def __init__(self, *args, **kwargs) -> None:
+        kwargs.update({
+            'max_length': 64,
+            'editable': False,
+            'blank': True,
+            'null': True,
+            'db_index': True
+        })
+        super().__init__(*args, **kwargs)
+
+
+class PartialField(models.CharField):
+    # Last characters of an encrypted identity number, for masked display
+    def __init__(self, *args, **kwargs) -> None:
+        kwargs.update({
+            'max_length': 4,
+            'editable': False,
+            'blank': True,
+            'null': True
+        })
+        super().__init__(*args, **kwargs)
+
+
+class EncryptedFieldsModelMixin:
+    """
+    Keeps the columns derived from encrypted identity numbers in step with
+    them, recomputed on every save so that reads never have to decrypt:
+
+    - <name>_blind_index, if the model has it, keyed HMAC for exact match
+      lookups
+    - <name>_partial, if the model has it, the last 4 characters shown in
+      masked form
+
+    encrypted_fields maps each <name> to the names of its ciphertext, nonce
+    and tag fields.
+    """
+    encrypted_fields = {}
+
+    def decrypt_field(self, name):
+        # Models moved to an EncryptedField named after the number keep the
+        # legacy columns only for rows that are not packed yet
+        if isinstance(
+            getattr(type(self), name, None),
+            EncryptedFieldDescriptor
+        ):
+            plaintext = getattr(self, name)
+            if plaintext is not None:
+                return plaintext
+
+        # Memoized on the instance, a PDF render reads the same number many
+        # times. Keyed by the ciphertext so that a new value is decrypted
+        ciphertext_field, nonce_field, tag_field = self.encrypted_fields[name]
+        ciphertext = getattr(self, ciphertext_field)
+        decrypted = self.__dict__.setdefault('_decrypted_fields', {})
+        if name not in decrypted or decrypted[name][0] != ciphertext:
+            decrypted[name] = (
+                bytes(ciphertext) if ciphertext is not None else None,
+                decrypt_string(
+                    ciphertext,
+                    settings.ENCRYPTION_KEY,
+                    getattr(self, nonce_field),
+                    getattr(self, tag_field)
+                )
+            )
+        return decrypted[name][1]
+
+    def get_packed_field(self, name):
+        # Encrypted value in EncryptedField form, for copying it to another
+        # row without decrypting it
+        packed = self.__dict__.get(name)
+        if packed is None:
+            plaintext = self.__dict__.get('_encrypted_plaintexts', {}).get(
+                name
+            )
+            if plaintext:
+                # Set but not saved yet
+                packed = pack_encrypted(*encrypt_string(
+                    plaintext,
+                    settings.ENCRYPTION_KEY
+                ))
+            else:
+                ciphertext_field, nonce_field, tag_field = (
+                    self.encrypted_fields[name]
+                )
+                ciphertext = getattr(self, ciphertext_field)
+                if ciphertext:
+                    packed = pack_encrypted(
+                        ciphertext,
+                        getattr(self, nonce_field),
+                        getattr(self, tag_field)
+                    )
+        return packed
+
+    def clear_legacy_fields(self, name):
+        # Called when a new plaintext is set, otherwise decrypt_field would
+        # fall back to the old number while the packed column is empty
+        for field_name in self.encrypted_fields[name]:
+            setattr(self, field_name, None)
+
+    @classmethod
+    def get_derived_field_names(cls, name):
+        field_names = []
+        if hasattr(cls, f'{name}_blind_index'):
+            field_names.append(f'{name}_blind_index')
+        if hasattr(cls, f'{name}_partial'):
+            field_names.append(f'{name}_partial')
+        return field_names
+
+    def set_derived_fields(self, update_fields=None):
+        changed_fields = []
+        for name, (ciphertext_field, nonce_field, tag_field) in (
+            self.encrypted_fields.items()
+        ):
+            if (
+                update_fields is not None
+                and ciphertext_field not in update_fields
+                and name not in update_fields
+            ):
+                continue
+            plaintext = self.decrypt_field(name)
+            if hasattr(self, f'{name}_blind_index'):
+                setattr(
+                    self,
+                    f'{name}_blind_index',
+                    get_blind_index(plaintext)
+                )
+            if hasattr(self, f'{name}_partial'):
+                setattr(
+                    self,
+                    f'{name}_partial',
+                    plaintext[-4:] if plaintext else None
+                )
+            changed_fields += self.get_derived_field_names(name)
+        return changed_fields
+
+    def get_partial(self, name, padded=True):
+        partial = getattr(self, f'{name}_partial')
+        if partial is None:
+            # Saved before the partial columns existed and not backfilled
+            plaintext = self.decrypt_field(name)
+            partial = plaintext[-4:] if plaintext else None
+        if not partial:
+            return ''
+        return 'x' * 5 + partial if padded else partial
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        changed_fields = self.set_derived_fields(update_fields)
+        if update_fields is not None:
+            kwargs['update_fields'] = list(update_fields) + changed_fields
+        super().save(*args, **kwargs)
+
+
 class NullableCharField(models.CharField):
     def __init__(self, *args, **kwargs) -> None:
         kwargs.update({
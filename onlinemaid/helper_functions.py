@@ -1,4 +1,7 @@
 # Imports from the system
+import functools
+import hashlib
+import hmac
 import math
 import random
 import string
@@ -71,6 +74,16 @@ def create_test_user():
     }
 
 
+ENCRYPTION_NONCE_SIZE = 32
+ENCRYPTION_TAG_SIZE = 16
+
+
+@functools.lru_cache(maxsize=None)
+def get_cipher_key(encryption_key):
+    # Parsed once per process instead of on every encrypt and decrypt
+    return bytes.fromhex(encryption_key)
+
+
 def encrypt_string(plaintext, encryption_key):
     # Data to be encrypted formatted as bytes literal
     bytes_literal = plaintext.upper().encode('ascii')
@@ -87,11 +100,11 @@ def encrypt_string(plaintext, encryption_key):
     To convert to hex string to bytes, run following command in bash shell:
     python3 -c "print('<32_char_string>'.encode('ascii').hex())"
     '''
-    key = bytes.fromhex(encryption_key)
+    key = get_cipher_key(encryption_key)
     # key = encryption_key.encode('ascii')
 
     # New nonce everytime
-    nonce = get_random_bytes(32)
+    nonce = get_random_bytes(ENCRYPTION_NONCE_SIZE)
 
     # Create cipher object
     cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
@@ -106,7 +119,7 @@ def decrypt_string(ciphertext, encryption_key, nonce, tag):
     if ciphertext:
         try:
             cipher = AES.new(
-                bytes.fromhex(encryption_key),
+                get_cipher_key(encryption_key),
                 AES.MODE_GCM,
                 nonce=nonce
             )
@@ -123,6 +136,60 @@ def decrypt_string(ciphertext, encryption_key, nonce, tag):
         return None
 
 
+def pack_encrypted(ciphertext, nonce, tag):
+    """
+    Single column form of an encrypt_string result, nonce then tag then
+    ciphertext. Both sizes are fixed so no separator is needed.
+    """
+    return bytes(nonce) + bytes(tag) + bytes(ciphertext)
+
+
+def unpack_encrypted(packed):
+    # Returns (ciphertext, nonce, tag) in encrypt_string order
+    packed = bytes(packed)
+    header_size = ENCRYPTION_NONCE_SIZE + ENCRYPTION_TAG_SIZE
+    return (
+        packed[header_size:],
+        packed[:ENCRYPTION_NONCE_SIZE],
+        packed[ENCRYPTION_NONCE_SIZE:header_size]
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def derive_blind_index_key(blind_index_key, encryption_key):
+    if blind_index_key:
+        return bytes.fromhex(blind_index_key)
+    # Derived from the encryption key when no separate key is configured, the
+    # derived key never reveals the encryption key itself
+    return hmac.new(
+        bytes.fromhex(encryption_key),
+        b'blind-index',
+        hashlib.sha256
+    ).digest()
+
+
+def get_blind_index_key():
+    return derive_blind_index_key(
+        settings.BLIND_INDEX_KEY,
+        settings.ENCRYPTION_KEY
+    )
+
+
+def get_blind_index(plaintext):
+    """
+    Keyed HMAC of an identity number, stored next to its ciphertext so that
+    records can be looked up by exact match without decrypting. Normalised
+    the same way as encrypt_string.
+    """
+    if not plaintext:
+        return None
+    return hmac.new(
+        get_blind_index_key(),
+        plaintext.strip().upper().encode('utf-8'),
+        hashlib.sha256
+    ).hexdigest()
+
+
 def populate_necessary_rows():
     from maid.constants import MaidLanguageChoices, MaidResponsibilityChoices
     from maid.models import MaidLanguage, MaidResponsibility
@@ -273,17 +340,11 @@ def maid_seed_data():
                     reference_number=maid['reference_number'],
                 )
             except Maid.DoesNotExist:
-                encrption_thing = encrypt_string(
-                    maid['passport_number'],
-                    settings.ENCRYPTION_KEY
-                )
                 new_maid = Maid(
                     agency=agency,
                     reference_number=maid['reference_number'],
                     name=maid['name'],
-                    passport_number=encrption_thing[0],
-                    nonce=encrption_thing[1],
-                    tag=encrption_thing[2],
+                    passport_number=maid['passport_number'],
                     maid_type=TypeOfMaidChoices.NEW,
                     days_off=maid['days_off'],
                     passport_status=MaidPassportStatusChoices.NOT_READY,
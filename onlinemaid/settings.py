@@ -77,7 +77,7 @@ INSTALLED_APPS = [
     'advertisement',
     'agency.apps.AgencyConfig',
     'api',
-    'dashboard',
+    'dashboard.apps.DashboardConfig',
     'employer_documentation.apps.EmployerDocumentationConfig',
     'maid.apps.MaidConfig',
     'payment.apps.PaymentConfig',
@@ -295,6 +295,11 @@ STRIPE_WEBHOOK_KEY = os.environ.get('STRIPE_WEBHOOK_SECRET_KEY')
 # Pycryptodome Key
 ENCRYPTION_KEY = os.environ.get('ENCRYPTION_KEY')
 
+# Key of the NRIC/FIN/passport blind indexes (hex), derived from
+# ENCRYPTION_KEY when not set. Changing it requires running
+# backfill_encrypted_fields
+BLIND_INDEX_KEY = os.environ.get('BLIND_INDEX_KEY')
+
 # django.contrib.sites.models.Site
 SITE_ID = 1
 
@@ -324,6 +329,91 @@ if not DEBUG:
 MAID_PAGINATE_BY = 12
 AGENCY_PAGINATE_BY = 12
 DASHBOARD_PAGINATE_BY = 10
+API_PAGINATE_BY = 20
+API_MAX_PAGE_SIZE = 100
+# Cap of the plain list returned to API clients that pass legacy=1
+API_LEGACY_MAX_RESULTS = 100
+
+# Cache Settings
+# Two tiers, see onlinemaid.cache.TieredCache. The local tier is a bounded
+# in-process LRU. The shared tier defaults to a file based cache, which is
+# only shared by the workers of one host and culls entries once full. Set
+# SHARED_CACHE_BACKEND and CACHE_LOCATION to a memcached backend to share it
+# between hosts. The file based cache stores pickles, so its default
+# directory is inside the project rather than a world writable temp dir.
+LOCAL_CACHE_ALIAS = 'local'
+SHARED_CACHE_ALIAS = 'default'
+SHARED_CACHE_BACKEND = os.environ.get(
+    'SHARED_CACHE_BACKEND',
+    'django.core.cache.backends.filebased.FileBasedCache'
+)
+CACHES = {
+    'default': {
+        'BACKEND': SHARED_CACHE_BACKEND,
+        'LOCATION': os.environ.get(
+            'CACHE_LOCATION',
+            os.path.join(BASE_DIR, 'cache')
+        ),
+        'TIMEOUT': 60 * 60
+    },
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'onlinemaid-local',
+        'TIMEOUT': 60,
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000
+        }
+    }
+}
+if SHARED_CACHE_BACKEND.endswith('FileBasedCache'):
+    CACHES['default']['OPTIONS'] = {
+        'MAX_ENTRIES': 10000
+    }
+API_CACHE_TIMEOUT = 60 * 60
+
+# PDF Rendering Settings
+# Renders run in a pool of PDF_RENDER_WORKERS processes per web worker, with
+# at most PDF_RENDER_QUEUE_SIZE renders queued or running at a time
+PDF_RENDER_WORKERS = int(os.environ.get('PDF_RENDER_WORKERS', '2'))
+PDF_RENDER_QUEUE_SIZE = int(os.environ.get('PDF_RENDER_QUEUE_SIZE', '16'))
+PDF_RENDER_QUEUE_TIMEOUT = 10
+PDF_RENDER_TIMEOUT = 60
+
+# Case document ZIP exports from the web are limited to this many cases,
+# larger ones are run with the export_case_documents command
+CASE_EXPORT_MAX_CASES = int(os.environ.get('CASE_EXPORT_MAX_CASES', '50'))
+
+# Rendered PDFs are kept on local disk, addressed by a hash of their content.
+# They hold personal data in plain text, so the directory is created private
+# to the application user (0700) and should never be a shared temp dir
+PDF_CACHE_DIR = os.environ.get(
+    'PDF_CACHE_DIR',
+    os.path.join(Path.home(), '.cache', 'onlinemaid_pdf_cache')
+)
+PDF_CACHE_MAX_BYTES = int(
+    os.environ.get('PDF_CACHE_MAX_BYTES', str(512 * 1024 * 1024))
+)
+# The cache is swept for eviction once this much has been written to it
+PDF_CACHE_EVICT_EVERY_BYTES = PDF_CACHE_MAX_BYTES // 20
+
+# Receipt running numbers reserved by each worker process at a time, see
+# employer_documentation.receipts. 1 keeps them in issue order across
+# workers, at the cost of an UPDATE of the counter row per receipt.
+RECEIPT_NUMBER_BLOCK_SIZE = int(
+    os.environ.get('RECEIPT_NUMBER_BLOCK_SIZE', '20')
+)
+
+# Keep the resolved user authority in the session, see
+# agency.helper_functions.get_authority. The versions that invalidate it
+# are kept in the shared cache tier, so a revoked authority is only seen by
+# every host when that tier is shared between hosts. It is off with the per
+# host file based default unless AUTHORITY_SESSION_CACHE=TRUE is set.
+AUTHORITY_SESSION_CACHE = os.environ.get(
+    'AUTHORITY_SESSION_CACHE',
+    'FALSE' if SHARED_CACHE_BACKEND.endswith(
+        ('FileBasedCache', 'LocMemCache')
+    ) else 'TRUE'
+) == 'TRUE'
 
 # Django Recaptcha Settings
 RECAPTCHA_PUBLIC_KEY = os.environ.get('RECAPTCHA_PUBLIC_KEY')
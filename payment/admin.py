@@ -1,7 +1,8 @@
 from django.contrib import admin
 
-from .models import Customer, Subscription
+from .models import Customer, StripeOutbox, Subscription
 
 # Register your models here.
 admin.site.register(Customer)
 admin.site.register(Subscription)
+admin.site.register(StripeOutbox)
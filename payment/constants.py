@@ -31,6 +31,10 @@ class PlanType(models.TextChoices):
     ADVERTISEMENT = 'Advertisement', _('Advertisement')
 
 
+class StripeOutboxActionChoices(models.TextChoices):
+    SYNC_CUSTOMER = 'SYNC_CUSTOMER', _('Create or update Stripe customer')
+
+
 planLimitMap = {
     'price_1JiDNRKvEbGNaxrCspFPthnv': {
         'product_id': 'prod_KMxIAjOOMeB715',
@@ -0,0 +1,98 @@
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from .constants import StripeOutboxActionChoices
+from .models import StripeOutbox
+
+logger = logging.getLogger(__name__)
+
+STRIPE_OUTBOX_BATCH_SIZE = 50
+
+# Events failing this many times are left for someone to look at
+STRIPE_OUTBOX_MAX_ATTEMPTS = 10
+
+
+def enqueue_stripe_customer_sync(agency):
+    # One pending sync per agency is enough, it sends the agency as it is
+    # when the sync is processed. Events locked by process_stripe_outbox may
+    # have read the agency before this change and events out of attempts
+    # will never run again, so neither counts as pending.
+    with transaction.atomic():
+        pending = StripeOutbox.objects.select_for_update(
+            skip_locked=True
+        ).filter(
+            agency=agency,
+            action=StripeOutboxActionChoices.SYNC_CUSTOMER,
+            processed_on__isnull=True,
+            attempts__lt=STRIPE_OUTBOX_MAX_ATTEMPTS
+        )
+        if not pending.exists():
+            StripeOutbox.objects.create(
+                agency=agency,
+                action=StripeOutboxActionChoices.SYNC_CUSTOMER
+            )
+
+
+def sync_stripe_customer(agency):
+    agency.create_or_update_stripe_customer()
+
+
+STRIPE_OUTBOX_HANDLERS = {
+    StripeOutboxActionChoices.SYNC_CUSTOMER: sync_stripe_customer,
+}
+
+
+def process_stripe_outbox(batch_size=STRIPE_OUTBOX_BATCH_SIZE,
+                          max_attempts=STRIPE_OUTBOX_MAX_ATTEMPTS):
+    """
+    Makes the Stripe calls queued in StripeOutbox, oldest first, in one pass.
+    Events are locked with SKIP LOCKED so that concurrent runs share the
+    work. A failed event keeps its error and is retried by a later run until
+    it reaches max_attempts. Returns the number of events processed and the
+    number that failed.
+    """
+    processed = failed = 0
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            events = list(
+                StripeOutbox.objects.select_for_update(
+                    skip_locked=True,
+                    of=('self',)
+                ).select_related(
+                    'agency'
+                ).filter(
+                    processed_on__isnull=True,
+                    attempts__lt=max_attempts,
+                    pk__gt=last_pk
+                ).order_by('pk')[:batch_size]
+            )
+            if not events:
+                break
+
+            for event in events:
+                event.attempts += 1
+                try:
+                    # A failed event must not break the batch's transaction
+                    with transaction.atomic():
+                        STRIPE_OUTBOX_HANDLERS[event.action](event.agency)
+                except Exception as e:
+                    logger.exception(
+                        'Stripe outbox event %s failed',
+                        event.pk
+                    )
+                    event.last_error = str(e)
+                    failed += 1
+                else:
+                    event.processed_on = timezone.now()
+                    event.last_error = ''
+                    processed += 1
+
+            StripeOutbox.objects.bulk_update(
+                events,
+                ['attempts', 'processed_on', 'last_error']
+            )
+            last_pk = events[-1].pk
+    return processed, failed
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from payment.helper_functions import (STRIPE_OUTBOX_BATCH_SIZE,
+                                      STRIPE_OUTBOX_MAX_ATTEMPTS,
+                                      process_stripe_outbox)
+
+
+class Command(BaseCommand):
+    help = (
+        'Makes the Stripe calls queued by agency saves. Meant to be run '
+        'regularly, e.g. every minute from cron'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=STRIPE_OUTBOX_BATCH_SIZE
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=STRIPE_OUTBOX_MAX_ATTEMPTS
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        processed, failed = process_stripe_outbox(
+            batch_size=options['batch_size'],
+            max_attempts=options['max_attempts']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {processed} Stripe outbox events, {failed} failed'
+        ))
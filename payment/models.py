@@ -2,7 +2,8 @@ from agency.models import Agency
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
 
-from .constants import PlanIntervals, PlanType, planStatusChoices
+from .constants import (PlanIntervals, PlanType, StripeOutboxActionChoices,
+                        planStatusChoices)
 
 
 class Invoice(models.Model):
@@ -77,3 +78,41 @@ class Subscription(models.Model):
         verbose_name=_('Stripe ID'),
         max_length=255
     )
+
+
+class StripeOutbox(models.Model):
+    # Stripe calls queued by the agency save pipeline in the same transaction
+    # as the save, made later by the process_stripe_outbox command
+    agency = models.ForeignKey(
+        Agency,
+        on_delete=models.CASCADE,
+        related_name='stripe_outbox'
+    )
+
+    action = models.CharField(
+        verbose_name=_('Action'),
+        max_length=20,
+        choices=StripeOutboxActionChoices.choices
+    )
+
+    created_on = models.DateTimeField(
+        auto_now_add=True
+    )
+
+    processed_on = models.DateTimeField(
+        null=True,
+        blank=True
+    )
+
+    attempts = models.PositiveSmallIntegerField(
+        default=0
+    )
+
+    last_error = models.TextField(
+        blank=True
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['processed_on', 'id'])
+        ]